@@ -0,0 +1,64 @@
+# ================================================
+# PRAGYAN-NETRA - AUDIO OUTPUT BENCHMARK
+# Vision-loop frame time with blocking beeps vs the mixer thread
+# ================================================
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from vision.frame_features import FrameFeatures
+from vision.frame_source import SyntheticSource
+from voice.audio_output import AudioMixer, NullSink
+
+
+def vision_step(frame):
+    """Wall-hazard work done per frame in PragyanNetraOS.hazard_stage"""
+    h, w = frame.shape[:2]
+    return FrameFeatures(frame).edge_count(int(w*0.3), int(h*0.7), int(w*0.7), h) > 3600
+
+
+def blocking_beep(frequency, duration_ms):
+    """Stand-in for winsound.Beep, which returns once the tone has played"""
+    time.sleep(duration_ms / 1000)
+
+
+def run_loop(frames, alert, alert_every):
+    times = []
+    for i, frame in enumerate(frames):
+        start = time.perf_counter()
+        vision_step(frame)
+        if alert is not None and i % alert_every == 0:
+            alert(600, 250)
+        times.append(1000 * (time.perf_counter() - start))
+    return np.array(times)
+
+
+def main(num_frames=120, alert_every=10):
+    source = SyntheticSource(640, 480, num_frames=num_frames, seed=0, threaded=False)
+    frames = [f.image.copy() for f in source]
+
+    # Real-time paced sink so the mixer behaves like a sound card
+    mixer = AudioMixer(NullSink(realtime=True)).start()
+    results = {
+        'no alerts': run_loop(frames, None, alert_every),
+        'blocking beep': run_loop(frames, blocking_beep, alert_every),
+        'mixer beep': run_loop(frames, mixer.beep, alert_every)
+    }
+    mixer.wait_idle(timeout=10)
+    mixer.stop()
+
+    print("=" * 60)
+    print(f"VISION LOOP - {num_frames} frames, a 250 ms alert every {alert_every} frames")
+    print("=" * 60)
+    print(f"{'MODE':<15} {'MEAN ms':>8} {'P95 ms':>8} {'MAX ms':>8}")
+    for name, times in results.items():
+        print(f"{name:<15} {times.mean():>8.2f} {np.percentile(times, 95):>8.2f} {times.max():>8.2f}")
+    print(f"Mixer: {mixer.cues_played} cues, max overlap {mixer.max_overlap}")
+
+
+if __name__ == "__main__":
+    main()
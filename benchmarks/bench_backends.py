@@ -0,0 +1,49 @@
+# ================================================
+# PRAGYAN-NETRA - INFERENCE BACKEND BENCHMARK
+# Ultralytics vs ONNX Runtime vs OpenCV DNN on the same frames
+# ================================================
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from vision.frame_source import open_source
+from vision.inference_backends import create_backend
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare obstacle detection inference backends")
+    parser.add_argument("--pt", default="models/yolo/yolov8n.pt", help="Ultralytics weights")
+    parser.add_argument("--onnx", default="models/yolo/yolov8n.onnx", help="Exported ONNX model")
+    parser.add_argument("--source", default="synthetic", help="Recorded video, image folder or 'synthetic'")
+    parser.add_argument("--frames", type=int, default=50)
+    parser.add_argument("--threads", type=int, default=2)
+    parser.add_argument("--input-size", type=int, default=640)
+    args = parser.parse_args()
+
+    source = open_source(args.source, threaded=False)
+    frames = []
+    for frame in source:
+        frames.append(frame.image.copy())
+        if len(frames) == args.frames:
+            break
+    source.stop()
+
+    print("=" * 60)
+    print(f"INFERENCE BACKENDS - {len(frames)} frames, {args.threads} threads, {args.input_size}px")
+    print("=" * 60)
+    print(f"{'BACKEND':<12} {'MEAN ms':>9} {'P50 ms':>9} {'P95 ms':>9} {'FPS':>7}")
+
+    for name, path in (("ultralytics", args.pt), ("onnx", args.onnx), ("opencv", args.onnx)):
+        try:
+            backend = create_backend(name, path, threads=args.threads, input_size=args.input_size)
+        except Exception as e:
+            print(f"{name:<12} skipped: {e}")
+            continue
+        r = backend.benchmark(frames)
+        print(f"{name:<12} {r['mean_ms']:>9.2f} {r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} {r['fps']:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
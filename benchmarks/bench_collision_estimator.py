@@ -0,0 +1,78 @@
+# ================================================
+# PRAGYAN-NETRA - COLLISION ESTIMATOR BENCHMARK
+# Time-to-collision for many tracks: per-track polyfit vs one vectorized fit
+# ================================================
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from navigation.collision_estimator import CollisionEstimator
+
+
+def track_boxes(tracks, frames, fps=30.0, seed=0):
+    """Per frame (timestamp, boxes) of objects approaching or receding at random speeds"""
+    rng = np.random.default_rng(seed)
+    distance = rng.uniform(3, 10, tracks)
+    speed = rng.uniform(-1, 2, tracks)
+    center = rng.uniform(100, 500, (tracks, 2))
+    for frame in range(frames):
+        t = frame / fps
+        half = 554.0 * 0.9 / np.maximum(distance - speed * t, 0.3) / 2 + rng.normal(0, 0.3, tracks)
+        yield t, np.concatenate([center - half[:, None], center + half[:, None]], axis=1)
+
+
+def polyfit_ttc(history, now, window):
+    """Reference: one np.polyfit per track over its samples in the window"""
+    result = {}
+    for track_id, samples in history.items():
+        samples = [(t, u) for t, u in samples if now - window <= t <= now]
+        if len(samples) < 3:
+            continue
+        t, u = np.array(samples).T
+        slope, intercept = np.polyfit(t - now, u, 1)
+        result[track_id] = intercept / -slope if slope < 0 else np.inf
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Collision estimator benchmark")
+    parser.add_argument("--frames", type=int, default=90, help="frames at 30 FPS")
+    parser.add_argument("--window", type=float, default=1.0)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"COLLISION ESTIMATOR - {args.frames} frames, {args.window:.1f}s window")
+    print("=" * 60)
+    print(f"{'TRACKS':>7} {'POLYFIT us':>11} {'VECTOR us':>10} {'TRACKS/s':>12} {'MAX DIFF s':>11}")
+    for tracks in (10, 100, 500):
+        estimator = CollisionEstimator(window=args.window)
+        history = {i: [] for i in range(tracks)}
+        ids = list(range(tracks))
+        polyfit_s, vector_s, diff = [], [], 0.0
+        for t, boxes in track_boxes(tracks, args.frames):
+            start = time.perf_counter()
+            estimator.observe(ids, boxes, t)
+            fast = estimator.estimate(t)
+            vector_s.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            size = np.sqrt((boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1]))
+            for i in ids:
+                history[i] = history[i][-15:] + [(t, 1.0 / size[i])]
+            slow = polyfit_ttc(history, t, args.window)
+            polyfit_s.append(time.perf_counter() - start)
+
+            finite = [i for i in slow if np.isfinite(slow[i]) and slow[i] < 60]
+            if finite:
+                diff = max(diff, max(abs(fast[i]['ttc'] - slow[i]) for i in finite))
+        polyfit_us, vector_us = 1e6 * np.mean(polyfit_s[5:]), 1e6 * np.mean(vector_s[5:])
+        print(f"{tracks:>7} {polyfit_us:>11.0f} {vector_us:>10.0f} {tracks / vector_us * 1e6:>12,.0f} {diff:>11.4f}")
+
+
+if __name__ == "__main__":
+    main()
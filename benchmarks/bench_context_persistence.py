@@ -0,0 +1,64 @@
+# ================================================
+# PRAGYAN-NETRA - CONTEXT PERSISTENCE BENCHMARK
+# Per-obstacle JSON rewrite vs batched SQLite inserts and write-behind location state
+# ================================================
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from memory.context_understanding import ContextManager
+
+
+def save_every_time(data_dir, obstacles):
+    """add_obstacle_context as it was: rewrite the whole file per obstacle"""
+    path = os.path.join(data_dir, "context_memory.json")
+    context = {"current_location": "UNKNOWN", "last_obstacles": [], "frequent_paths": {}, "time_patterns": {}}
+    for i, (obstacle_type, position) in enumerate(obstacles):
+        context['current_location'] = f"ROOM_{i % 7}"
+        context['last_obstacles'].append({"type": obstacle_type, "position": position})
+        context['last_obstacles'] = context['last_obstacles'][-50:]
+        key = f"{obstacle_type}_{position}"
+        context['frequent_paths'][key] = context['frequent_paths'].get(key, 0) + 1
+        with open(path, 'w') as f:
+            json.dump(context, f, indent=2)
+
+
+def main(count=2000):
+    types = ["chair", "table", "person", "door", "stairs"]
+    positions = ["LEFT", "CENTER", "RIGHT"]
+    obstacles = [(types[i % 5], positions[i % 3]) for i in range(count)]
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        start = time.perf_counter()
+        save_every_time(data_dir, obstacles)
+        before_ms = 1000 * (time.perf_counter() - start) / count
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        context = ContextManager(data_dir)
+        start = time.perf_counter()
+        for i, (obstacle_type, position) in enumerate(obstacles):
+            context.update_location(f"ROOM_{i % 7}")
+            context.add_obstacle_context(obstacle_type, position)
+        after_ms = 1000 * (time.perf_counter() - start) / count
+        context.close()
+        stats = context.persistence_stats()
+        context.state.close()
+        context.store.close()
+
+    print("=" * 60)
+    print(f"CONTEXT PERSISTENCE - {count} obstacles")
+    print("=" * 60)
+    print(f"Save per obstacle:  {before_ms:.3f} ms/obstacle on the caller")
+    print(f"Write-behind:       {after_ms:.3f} ms/obstacle on the caller")
+    events, state = stats['events'], stats['state']
+    print(f"Event batches: {events['batches']} (mean {events['batch_mean_ms']:.2f} ms, max {events['batch_max_ms']:.2f} ms)")
+    print(f"State snapshots: {state['flushes']} for {state['mutations']} updates "
+          f"(mean {state['flush_mean_ms']:.2f} ms, max {state['flush_max_ms']:.2f} ms)")
+
+
+if __name__ == "__main__":
+    main()
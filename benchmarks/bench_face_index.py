@@ -0,0 +1,63 @@
+# ================================================
+# PRAGYAN-NETRA - FACE MATCHING BENCHMARK
+# FaceIndex vs compare_faces + matches.index(True)
+# ================================================
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from memory.face_index import FaceIndex
+
+try:
+    from face_recognition import compare_faces
+except ImportError:
+    # Same math as face_recognition.compare_faces
+    def compare_faces(known_face_encodings, face_encoding_to_check, tolerance=0.6):
+        if len(known_face_encodings) == 0:
+            return []
+        distances = np.linalg.norm(np.array(known_face_encodings) - face_encoding_to_check, axis=1)
+        return list(distances <= tolerance)
+
+
+def current_loop(known_encodings, known_names, frame_encodings):
+    """Matching loop as it was in PragyanNetraOS.run"""
+    names = []
+    for enc in frame_encodings:
+        matches = compare_faces(known_encodings, enc)
+        names.append(known_names[matches.index(True)] if True in matches else "Unknown Person")
+    return names
+
+
+def timed(func, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    return 1000 * (time.perf_counter() - start) / repeats
+
+
+def main(faces_per_frame=5, repeats=50):
+    rng = np.random.default_rng(0)
+    print("=" * 60)
+    print(f"FACE MATCHING - {faces_per_frame} faces per frame")
+    print("=" * 60)
+    print(f"{'IDENTITIES':>10} {'LOOP ms':>10} {'INDEX ms':>10} {'SPEEDUP':>8}")
+
+    for n in (10, 100, 1000, 5000):
+        known = list(rng.normal(0, 0.1, (n, 128)))
+        names = [f"person_{i}" for i in range(n)]
+        frame = [known[i] + rng.normal(0, 0.01, 128) for i in rng.integers(0, n, faces_per_frame)]
+
+        index = FaceIndex()
+        index.add_many(names, known)
+
+        loop_ms = timed(lambda: current_loop(known, names, frame), repeats)
+        index_ms = timed(lambda: index.match(frame), repeats)
+        print(f"{n:>10} {loop_ms:>10.3f} {index_ms:>10.3f} {loop_ms / index_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# ================================================
+# PRAGYAN-NETRA - STRUCTURAL DETECTOR BENCHMARK
+# Independent gray/Canny/Hough per detector vs shared FrameFeatures
+# ================================================
+
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from vision.frame_features import FeatureCache
+from vision.frame_source import SyntheticSource
+from vision.stair_detection import StairDetector
+from vision.surface_analysis import SurfaceAnalyzer
+
+
+def wall_check_separate(frame):
+    """Wall check as it was in PragyanNetraOS.wall_hazard_check"""
+    h, w = frame.shape[:2]
+    roi = frame[int(h*0.7):h, int(w*0.3):int(w*0.7)]
+    gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
+    edges = cv2.Canny(gray, 50, 150)
+    return np.sum(edges > 0) > 3500
+
+
+def wall_check_shared(frame, features):
+    h, w = frame.shape[:2]
+    return features.edge_count(int(w*0.3), int(h*0.7), int(w*0.7), h) > 3600
+
+
+def main(num_frames=200):
+    source = SyntheticSource(640, 480, num_frames=num_frames, seed=0, num_objects=6, threaded=False)
+    frames = [f.image.copy() for f in source]
+    stairs, surface = StairDetector(), SurfaceAnalyzer()
+    cache = FeatureCache()
+
+    start = time.perf_counter()
+    for frame in frames:
+        wall_check_separate(frame)
+        stairs.detect_stairs(frame, features=cache.get(frame))
+        surface.analyze_surface(frame, features=cache.get(frame))
+    separate_ms = 1000 * (time.perf_counter() - start) / num_frames
+
+    start = time.perf_counter()
+    for seq, frame in enumerate(frames):
+        features = cache.get(frame, seq)
+        wall_check_shared(frame, features)
+        stairs.detect_stairs(frame, features=cache.get(frame, seq))
+        surface.analyze_surface(frame, features=cache.get(frame, seq))
+    shared_ms = 1000 * (time.perf_counter() - start) / num_frames
+
+    print("=" * 60)
+    print(f"WALL + STAIR + SURFACE - {num_frames} frames 640x480")
+    print("=" * 60)
+    print(f"Separate features: {separate_ms:.2f} ms/frame")
+    print(f"Shared features:   {shared_ms:.2f} ms/frame")
+    print(f"Saved:             {separate_ms - shared_ms:.2f} ms/frame ({separate_ms / shared_ms:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
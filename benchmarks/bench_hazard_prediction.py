@@ -0,0 +1,151 @@
+# ================================================
+# PRAGYAN-NETRA - HAZARD PREDICTION BENCHMARK
+# Per-dict hazard scoring vs the columnar HazardBatch
+# ================================================
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from navigation.hazard_prediction import LABEL_TTC, HazardPredictor
+
+LABELS = ['VERY CLOSE', 'CLOSE', 'MODERATE', 'FAR']
+TYPES = ['person', 'chair', 'car', 'bicycle', 'dog', 'door', 'table', 'bench']
+REGIONS = ['LEFT', 'CENTER', 'RIGHT']
+SCENES = (10, 50, 200, 1000)
+
+
+def scene(objects, seed=0):
+    """Obstacles with repeated (type, region) pairs, some with a measured TTC"""
+    rng = np.random.default_rng(seed)
+    obstacles = []
+    for _ in range(objects):
+        obs = {'type': TYPES[rng.integers(len(TYPES))], 'region': REGIONS[rng.integers(3)],
+               'distance': LABELS[rng.integers(4)]}
+        if rng.random() < 0.5:
+            obs['ttc'] = float(rng.uniform(0.5, 8.0))
+            obs['approach_velocity'] = float(rng.uniform(0.2, 2.0))
+        obstacles.append(obs)
+    context = {'predictions': [{'type': TYPES[i % len(TYPES)], 'position': REGIONS[i % 3],
+                                'confidence': 0.8} for i in range(objects // 4)]}
+    return obstacles, context
+
+
+def raw_hazards(count, seed=0):
+    """Hazard dicts as several frames would produce them, mostly duplicates"""
+    rng = np.random.default_rng(seed)
+    hazards = []
+    for _ in range(count):
+        hazard = {'type': 'IMMEDIATE_COLLISION', 'object': TYPES[rng.integers(len(TYPES))],
+                  'position': REGIONS[rng.integers(3)], 'severity': 'HIGH',
+                  'time_to_impact': float(rng.uniform(0.5, 3.0)), 'approach_velocity': None, 'track_id': None}
+        if rng.random() < 0.2:
+            hazard.update(type='PREDICTED_OBSTACLE', severity='MEDIUM', time_to_impact='SOON', confidence=0.8)
+            del hazard['approach_velocity'], hazard['track_id']
+        hazards.append(hazard)
+    return hazards
+
+
+def dict_hazards(predictor, obstacles, context, hour):
+    """Reference: one dict per hazard, scored by dict_score"""
+    predictor.measure(obstacles)
+    hazards = []
+    for obs in obstacles:
+        distance = str(obs.get('distance', '')).upper().replace(' ', '_')
+        ttc = obs.get('ttc', np.inf)
+        if distance in LABEL_TTC or ttc < predictor.ttc_threshold:
+            hazards.append({'type': 'IMMEDIATE_COLLISION', 'object': obs.get('type', 'UNKNOWN'),
+                            'position': obs.get('position', obs.get('region', 'UNKNOWN')),
+                            'severity': 'HIGH',
+                            'time_to_impact': float(min(ttc, LABEL_TTC.get(distance, np.inf))),
+                            'approach_velocity': obs.get('approach_velocity'),
+                            'track_id': obs.get('track_id')})
+    for pred in context['predictions']:
+        if pred['confidence'] > 0.7:
+            hazards.append({'type': 'PREDICTED_OBSTACLE', 'object': pred['type'],
+                            'position': pred['position'], 'severity': 'MEDIUM',
+                            'time_to_impact': 'SOON', 'confidence': pred['confidence']})
+    if hour >= 18 or hour <= 6:
+        hazards.append({'type': 'LOW_LIGHT', 'severity': 'MEDIUM', 'recommendation': 'USE_ASSISTIVE_LIGHT'})
+    return dict_score(predictor, hazards)
+
+
+def dict_score(predictor, hazards):
+    """Reference: deduplicate hazard dicts through a set of string tuples and sum their risk"""
+    hazards = sorted(hazards, key=predictor.urgency)
+    unique, seen = [], set()
+    for hazard in hazards:
+        key = (hazard['type'], hazard.get('object', ''), hazard.get('position', ''))
+        if key not in seen:
+            seen.add(key)
+            unique.append(hazard)
+    weights = {'HIGH': 10, 'MEDIUM': 5, 'LOW': 2}
+    total = 0.0
+    for hazard in unique:
+        impact = predictor.urgency(hazard)
+        scale = min(max(predictor.ttc_threshold / max(impact, 1e-3), 1.0), 3.0)
+        total += weights.get(hazard['severity'], 2) * scale
+    return unique, int(min(100, 5 * total))
+
+
+def per_frame_us(fn, frames):
+    start = time.perf_counter()
+    for _ in range(frames):
+        result = fn()
+    return 1e6 * (time.perf_counter() - start) / frames, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hazard prediction benchmark")
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--hour", type=int, default=20)
+    args = parser.parse_args()
+
+    predictor = HazardPredictor()
+    print("=" * 60)
+    print(f"HAZARD PREDICTION - {args.frames} frames per scene")
+    print("=" * 60)
+    print("From detector dicts (predict + risk score), us per frame")
+    print(f"{'OBJECTS':>8} {'DICTS':>9} {'BATCH':>9} {'DICT VIEW':>10} {'OBJECTS/s':>11}")
+    for objects in SCENES:
+        obstacles, context = scene(objects)
+
+        dict_us, (reference, reference_risk) = per_frame_us(
+            lambda: dict_hazards(predictor, obstacles, context, args.hour), args.frames)
+
+        def columnar():
+            batch = predictor.predict_batch(obstacles, context, hour=args.hour)
+            return batch, predictor.calculate_risk_score(batch)
+        batch_us, (batch, risk) = per_frame_us(columnar, args.frames)
+
+        view_us, hazards = per_frame_us(
+            lambda: predictor.predict_hazards(obstacles, context, hour=args.hour), args.frames)
+
+        assert hazards == reference and risk == reference_risk
+        rate = (objects + len(context['predictions'])) / (batch_us * 1e-6)
+        print(f"{objects:>8} {dict_us:>9.1f} {batch_us:>9.1f} {view_us:>10.1f} {rate:>11.0f}")
+
+    print()
+    print("Deduplication + risk score of existing hazards, us per frame")
+    print(f"{'HAZARDS':>8} {'DICTS':>9} {'BATCH':>9} {'SPEEDUP':>8}")
+    for count in (30, 100, 300, 1000):
+        raw = raw_hazards(count)
+        batch = predictor.hazard_batch(raw)
+
+        dict_us, (reference, reference_risk) = per_frame_us(lambda: dict_score(predictor, raw), args.frames)
+
+        def columnar():
+            unique = batch.deduplicate()
+            return unique, predictor.calculate_risk_score(unique)
+        batch_us, (unique, risk) = per_frame_us(columnar, args.frames)
+
+        assert list(unique) == reference and risk == reference_risk
+        print(f"{count:>8} {dict_us:>9.1f} {batch_us:>9.1f} {dict_us / batch_us:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
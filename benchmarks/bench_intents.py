@@ -0,0 +1,61 @@
+# ================================================
+# PRAGYAN-NETRA - VOICE INTENT BENCHMARK
+# Per-intent recognition latency over a WAV corpus (needs vosk + a model)
+# Corpus layout: <corpus>/<intent name>/*.wav, 16 kHz 16-bit mono
+# ================================================
+
+import argparse
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from memory.context_understanding import ContextManager
+from memory.object_memory import ObjectMemory
+from voice.intents import build_default_intents, recognize_wav
+
+
+def main(model_path, corpus, data_dir, grammar=True):
+    from vosk import KaldiRecognizer, Model, SetLogLevel
+
+    SetLogLevel(-1)
+    intents = build_default_intents(lambda text, priority: None,
+                                    ObjectMemory(data_dir), ContextManager(data_dir))
+    model = Model(model_path)
+
+    print("=" * 70)
+    print(f"VOICE INTENTS - {'grammar-restricted' if grammar else 'full vocabulary'} recognizer")
+    print("=" * 70)
+    print(f"{'INTENT':<18} {'FILES':>5} {'ACC':>6} {'LAT mean s':>11} {'LAT max s':>10} {'CPU/audio':>10}")
+    for name in sorted(os.listdir(corpus)):
+        folder = os.path.join(corpus, name)
+        if not os.path.isdir(folder):
+            continue
+        latencies, correct, cpu, audio = [], 0, 0.0, 0.0
+        files = sorted(f for f in os.listdir(folder) if f.endswith(".wav"))
+        for f in files:
+            if grammar:
+                recognizer = KaldiRecognizer(model, 16000, intents.grammar())
+            else:
+                recognizer = KaldiRecognizer(model, 16000)
+            match, latency, decode_cpu = recognize_wav(recognizer, intents, os.path.join(folder, f))
+            correct += match is not None and match.name == name
+            latencies.append(latency)
+            cpu += decode_cpu
+            audio += latency
+        if files:
+            latencies = np.array(latencies)
+            print(f"{name:<18} {len(files):>5} {correct / len(files):>6.0%} "
+                  f"{latencies.mean():>11.2f} {latencies.max():>10.2f} {cpu / audio:>10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Voice intent latency benchmark")
+    parser.add_argument("--model", required=True, help="Vosk model directory")
+    parser.add_argument("--corpus", required=True, help="Directory of <intent>/*.wav recordings")
+    parser.add_argument("--data", default=None, help="Data directory with object_memory.json")
+    parser.add_argument("--full", action="store_true", help="Use the full-vocabulary recognizer")
+    args = parser.parse_args()
+    main(args.model, args.corpus, args.data or tempfile.mkdtemp(), grammar=not args.full)
@@ -0,0 +1,91 @@
+# ================================================
+# PRAGYAN-NETRA - MEMORY STORE BENCHMARK
+# Per-event insert cost: JSON rewrite vs SQLite per-row vs batched
+# ================================================
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from memory.memory_store import INSERT_OBSTACLE, MemoryStore
+
+
+def events(count):
+    types = ["chair", "table", "person", "door", "stairs", "cell phone"]
+    positions = ["LEFT", "CENTER", "RIGHT"]
+    return [(types[i % 6], positions[i % 3], "12:00", f"2026-02-08T12:{i // 60 % 60:02d}:{i % 60:02d}")
+            for i in range(count)]
+
+
+def json_rewrite(data_dir, batch):
+    """SystemConfig/ContextManager as they were: rewrite the document per event"""
+    path = os.path.join(data_dir, "memory.json")
+    memory = {"familiar_faces": {}, "personal_objects": {}, "obstacles": []}
+    for obstacle_type, position, time_of_day, timestamp in batch:
+        memory["obstacles"].append({"type": obstacle_type, "position": position,
+                                    "time": time_of_day, "timestamp": timestamp})
+        with open(path, 'w') as f:
+            json.dump(memory, f, indent=2)
+
+
+def sqlite_per_row(data_dir, batch):
+    """One transaction per event"""
+    store = MemoryStore(os.path.join(data_dir, "rows.db"), flush_interval=3600)
+    conn = sqlite3.connect(store.path)
+    conn.execute("PRAGMA synchronous=NORMAL")
+    for event in batch:
+        with conn:
+            conn.execute(INSERT_OBSTACLE, event)
+    conn.close()
+    store.close()
+
+
+def sqlite_batched(data_dir, batch):
+    """MemoryStore.log_obstacle, including the final flush"""
+    store = MemoryStore(os.path.join(data_dir, "batched.db"), flush_interval=3600)
+    for event in batch:
+        store.log_obstacle(*event)
+    store.flush()
+    stats = store.stats()
+    store.close()
+    return stats
+
+
+def timed(fn, batch):
+    with tempfile.TemporaryDirectory() as data_dir:
+        start = time.perf_counter()
+        result = fn(data_dir, batch)
+        return (time.perf_counter() - start) / len(batch), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory store insert benchmark")
+    parser.add_argument("--events", type=int, default=20000, help="events for the SQLite runs")
+    parser.add_argument("--json-events", type=int, default=2000,
+                        help="events for the JSON run (cost grows with the document)")
+    args = parser.parse_args()
+
+    batch = events(args.events)
+    rows = [("JSON rewrite", *timed(json_rewrite, batch[:args.json_events])),
+            ("SQLite per-row commit", *timed(sqlite_per_row, batch)),
+            ("SQLite batched", *timed(sqlite_batched, batch))]
+
+    print("=" * 60)
+    print(f"MEMORY STORE - {args.events} events ({args.json_events} for JSON)")
+    print("=" * 60)
+    print(f"{'Method':<24}{'us/event':>10}{'events/hour capacity':>24}{'CPU @10k/h':>12}")
+    for name, per_event, _ in rows:
+        print(f"{name:<24}{1e6 * per_event:>10.1f}{3600 / per_event:>24,.0f}"
+              f"{100 * 10000 * per_event / 3600:>11.4f}%")
+    stats = rows[-1][2]
+    print(f"\nBatches: {stats['batches']} (mean {stats['batch_mean_ms']:.2f} ms, "
+          f"max {stats['batch_max_ms']:.2f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# ================================================
+# PRAGYAN-NETRA - OBJECT TRACKER BENCHMARK
+# Track update cost and announcements: global cooldown vs per-track
+# ================================================
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from vision.object_tracker import ObjectTracker
+
+
+def detection_stream(objects, frames, seed=0, dropout=0.1, jitter=1.5, shape=(1080, 1920)):
+    """Boxes moving at constant velocity with jitter, dropouts and one-frame false positives"""
+    rng = np.random.default_rng(seed)
+    h, w = shape
+    start = rng.uniform((0, 0), (w - 80, h - 80), (objects, 2))
+    velocity = rng.uniform(-2, 2, (objects, 2))
+    size = rng.uniform(30, 80, (objects, 2))
+    for frame in range(frames):
+        corner = start + velocity * frame
+        boxes = np.concatenate([corner, corner + size], axis=1) + rng.normal(0, jitter, (objects, 4))
+        keep = rng.random(objects) > dropout
+        dets = [{'bbox': tuple(box), 'type': 'chair'} for box in boxes[keep].tolist()]
+        if rng.random() < 0.2:
+            x, y = rng.uniform(0, w - 40), rng.uniform(0, h - 40)
+            dets.append({'bbox': (x, y, x + 30, y + 30), 'type': 'bottle'})
+        yield dets
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Object tracker benchmark")
+    parser.add_argument("--frames", type=int, default=600, help="frames at 30 FPS")
+    parser.add_argument("--detect-every", type=int, default=3)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"OBJECT TRACKER - {args.frames} frames, detector every {args.detect_every} frames")
+    print("=" * 60)
+    print(f"{'OBJECTS':>7} {'P50 us':>9} {'P95 us':>9} {'MAX us':>9} {'PREDICT us':>11} {'IDS+FP':>10}")
+    for objects in (10, 50, 100):
+        tracker = ObjectTracker()
+        updates, predicts = [], []
+        for frame, dets in enumerate(detection_stream(objects, args.frames)):
+            start = time.perf_counter()
+            if frame % args.detect_every == 0:
+                tracker.update(dets, (1080, 1920))
+                updates.append(time.perf_counter() - start)
+            else:
+                tracker.predict()
+                predicts.append(time.perf_counter() - start)
+        updates = 1e6 * np.array(updates[5:])
+        print(f"{objects:>7} {np.percentile(updates, 50):>9.0f} {np.percentile(updates, 95):>9.0f} "
+              f"{updates.max():>9.0f} {1e6 * np.mean(predicts):>11.0f} {next(tracker._ids) - 1:>10}")
+
+    # Announcements for 10 obstacles over the run
+    fps, cooldown = 30.0, 5.0
+    cooldown_count, last = 0, -cooldown
+    tracker = ObjectTracker()
+    tracked_count = 0
+    for frame, dets in enumerate(detection_stream(10, args.frames)):
+        now = frame / fps
+        if now - last > cooldown and dets:
+            cooldown_count += len(dets)
+            last = now
+        tracker.update(dets, (1080, 1920))
+        tracked_count += len(tracker.announcements(now=now))
+    print(f"\nAnnouncements, 10 obstacles over {args.frames / fps:.0f}s:")
+    print(f"  Global {cooldown:.0f}s cooldown: {cooldown_count}")
+    print(f"  Per track:           {tracked_count}")
+
+
+if __name__ == "__main__":
+    main()
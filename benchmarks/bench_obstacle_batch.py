@@ -0,0 +1,60 @@
+# ================================================
+# PRAGYAN-NETRA - BATCHED DETECTION BENCHMARK
+# ObstacleDetector.detect per frame vs detect_batch
+# ================================================
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from vision.frame_source import open_source
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-frame and batched YOLO inference")
+    parser.add_argument("--model", default="models/yolo/yolov8n.pt")
+    parser.add_argument("--source", default="synthetic", help="Video file, image folder or 'synthetic'")
+    parser.add_argument("--frames", type=int, default=64)
+    parser.add_argument("--batch", type=int, nargs="+", default=[1, 4, 8, 16])
+    args = parser.parse_args()
+
+    try:
+        from vision.obstacle_detection import ObstacleDetector
+        detector = ObstacleDetector(args.model)
+    except Exception as e:
+        print(f"❌ Cannot load detector: {e}")
+        return
+
+    source = open_source(args.source, threaded=False)
+    frames = []
+    for frame in source:
+        frames.append(frame.image.copy())
+        if len(frames) == args.frames:
+            break
+    source.stop()
+
+    # Warm-up
+    detector.detect(frames[0])
+
+    start = time.perf_counter()
+    for frame in frames:
+        detector.detect(frame)
+    single_fps = len(frames) / (time.perf_counter() - start)
+
+    print("=" * 60)
+    print(f"OBSTACLE DETECTION - {len(frames)} frames")
+    print("=" * 60)
+    print(f"{'BATCH':>6} {'FPS':>10} {'SPEEDUP':>8}")
+    print(f"{'detect':>6} {single_fps:>10.1f} {1.0:>7.1f}x")
+    for size in args.batch:
+        start = time.perf_counter()
+        for i in range(0, len(frames), size):
+            detector.detect_batch(frames[i:i + size])
+        fps = len(frames) / (time.perf_counter() - start)
+        print(f"{size:>6} {fps:>10.1f} {fps / single_fps:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
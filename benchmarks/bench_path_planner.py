@@ -0,0 +1,77 @@
+# ================================================
+# PRAGYAN-NETRA - PATH PLANNER BENCHMARK
+# 10 Hz grid updates: full replanning vs incremental D* Lite repair
+# ================================================
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from navigation.occupancy_grid import OccupancyGrid
+from navigation.path_guidance import PathGuide
+from navigation.path_planner import GridPlanner
+
+LABELS = ['VERY CLOSE', 'CLOSE', 'MODERATE', 'FAR']
+
+
+def detection_frames(frames, seed=0, image_width=640):
+    """A few obstacles per frame that drift slowly across the view"""
+    rng = np.random.default_rng(seed)
+    x = rng.uniform(50, image_width - 50, 4)
+    label = rng.integers(0, 4, 4)
+    for _ in range(frames):
+        x = np.clip(x + rng.normal(0, 4, 4), 20, image_width - 20)
+        if rng.random() < 0.05:
+            label[rng.integers(0, 4)] = rng.integers(0, 4)
+        yield [{'type': 'chair', 'bbox': (cx - 40, 200, cx + 40, 300), 'distance': LABELS[k]}
+               for cx, k in zip(x.tolist(), label.tolist())]
+
+
+def percentiles(seconds):
+    ms = 1000 * np.asarray(seconds)
+    return np.percentile(ms, 50), np.percentile(ms, 95), ms.max()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Path planner benchmark")
+    parser.add_argument("--updates", type=int, default=300, help="grid updates at 10 Hz")
+    parser.add_argument("--resolution", type=float, default=0.2)
+    args = parser.parse_args()
+
+    guide = PathGuide(OccupancyGrid(resolution=args.resolution))
+    grid = guide.grid
+    goal = (5.0, 0.0)
+    full, incremental, update, changed = [], [], [], []
+    for frame, dets in enumerate(detection_frames(args.updates)):
+        start = time.perf_counter()
+        guide.update(dets, dt=0.1, image_width=640, wall=frame % 50 < 5)
+        update.append(time.perf_counter() - start)
+
+        before = guide._blocked
+        start = time.perf_counter()
+        guide.plan_path("START", goal)
+        incremental.append(time.perf_counter() - start)
+        if before is not None:
+            changed.append(int((guide._blocked != before).sum()))
+
+        start = time.perf_counter()
+        GridPlanner(guide._blocked, grid.origin, grid.cell(*goal)).path()
+        full.append(time.perf_counter() - start)
+
+    print("=" * 60)
+    print(f"PATH PLANNER - {args.updates} updates, {grid.rows}x{grid.cols} grid at {args.resolution} m")
+    print("=" * 60)
+    print(f"{'':<22} {'P50 ms':>8} {'P95 ms':>8} {'MAX ms':>8}")
+    for name, samples in (("Grid update", update), ("Full A*-like search", full),
+                          ("plan_path (repair)", incremental[1:])):
+        p50, p95, worst = percentiles(samples)
+        print(f"{name:<22} {p50:>8.2f} {p95:>8.2f} {worst:>8.2f}")
+    print(f"Cells changed per update: mean {np.mean(changed):.1f}, max {max(changed)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+# ================================================
+# PRAGYAN-NETRA - PERCEPTION LATENCY BENCHMARK
+# Per-stage p50/p95/p99, FPS and peak RSS with a baseline regression check
+# ================================================
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from vision.frame_features import FrameFeatures
+from vision.frame_source import open_source
+from vision.stair_detection import StairDetector
+from vision.surface_analysis import SurfaceAnalyzer
+from vision.synthetic_scene import RegionDetector
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "perception.json")
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB"""
+    try:
+        import resource
+    except ImportError:   # Windows
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss) / 2**20
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+
+def summarize(latencies_ms):
+    samples = np.asarray(latencies_ms, dtype=np.float64)
+    p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+    return {
+        'count': len(samples),
+        'mean_ms': float(samples.mean()),
+        'p50_ms': float(p50),
+        'p95_ms': float(p95),
+        'p99_ms': float(p99),
+        'max_ms': float(samples.max()),
+        'fps': float(1000 / samples.mean()) if samples.mean() > 0 else float('inf')
+    }
+
+
+# ---------- stages: callables (frame, features) -> result ----------
+
+def wall_check(frame, features):
+    """Edge-density check of PragyanNetraOS.wall_hazard_check"""
+    h, w = frame.shape[:2]
+    return features.edge_count(int(w*0.3), int(h*0.7), int(w*0.7), h) > 3600
+
+
+def shared_features(frame, features):
+    """Gray, Canny and Hough paid once here and reused by the later stages"""
+    features.edges
+    features.edge_integral
+    return features.lines()
+
+
+def obstacle_stage(args):
+    from vision.obstacle_detection import ObstacleDetector
+    model = args.model or ("models/yolo/yolov8n.pt" if args.backend == "ultralytics"
+                           else "models/yolo/yolov8n.onnx")
+    detector = ObstacleDetector(model, backend=args.backend, threads=args.threads,
+                                input_size=args.input_size)
+    return lambda frame, features: detector.detect(frame)
+
+
+def face_stage(args):
+    """FaceTracker with face_recognition, or OpenCV Haar + patch embeddings without it"""
+    from vision.face_tracker import FaceTracker
+    try:
+        import face_recognition
+        detect, encode = face_recognition.face_locations, face_recognition.face_encodings
+        kind = "face_recognition"
+    except ImportError:
+        cascade = cv2.CascadeClassifier(os.path.join(cv2.data.haarcascades,
+                                                     "haarcascade_frontalface_default.xml"))
+
+        def detect(rgb):
+            gray = cv2.cvtColor(rgb, cv2.COLOR_RGB2GRAY)
+            return [(y, x + w, y + h, x) for x, y, w, h in cascade.detectMultiScale(gray, 1.2, 4)]
+
+        def encode(rgb, boxes):
+            gray = cv2.cvtColor(rgb, cv2.COLOR_RGB2GRAY)
+            patches = [cv2.resize(gray[t:b, l:r], (8, 16)).ravel().astype(np.float32) for t, r, b, l in boxes]
+            return [p / (np.linalg.norm(p) + 1e-6) for p in patches]
+        kind = "opencv-haar"
+
+    tracker = FaceTracker(detect, encode, lambda encodings: [(None, None)] * len(encodings),
+                          detect_every=args.face_every, scale=args.face_scale)
+    return (lambda frame, features: tracker.update(frame)), kind
+
+
+def build_stages(args):
+    """Ordered {name: callable} plus {name: reason} for stages that cannot run here"""
+    stairs, surface, regions = StairDetector(), SurfaceAnalyzer(), RegionDetector(seed=0)
+    stages, skipped, info = {}, {}, {}
+    stages['regions'] = lambda frame, features: regions.detect_objects(frame)
+    if args.backend != "none":
+        try:
+            stages['obstacle'] = obstacle_stage(args)
+            info['obstacle'] = args.backend
+        except Exception as e:
+            skipped['obstacle'] = f"{args.backend}: {e}"
+    stages['features'] = shared_features
+    stages['wall'] = wall_check
+    stages['stairs'] = lambda frame, features: stairs.detect_stairs(frame, features)
+    stages['surface'] = lambda frame, features: surface.analyze_surface(frame, features)
+    if args.face_every > 0:
+        stages['face'], info['face'] = face_stage(args)
+    return stages, skipped, info
+
+
+def run(source, stages, frames, warmup):
+    """Replay frames through every stage; returns per-stage and total latencies in ms"""
+    latencies = {name: [] for name in stages}
+    latencies['total'] = []
+    wall_start = None
+    processed = 0
+    for frame in source:
+        if processed == warmup:
+            wall_start = time.perf_counter()
+        features = FrameFeatures(frame.image, frame.seq)
+        frame_start = time.perf_counter()
+        for name, stage in stages.items():
+            start = time.perf_counter()
+            stage(frame.image, features)
+            if processed >= warmup:
+                latencies[name].append(1000 * (time.perf_counter() - start))
+        if processed >= warmup:
+            latencies['total'].append(1000 * (time.perf_counter() - frame_start))
+        processed += 1
+        if processed == warmup + frames:
+            break
+    elapsed = time.perf_counter() - wall_start if wall_start is not None else 0.0
+    return latencies, elapsed
+
+
+def compare(result, baseline, tolerance=0.25, min_ms=0.5, metric='p95_ms'):
+    """
+    Regressions of result against baseline.
+
+    A stage regresses when its metric grows by more than `tolerance`
+    (relative) and `min_ms` (absolute, to ignore timer noise), or when it
+    is in the baseline but was skipped or not measured in this run; peak
+    RSS when it grows by more than `tolerance`.
+
+    Returns:
+        list of human-readable regression messages (empty = pass)
+    """
+    regressions = []
+    for name in baseline.get('stages', {}):
+        if name not in result['stages']:
+            reason = result.get('skipped', {}).get(name, "not measured")
+            regressions.append(f"{name}: missing from this run ({reason})")
+    for name, now in result['stages'].items():
+        before = baseline.get('stages', {}).get(name)
+        if before is None:
+            continue
+        limit = max(before[metric] * (1 + tolerance), before[metric] + min_ms)
+        if now[metric] > limit:
+            regressions.append(f"{name}: {metric} {now[metric]:.2f} ms > {limit:.2f} ms "
+                               f"(baseline {before[metric]:.2f} ms)")
+    if 'peak_rss_mb' in baseline and result['peak_rss_mb'] > baseline['peak_rss_mb'] * (1 + tolerance):
+        regressions.append(f"peak RSS {result['peak_rss_mb']:.1f} MB > "
+                           f"{baseline['peak_rss_mb'] * (1 + tolerance):.1f} MB")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="End-to-end perception latency benchmark (CPU only)")
+    parser.add_argument("--source", default="scene", help="'scene', 'synthetic', video file or image folder")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--size", default="640x480", help="Scene size for synthetic sources")
+    parser.add_argument("--backend", default="onnx", help="Obstacle backend: ultralytics, onnx, opencv or none")
+    parser.add_argument("--model", default=None, help="Detector weights (default models/yolo/yolov8n.*)")
+    parser.add_argument("--threads", type=int, default=None)
+    parser.add_argument("--input-size", type=int, default=640)
+    parser.add_argument("--face-every", type=int, default=5, help="Face detection interval, 0 disables")
+    parser.add_argument("--face-scale", type=float, default=0.5)
+    parser.add_argument("--json", default=None, help="Write results as JSON to this file ('-' = stdout)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown")
+    args = parser.parse_args(argv)
+
+    kwargs = {'threaded': False}
+    if args.source in ("scene", "synthetic"):
+        width, height = (int(v) for v in args.size.split('x'))
+        kwargs.update(width=width, height=height, num_frames=args.frames + args.warmup)
+    source = open_source(args.source, **kwargs)
+    stages, skipped, info = build_stages(args)
+    latencies, elapsed = run(source, stages, args.frames, args.warmup)
+    source.stop()
+
+    measured = len(latencies['total'])
+    if not measured:
+        print("No frames measured")
+        return 2
+    result = {
+        'source': args.source,
+        'frames': measured,
+        'machine': {'python': platform.python_version(), 'platform': platform.platform(),
+                    'processor': platform.processor(), 'cpus': os.cpu_count()},
+        'stages': {name: summarize(values) for name, values in latencies.items() if values},
+        'backends': info,
+        'skipped': skipped,
+        'fps': measured / elapsed if elapsed else float('inf'),
+        'peak_rss_mb': peak_rss_mb()
+    }
+
+    print("=" * 72)
+    print(f"PERCEPTION LATENCY - {measured} frames from '{args.source}'")
+    print("=" * 72)
+    print(f"{'STAGE':<10} {'P50 ms':>9} {'P95 ms':>9} {'P99 ms':>9} {'MAX ms':>9} {'FPS':>9}")
+    for name, s in result['stages'].items():
+        print(f"{name:<10} {s['p50_ms']:>9.3f} {s['p95_ms']:>9.3f} {s['p99_ms']:>9.3f} "
+              f"{s['max_ms']:>9.3f} {s['fps']:>9.1f}")
+    for name, reason in skipped.items():
+        print(f"{name:<10} skipped: {reason}")
+    print(f"\nPipeline: {result['fps']:.1f} FPS, peak RSS {result['peak_rss_mb']:.1f} MB")
+
+    if args.json == "-":
+        print(json.dumps(result, indent=2))
+    elif args.json:
+        with open(args.json, 'w') as f:
+            json.dump(result, f, indent=2)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, 'w') as f:
+            json.dump(result, f, indent=2)
+        print(f"Baseline saved: {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline} (create one with --save-baseline)")
+        return 0
+
+    with open(args.baseline) as f:
+        regressions = compare(result, json.load(f), args.tolerance)
+    if regressions:
+        print("\n❌ REGRESSIONS against baseline:")
+        for message in regressions:
+            print(f"  • {message}")
+        return 1
+    print(f"\n✅ Within {100 * args.tolerance:.0f}% of baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+# ================================================
+# PRAGYAN-NETRA - ROUTE GRAPH BENCHMARK
+# Precomputed all-pairs routes vs a Dijkstra search per request
+# ================================================
+
+import argparse
+import heapq
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from navigation.route_graph import RouteGraph
+
+
+def building(places, seed=0):
+    """Corridor-like graph: a chain of places plus random shortcuts, some with stairs"""
+    rng = np.random.default_rng(seed)
+    routes = RouteGraph()
+    for i in range(1, places):
+        routes.add_edge(f"room {i - 1}", f"room {i}", float(rng.uniform(2, 15)), save=False)
+    for _ in range(places):
+        a, b = rng.integers(0, places, 2)
+        if a != b:
+            hazards = ["stairs"] if rng.random() < 0.2 else []
+            routes.add_edge(f"room {a}", f"room {b}", float(rng.uniform(2, 30)), hazards, save=False)
+    return routes
+
+
+def dijkstra_route(routes, origin, destination, mode):
+    """Reference: one heap search from the origin per request"""
+    source, target = routes.resolve(origin), routes.resolve(destination)
+    adjacency = {}
+    for (i, j), segment in routes.edges.items():
+        cost = routes.cost(segment, mode)
+        adjacency.setdefault(i, []).append((j, cost))
+        adjacency.setdefault(j, []).append((i, cost))
+    dist, prev, heap = {source: 0.0}, {}, [(0.0, source)]
+    while heap:
+        d, u = heapq.heappop(heap)
+        if u == target:
+            break
+        if d > dist[u]:
+            continue
+        for v, cost in adjacency.get(u, []):
+            if d + cost < dist.get(v, float('inf')):
+                dist[v], prev[v] = d + cost, u
+                heapq.heappush(heap, (d + cost, v))
+    path = [target]
+    while path[-1] != source:
+        path.append(prev[path[-1]])
+    return [routes.places[k] for k in reversed(path)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Route graph benchmark")
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"ROUTE GRAPH - {args.queries} 'take me to' requests")
+    print("=" * 60)
+    print(f"{'PLACES':>7} {'BUILD ms':>9} {'QUERY us':>9} {'DIJKSTRA us':>12}")
+    for places in (20, 100, 300):
+        routes = building(places)
+        rng = np.random.default_rng(1)
+        pairs = [(f"room {a}", f"room {b}") for a, b in rng.integers(0, places, (args.queries, 2))]
+
+        start = time.perf_counter()
+        routes.route("room 0", "room 1")
+        build_ms = 1000 * (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        answers = [routes.route(a, b)['places'] for a, b in pairs]
+        query_us = 1e6 * (time.perf_counter() - start) / len(pairs)
+
+        sample = pairs[:200]
+        start = time.perf_counter()
+        reference = [dijkstra_route(routes, a, b, 'safest') for a, b in sample]
+        dijkstra_us = 1e6 * (time.perf_counter() - start) / len(sample)
+
+        def cost(path):
+            return sum(routes.cost(routes.edges[routes._edge(a, b)], 'safest') for a, b in zip(path, path[1:]))
+        assert all(abs(cost(a) - cost(r)) < 1e-9 for a, r in zip(answers, reference))
+        print(f"{places:>7} {build_ms:>9.2f} {query_us:>9.1f} {dijkstra_us:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
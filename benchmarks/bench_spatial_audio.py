@@ -0,0 +1,38 @@
+# ================================================
+# PRAGYAN-NETRA - SPATIAL AUDIO BENCHMARK
+# Binaural rendering cost vs number of simultaneous objects
+# ================================================
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from voice.spatial_audio import BinauralRenderer, SpatialCue
+
+
+def main(blocks=200):
+    renderer = BinauralRenderer()
+    block_ms = 1000 * renderer.block_size / renderer.sample_rate
+
+    print("=" * 60)
+    print(f"BINAURAL RENDERING - {renderer.block_size}-frame blocks ({block_ms:.1f} ms of audio)")
+    print("=" * 60)
+    print(f"{'SOURCES':>8} {'MS/BLOCK':>10} {'REALTIME x':>12}")
+    rng = np.random.default_rng(0)
+    for count in (1, 4, 16, 32, 64):
+        cues = [SpatialCue(a, "MODERATE", 0.1, f)
+                for a, f in zip(rng.uniform(-90, 90, count), rng.uniform(300, 900, count))]
+        renderer.set_cues(cues)
+        renderer.render_block()
+        start = time.perf_counter()
+        for _ in range(blocks):
+            renderer.render_block()
+        ms = 1000 * (time.perf_counter() - start) / blocks
+        print(f"{count:>8} {ms:>10.3f} {block_ms / ms:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
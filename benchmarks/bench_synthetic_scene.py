@@ -0,0 +1,95 @@
+# ================================================
+# PRAGYAN-NETRA - SYNTHETIC SCENE BENCHMARK
+# Per-region np.mean vs one-reduction RegionDetector on seeded scenes
+# ================================================
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from vision.frame_features import FeatureCache
+from vision.synthetic_scene import REGIONS, RegionDetector, SceneGenerator
+
+
+def legacy_regions(frame):
+    """Region test as it was in SimulationDetector.detect_objects"""
+    height, width = frame.shape[:2]
+    regions = [frame[height//2:, :width//3], frame[height//2:, width//3:2*width//3],
+               frame[height//2:, 2*width//3:]]
+    return {name for name, region in zip(REGIONS, regions) if np.mean(region) < 100}
+
+
+def fps(count, seconds):
+    return count / seconds if seconds else float('inf')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthetic scene / region detector benchmark")
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=64)
+    parser.add_argument("--size", default="640x480")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    width, height = (int(v) for v in args.size.split('x'))
+
+    scene = SceneGenerator(width, height, seed=args.seed)
+    detector = RegionDetector(seed=args.seed)
+
+    start = time.perf_counter()
+    buffer = None
+    for i in range(args.frames):
+        buffer, _ = scene.render(i, buffer)
+    render_s = time.perf_counter() - start
+
+    frames, truths = scene.batch(0, args.frames)
+
+    start = time.perf_counter()
+    legacy = [legacy_regions(frame) for frame in frames]
+    legacy_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    single = [detector.detect_objects(frame) for frame in frames]
+    single_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = []
+    for i in range(0, args.frames, args.batch):
+        batched += detector.detect_batch(frames[i:i + args.batch])
+    batched_s = time.perf_counter() - start
+
+    # Headless stack: render + regions + shared edge features for the wall check
+    cache = FeatureCache()
+    walls_found = walls = 0
+    start = time.perf_counter()
+    buffer = None
+    for i in range(args.frames):
+        buffer, truth = scene.render(i, buffer)
+        detector.detect_objects(buffer)
+        features = cache.get(buffer, i)
+        wall = features.edge_count(int(width*0.3), int(height*0.7), int(width*0.7), height) > 3600
+        walls += truth.wall
+        walls_found += wall and truth.wall
+    stack_s = time.perf_counter() - start
+
+    expected = [{o['region'] for o in truth.obstacles} for truth in truths]
+    agree = sum({d['region'] for d in dets} == exp for dets, exp in zip(single, expected))
+    assert legacy == [{d['region'] for d in dets} for dets in batched]
+
+    print("=" * 60)
+    print(f"SYNTHETIC SCENES - {args.frames} frames {width}x{height}, seed {args.seed}")
+    print("=" * 60)
+    print(f"Scene rendering:          {fps(args.frames, render_s):>9.0f} FPS")
+    print(f"Per-region np.mean:       {fps(args.frames, legacy_s):>9.0f} FPS")
+    print(f"RegionDetector:           {fps(args.frames, single_s):>9.0f} FPS")
+    print(f"RegionDetector batch {args.batch:<3}: {fps(args.frames, batched_s):>9.0f} FPS")
+    print(f"Render + regions + walls: {fps(args.frames, stack_s):>9.0f} FPS")
+    print(f"Region accuracy vs truth: {agree}/{args.frames}")
+    print(f"Walls detected:           {walls_found}/{walls}")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,12 @@ LOGS_DIR = "logs"
 # AI Model Paths
 YOLO_MODEL = "models/yolo/yolov8n.pt"
 FACENET_MODEL = "models/facenet/facenet_keras.h5"  # For future
+ONNX_MODEL = "models/yolo/yolov8n.onnx"  # Exported with: yolo export model=yolov8n.pt format=onnx
+
+# Inference Settings
+INFERENCE_BACKEND = "ultralytics"  # "ultralytics", "onnx" or "opencv"
+INFERENCE_THREADS = 2  # CPU threads for the inference backend
+INFERENCE_INPUT_SIZE = 640  # Network input resolution (320 is faster on small devices)
 
 # Voice Settings
 VOICE_RATE = 160  # Speech speed
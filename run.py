@@ -45,15 +45,24 @@ try:
     
     print("✅ Core libraries loaded")
     
+    # src/ is on sys.path: import the modules the way they import each other,
+    # so shared registries such as open_store() exist once
+    from vision.frame_source import open_source
+    from memory.memory_store import open_store
+    from navigation.route_graph import RouteGraph
+    from memory.context_understanding import ContextManager
+    
     # Try to import our modules
     try:
-        from src.vision.obstacle_detection import ObstacleDetector
+        from vision.obstacle_detection import ObstacleDetector
+        from utils.helpers import load_config
         print("✅ Vision module loaded")
     except:
+        ObstacleDetector = None
         print("⚠️ Vision module not found, using simulation")
     
     try:
-        from src.voice.tts import VoiceAssistant
+        from voice.tts import VoiceAssistant
         print("✅ Voice module loaded")
     except:
         print("⚠️ Voice module not found, creating basic version")
@@ -63,10 +72,16 @@ try:
             def __init__(self):
                 self.engine = pyttsx3.init()
             
-            def speak(self, text):
+            def speak(self, text, priority="info"):
                 print(f"🗣️ {text}")
                 self.engine.say(text)
                 self.engine.runAndWait()
+            
+            def start_async(self):
+                pass
+            
+            def stop_async(self):
+                pass
         
         VoiceAssistant = BasicVoice
     
@@ -88,6 +103,7 @@ class PragyanNetraApp:
         
         # Initialize components
         self.voice = VoiceAssistant()
+        self.detector = self._load_detector()
         self.running = True
         
         # Create data files if they don't exist
@@ -95,6 +111,19 @@ class PragyanNetraApp:
         
         print("✅ System initialized successfully!")
     
+    def _load_detector(self):
+        """Obstacle detector configured by config/settings.py, or None for simulation"""
+        if ObstacleDetector is None:
+            return None
+        try:
+            settings = load_config(os.path.join(current_dir, 'config', 'settings.py'))
+            detector = ObstacleDetector.from_config(settings, base_dir=current_dir)
+            print(f"✅ Detector ready ({settings.get('INFERENCE_BACKEND', 'ultralytics')} backend)")
+            return detector
+        except Exception as e:
+            print(f"⚠️ Detector unavailable ({e}), using simulation")
+            return None
+
     def _init_data_files(self):
         """Initialize data files"""
         data_files = {
@@ -126,7 +155,7 @@ class PragyanNetraApp:
             print("1. 📷 Camera Mode (Live Detection)")
             print("2. 🎮 Simulation Mode")
             print("3. 🧠 Memory Management")
-            print("4. 🧭 Navigation Demo")
+            print("4. 🧭 Indoor Navigation")
             print("5. 🚨 Emergency Test")
             print("6. 📊 System Info")
             print("7. 🚪 Exit")
@@ -163,8 +192,8 @@ class PragyanNetraApp:
         print("\n📷 Starting Camera Mode...")
         self.voice.speak("Starting camera mode")
         
-        cap = cv2.VideoCapture(0)
-        if not cap.isOpened():
+        source = open_source(0).start()
+        if not source.isOpened():
             print("❌ Cannot open webcam")
             self.voice.speak("Cannot access camera. Please check connection.")
             return
@@ -173,11 +202,14 @@ class PragyanNetraApp:
         print("Press 'Q' to quit, 'S' to speak status")
         
         self.voice.speak("Camera ready. Showing live feed.")
+        # Speech must not stall the frame loop
+        self.voice.start_async()
         
         while True:
-            ret, frame = cap.read()
-            if not ret:
+            latest = source.read()
+            if latest is None:
                 break
+            frame = latest.image
             
             # Display frame with overlay
             display = frame.copy()
@@ -186,15 +218,18 @@ class PragyanNetraApp:
             cv2.putText(display, "Press Q to quit | S: Status", (10, 60),
                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 1)
             
-            # Simple obstacle simulation (draw boxes)
-            height, width = frame.shape[:2]
-            cv2.rectangle(display, (100, 100), (200, 200), (0, 0, 255), 2)
-            cv2.putText(display, "SIM: CHAIR", (90, 90),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 1)
-            
-            cv2.rectangle(display, (400, 150), (500, 250), (0, 255, 0), 2)
-            cv2.putText(display, "SIM: TABLE", (390, 140),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
+            if self.detector is not None:
+                self.detector.draw_detections(display, self.detector.detect(frame))
+            else:
+                # Simple obstacle simulation (draw boxes)
+                height, width = frame.shape[:2]
+                cv2.rectangle(display, (100, 100), (200, 200), (0, 0, 255), 2)
+                cv2.putText(display, "SIM: CHAIR", (90, 90),
+                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 1)
+                
+                cv2.rectangle(display, (400, 150), (500, 250), (0, 255, 0), 2)
+                cv2.putText(display, "SIM: TABLE", (390, 140),
+                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
             
             # Show frame
             cv2.imshow('PRAGYAN-NETRA - Camera Mode', display)
@@ -206,8 +241,9 @@ class PragyanNetraApp:
             elif key == ord('s'):
                 self.voice.speak("Camera mode active. Showing live feed.")
         
-        cap.release()
+        source.stop()
         cv2.destroyAllWindows()
+        self.voice.stop_async()
         self.voice.speak("Camera mode ended.")
     
     def simulation_mode(self):
@@ -252,25 +288,12 @@ class PragyanNetraApp:
         print("\n🧠 Memory Management")
         print("-" * 40)
         
-        # Load existing memory
-        face_file = os.path.join(data_dir, 'face_memory.json')
-        object_file = os.path.join(data_dir, 'object_memory.json')
-        
-        try:
-            with open(face_file, 'r') as f:
-                faces = json.load(f)
-            print(f"👥 Known faces: {len(faces.get('known_faces', {}))}")
-        except:
-            faces = {"known_faces": {}}
-            print("👥 No faces in memory yet")
-        
-        try:
-            with open(object_file, 'r') as f:
-                objects = json.load(f)
-            print(f"📦 Personal objects: {len(objects.get('personal_objects', {}))}")
-        except:
-            objects = {"personal_objects": {}}
-            print("📦 No objects in memory yet")
+        # Faces and objects live in the shared SQLite store (legacy JSON migrated once)
+        store = open_store(data_dir)
+        faces = store.all_faces()
+        objects = store.all_objects()
+        print(f"👥 Known faces: {len(faces)}" if faces else "👥 No faces in memory yet")
+        print(f"📦 Personal objects: {len(objects)}" if objects else "📦 No objects in memory yet")
         
         print("\nOptions:")
         print("1. Add new face")
@@ -285,12 +308,7 @@ class PragyanNetraApp:
             relation = input("Relation (friend/family/etc): ").strip()
             
             if name:
-                faces['known_faces'][name] = {
-                    "relation": relation,
-                    "added": "2026-02-08"
-                }
-                with open(face_file, 'w') as f:
-                    json.dump(faces, f, indent=2)
+                store.add_face(name, relation=relation)
                 print(f"✅ Added {name} to face memory")
                 self.voice.speak(f"Added {name} to memory")
         
@@ -299,48 +317,67 @@ class PragyanNetraApp:
             location = input("Location: ").strip()
             
             if obj_name and location:
-                objects['personal_objects'][obj_name] = {
-                    "location": location,
-                    "added": "2026-02-08"
-                }
-                with open(object_file, 'w') as f:
-                    json.dump(objects, f, indent=2)
+                store.put_object(obj_name, location)
                 print(f"✅ Remembered {obj_name} at {location}")
                 self.voice.speak(f"Remembered {obj_name}")
         
         elif choice == "3":
             print("\n📋 Memory Summary:")
             print("-" * 30)
-            for name, info in faces.get('known_faces', {}).items():
-                print(f"👤 {name}: {info.get('relation', 'Unknown')}")
+            for name, info in faces.items():
+                print(f"👤 {name}: {info.get('relation') or 'Unknown'}")
             
-            for obj, info in objects.get('personal_objects', {}).items():
-                print(f"📦 {obj}: {info.get('location', 'Unknown location')}")
+            for obj, info in objects.items():
+                print(f"📦 {obj}: {info.get('location') or 'Unknown location'}")
     
     def navigation_mode(self):
-        """Navigation demo"""
-        print("\n🧭 Navigation Demonstration")
+        """Indoor navigation over the route graph stored with the memory data"""
+        print("\n🧭 Indoor Navigation")
         print("-" * 40)
         
-        self.voice.speak("Starting navigation assistance")
-        
-        steps = [
-            "Starting from main entrance",
-            "Proceed straight for 5 meters",
-            "Turn right at the corridor",
-            "Continue for 10 meters",
-            "Elevator on your left",
-            "Destination: Library entrance reached"
-        ]
+        store = open_store(data_dir)
+        routes = RouteGraph(store)
+        if not routes.places:
+            # Demo building on first use
+            routes.add_edge("Main Entrance", "Corridor", 5, note="Proceed straight for 5 meters")
+            routes.add_edge("Corridor", "Elevator", 10,
+                            note="Turn right at the corridor and continue for 10 meters")
+            routes.add_edge("Elevator", "Library", 4, note="Elevator on your left, library entrance ahead")
+            routes.add_edge("Corridor", "Stairwell", 3, hazards=["stairs"])
+            routes.add_edge("Stairwell", "Library", 6, hazards=["stairs"])
+            routes.add_edge("Main Entrance", "Cafeteria", 8)
+            routes.add_edge("Cafeteria", "Library", 15)
+            routes.mark_safe(["Main Entrance", "Corridor", "Elevator", "Library"])
+        routes.learn()
+        
+        context = ContextManager(data_dir, store=store)
+        origin = context.get_context_summary()['location']
+        if routes.resolve(origin) is None:
+            origin = routes.places[0]
+        print(f"📍 You are at: {origin}")
+        print(f"🗺️ Known places: {', '.join(routes.places)}")
+        destination = input("Take me to: ").strip() or "Library"
+        
+        route = routes.route(origin, destination)
+        if route is None:
+            print(f"❌ No known route to {destination}")
+            self.voice.speak(f"I don't know the way to {destination}")
+            return
         
-        for i, step in enumerate(steps, 1):
+        self.voice.speak(f"Starting navigation to {route['places'][-1]}, {route['distance']:.0f} meters")
+        import time
+        for i, (step, a, b) in enumerate(zip(route['steps'], route['places'], route['places'][1:]), 1):
+            routes.walk(a, b)
             print(f"{i}. {step}")
             self.voice.speak(step)
-            import time
             time.sleep(2)
+            # Segment walked: reweight it by the obstacles met on it
+            routes.learn()
         
-        print("\n✅ Navigation demo completed")
-        self.voice.speak("Navigation demonstration complete")
+        context.update_location(route['places'][-1])
+        context.save_context()
+        print(f"\n✅ Destination reached: {route['places'][-1]}")
+        self.voice.speak(f"Destination: {route['places'][-1]} reached")
     
     def emergency_test(self):
         """Emergency system test"""
@@ -8,10 +8,15 @@ print("PRAGYAN-NETRA - REAL-TIME DETECTION")
 print("Webcam + AI + Voice Integration")
 print("=" * 60)
 
+import os
+import sys
 import cv2
 import time
 import pyttsx3
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from vision.frame_source import WebcamSource
+
 print("\n📦 Loading modules...")
 
 # Initialize voice
@@ -21,7 +26,7 @@ print("✅ Voice engine ready")
 
 # Initialize webcam
 print("\n📷 Initializing webcam...")
-cap = cv2.VideoCapture(0)
+cap = WebcamSource(0).start()
 
 if not cap.isOpened():
     print("❌ ERROR: Cannot open webcam")
@@ -49,10 +54,11 @@ alert_cooldown = 3  # seconds
 
 while True:
     # Capture frame
-    ret, frame = cap.read()
-    if not ret:
+    latest = cap.read()
+    if latest is None:
         print("❌ Cannot read from webcam")
         break
+    frame = latest.image
     
     # Display frame
     cv2.putText(frame, "PRAGYAN-NETRA - Real Time", (10, 30),
@@ -7,20 +7,41 @@
 
 import cv2
 import threading
-import numpy as np
-import pyttsx3
-import winsound
 import time
-import json
-import queue
-import pyaudio
 import os
-import face_recognition
-from vosk import Model, KaldiRecognizer
-from ultralytics import YOLO
+import sys
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from app.pipeline import FramePipeline
+from app.startup import ImportTimer, StagedStartup
+from vision.frame_source import open_source
+from memory.face_index import FaceIndex
+from memory.embedding_store import EmbeddingStore
+from vision.face_tracker import FaceTracker
+from vision.frame_features import FeatureCache, FrameFeatures
+from voice.audio_output import AudioMixer, default_sink
+from voice.speech_scheduler import Pyttsx3Backend, SpeechScheduler
+from voice.wake_word import WakeWordListener, create_vosk_recognizers
+from voice.intents import build_default_intents
+from memory.memory_store import open_store
+from memory.object_memory import ObjectMemory
+from memory.context_understanding import ContextManager
+from navigation.route_graph import RouteGraph
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+SETTINGS_FILE = os.path.join(ROOT_DIR, 'config', 'settings.py')
+sys.path.append(ROOT_DIR)
+from utils.helpers import load_config
+
+# Heavy engines (ultralytics, face_recognition/dlib, vosk, pyttsx3) are
+# imported inside their loaders so the camera loop comes up first.
 
 class PragyanNetraOS:
-    def __init__(self, vosk_path, face_db_path):
+    def __init__(self, vosk_path, face_db_path, face_detect_every=5, face_detect_scale=0.5,
+                 profile_imports=False):
+        self.startup = StagedStartup()
+        self.import_timer = ImportTimer().__enter__() if profile_imports else None
         os.system('cls' if os.name == 'nt' else 'clear')
         print("=" * 70)
         print("            PRAGYAN-NETRA - LOGIC LIONS EDITION")
@@ -28,145 +49,287 @@ class PragyanNetraOS:
         print("=" * 70)
         print("SYSTEM: INITIALIZING V4 CORE ENGINES...")
         
-        # 1. Vision & Voice Engines
-        try:
-            self.yolo = YOLO("yolov10n.pt")
-            print("✅ Vision: YOLOv10 Loaded")
-        except:
-            print("⚠️ Vision: YOLO model not found, running in lite mode")
-
-        self.engine = pyttsx3.init()
-        self.speech_queue = queue.Queue()
+        with self.startup.phase("core"):
+            # Priority speech: emergencies first, stale info messages dropped
+            self.speech_queue = SpeechScheduler()
+            # Warning tones are mixed on their own thread, never blocking a stage
+            self.audio = AudioMixer(default_sink()).start()
+            self.wake_word = "netra"
+            self.vosk_path = vosk_path
+            self.face_db_path = face_db_path
+            self.face_detect_every = face_detect_every
+            self.face_detect_scale = face_detect_scale
+            self.face_index = FaceIndex()
+            
+            # Engines register themselves here once their loaders finish
+            self.detector = None
+            self.engine = None
+            self.rec = None
+            self.face_tracker = None
+            
+            # State Management
+            self.active_listening = False
+            self.running = True
+            self.last_wall_beep = 0
+            self.last_face_time = {}
+            self.feature_cache = FeatureCache()
+            
+            # Offline voice commands
+            data_dir = os.path.dirname(os.path.abspath(face_db_path))
+            # One SQLite store shared by every thread
+            self.memory = open_store(data_dir)
+            self.object_memory = ObjectMemory(data_dir, store=self.memory)
+            self.context = ContextManager(data_dir, store=self.memory)
+            # Indoor routes, reweighted by the obstacles logged since the last run
+            self.routes = RouteGraph(self.memory)
+            self.routes.learn()
+            self.intents = build_default_intents(
+                self.speech_queue.put, self.object_memory, self.context,
+                on_status=lambda: "All systems nominal. Vision and hazard detection active.",
+                routes=self.routes)
+
+    def start_engines(self, voice=True):
+        """Load the heavy engines in background threads"""
+        # 1. Vision Engine
+        self.startup.load_async("detector", self._load_detector, self._on_detector_ready)
         
         # 2. Vosk Voice Command Setup
-        try:
-            self.model = Model(vosk_path)
-            self.rec = KaldiRecognizer(self.model, 16000)
-            print("✅ Voice: Vosk Offline Model Loaded")
-        except:
-            print("❌ Voice: Vosk path error. Check your VOSK_DIR")
+        if voice:
+            self.startup.load_async("vosk", self._load_vosk, self._on_vosk_ready)
+        
+        # 3. Social Memory (Team & Friends)
+        self.startup.load_async("faces", self._load_faces, self._on_faces_ready)
 
-        self.wake_word = "netra"
+    def _load_detector(self):
+        # Backend, threads and input size come from config/settings.py
+        from vision.obstacle_detection import ObstacleDetector
+        return ObstacleDetector.from_config(load_config(SETTINGS_FILE), base_dir=ROOT_DIR)
 
-        # 3. Social Memory (Team & Friends)
-        self.face_db_path = face_db_path
-        self.known_face_encodings = []
-        self.known_face_names = []
+    def _on_detector_ready(self, detector):
+        self.detector = detector
+        print(f"✅ Vision: {type(detector.backend).__name__} detector loaded")
+
+    def _load_vosk(self):
+        # Wake-word grammar runs continuously, the full decoder only after wake
+        wake, command = create_vosk_recognizers(self.vosk_path, self.wake_word,
+                                                command_grammar=self.intents.grammar())
+        return WakeWordListener(wake, command, self.wake_word, intent_matcher=self.intents.match,
+                                command_grammar=self.intents.grammar)
+
+    def _on_vosk_ready(self, rec):
+        self.rec = rec
+        print("✅ Voice: Vosk Offline Model Loaded")
+        threading.Thread(target=self.voice_listener, daemon=True).start()
+
+    def _load_faces(self):
+        import face_recognition
         self.load_social_memory()
-        
-        # 4. State Management
-        self.active_listening = False
-        self.running = True
-        self.last_wall_beep = 0
-        self.last_face_time = {}
+        return FaceTracker(
+            face_recognition.face_locations,
+            face_recognition.face_encodings,
+            self.face_index.match,
+            detect_every=self.face_detect_every,
+            scale=self.face_detect_scale
+        )
+
+    def _on_faces_ready(self, tracker):
+        self.face_tracker = tracker
+
+    def _load_tts(self):
+        import pyttsx3
+        return pyttsx3.init()
 
     def load_social_memory(self):
-        """Loads faces from the data/faces directory"""
+        """Loads faces from the data/faces directory, encoding only new or changed images"""
         if not os.path.exists(self.face_db_path): 
             os.makedirs(self.face_db_path)
         
-        for f in os.listdir(self.face_db_path):
-            if f.endswith((".jpg", ".png")):
-                img = face_recognition.load_image_file(os.path.join(self.face_db_path, f))
-                img = np.array(img, dtype='uint8')
-                enc = face_recognition.face_encodings(img)
-                if enc:
-                    self.known_face_encodings.append(enc[0])
-                    self.known_face_names.append(os.path.splitext(f)[0])
-        print(f"🧠 MEMORY: {len(self.known_face_names)} identities loaded into Social Memory.")
-
-    def wall_hazard_check(self, frame):
+        images = [os.path.join(self.face_db_path, f) for f in sorted(os.listdir(self.face_db_path))
+                  if f.endswith((".jpg", ".png"))]
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(self.face_db_path)), "face_cache")
+        store = EmbeddingStore(cache_dir)
+        encodings = store.sync(images, workers=os.cpu_count())
+
+        for path, enc in encodings.items():
+            self.face_index.add(os.path.splitext(os.path.basename(path))[0], enc)
+        print(f"🧠 MEMORY: {len(self.face_index)} identities loaded into Social Memory "
+              f"(cache: {store.hits} hits, {store.misses} misses).")
+
+    def wall_hazard_check(self, frame, features=None):
         """Logic Lions Edge-Density Wall Detection"""
+        if features is None:
+            features = FrameFeatures(frame)
         h, w = frame.shape[:2]
-        roi = frame[int(h*0.7):h, int(w*0.3):int(w*0.7)]
-        gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
-        edges = cv2.Canny(gray, 50, 150)
+        edge_pixels = features.edge_count(int(w*0.3), int(h*0.7), int(w*0.7), h)
         
-        if np.sum(edges > 0) > 3500: # Threshold for a flat barrier
+        if edge_pixels > 3600: # Threshold for a flat barrier (full-frame edges)
             if time.time() - self.last_wall_beep > 1.5:
-                winsound.Beep(600, 250) # Warning tone
+                self.audio.beep(600, 250) # Warning tone
                 self.last_wall_beep = time.time()
 
     def voice_listener(self):
         """Thread to handle 'Netra' wake word"""
+        import pyaudio
         p = pyaudio.PyAudio()
         stream = p.open(format=pyaudio.paInt16, channels=1, rate=16000, input=True, frames_per_buffer=8000)
         stream.start_stream()
 
         print("🎤 SYSTEM ACTIVE: Say 'Netra' to interact...")
         while self.running:
-            data = stream.read(4000, exception_on_overflow=False)
-            if self.rec.AcceptWaveform(data):
-                res = json.loads(self.rec.Result())['text']
-                
-                if self.wake_word in res:
-                    winsound.Beep(1000, 100) # Logic Lions Success Chirp
-                    self.speech_queue.put(f"Yes Rohith, Logic Lions system is ready.")
+            # 100 ms chunks so partial results can trigger the wake word early
+            data = stream.read(1600, exception_on_overflow=False)
+            for event in self.rec.feed(data):
+                if event[0] == "wake":
+                    self.audio.beep(1000, 100) # Logic Lions Success Chirp
+                    self.speech_queue.put("Yes Rohith, Logic Lions system is ready.", "warning")
                     self.active_listening = True
+                    continue
                 
-                if "status" in res:
-                    self.speech_queue.put("All systems nominal. Vision and hazard detection active.")
+                self.active_listening = False
+                if event[0] == "intent":
+                    self.intents.dispatch(event[1])
+                else:
+                    self.speech_queue.put("Sorry, I did not understand.", "info")
+        
+        stream.stop_stream()
+        stream.close()
+        p.terminate()
+        print(f"🎤 Voice: {self.rec.get_metrics()}")
 
     def speaker_worker(self):
         """Thread to handle audio feedback without blocking vision"""
-        while self.running:
-            if not self.speech_queue.empty():
-                text = self.speech_queue.get()
-                self.engine.say(text)
-                self.engine.runAndWait()
+        # The TTS engine is created in, and driven by, this thread
+        self.engine = self.startup.run_loader("tts", self._load_tts)
+        if self.engine is None:
+            return
+        self.speech_queue.backend = Pyttsx3Backend(self.engine)
+        self.speech_queue.run()
 
-    def run(self):
-        # Start background threads
-        threading.Thread(target=self.voice_listener, daemon=True).start()
-        threading.Thread(target=self.speaker_worker, daemon=True).start()
+    def hazard_stage(self, packet):
+        """Pipeline stage: structural hazard detection"""
+        packet['features'] = self.feature_cache.get(packet['frame'], packet['seq'])
+        self.wall_hazard_check(packet['frame'], packet['features'])
+        return packet
+
+    def face_stage(self, packet):
+        """Pipeline stage: social memory & recognition"""
+        if self.face_tracker is None:
+            return packet
+        tracks = self.face_tracker.update(packet['frame'])
+
+        faces = []
+        for track in tracks:
+            t, r, b, l = track.int_box()
+            name = track.name or "Unknown Person"
+            
+            # Logic Lions Distance Estimation
+            dist_factor = r - l
+            steps = round(450 / (dist_factor + 1)) 
+            
+            # Announce once per track, again if its identity changed or after 12s
+            last_name, last_time = self.last_face_time.get(track.id, (None, 0))
+            if name != last_name or time.time() - last_time > 12:
+                self.speech_queue.put(f"{name} identified, {steps} steps away.")
+                self.last_face_time[track.id] = (name, time.time())
+
+            faces.append(((t, r, b, l), name, steps))
+
+        active = {track.id for track in tracks}
+        self.last_face_time = {k: v for k, v in self.last_face_time.items() if k in active}
+        packet['faces'] = faces
+        return packet
+
+    def render(self, packet):
+        """Draw overlays and show the frame (main thread only)"""
+        frame = packet['frame']
+        for (t, r, b, l), name, steps in packet.get('faces', []):
+            cv2.rectangle(frame, (l, t), (r, b), (255, 0, 0), 2)
+            cv2.putText(frame, f"{name} ({steps} steps)", (l, t-10), 
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 0, 0), 2)
 
-        cap = cv2.VideoCapture(0)
+        cv2.imshow("PRAGYAN-NETRA V4: LOGIC LIONS EDITION", frame)
+        return cv2.waitKey(1) & 0xFF
+
+    def report_startup(self):
+        """Print the startup-phase breakdown (and import times if profiling)"""
+        self.startup.report()
+        if self.import_timer is not None:
+            self.import_timer.__exit__(None, None, None)
+            self.import_timer.report()
+
+    def run(self, video_path=None, headless=False):
+        """
+        Run the capture -> hazard -> face -> render pipeline.
+
+        Args:
+            video_path: read frames from this file instead of the webcam
+            headless: skip the display window and print pipeline stats at exit
+        """
+        # Camera and wall-hazard loop come up first
+        with self.startup.phase("camera"):
+            source = open_source(video_path).start()
+
+            pipeline = FramePipeline(source.read)
+            pipeline.add_stage("hazard", self.hazard_stage)
+            pipeline.add_stage("face", self.face_stage)
+            pipeline.start()
+
+        # Heavy engines load in the background and switch features on when ready
+        self.start_engines(voice=not headless)
+        self.startup.expect("tts")
+        threading.Thread(target=self.speaker_worker, name="tts", daemon=True).start()
         
         # Start-up greeting
-        self.speech_queue.put("Welcome back Rohith Reddy. Pragyan Netra is online.")
+        self.speech_queue.put("Welcome back Rohith Reddy. Pragyan Netra is online.", "info", ttl=None)
 
-        while self.running:
-            ret, frame = cap.read()
-            if not ret: break
-            
-            # 1. Structural Hazard Detection
-            self.wall_hazard_check(frame)
+        first_frame = True
+        reported = False
+        while self.running and not pipeline.done():
+            if not reported and self.startup.all_done():
+                self.report_startup()
+                reported = True
 
-            # 2. Social Memory & Recognition
-            rgb_frame = frame[:, :, ::-1]
-            face_locs = face_recognition.face_locations(rgb_frame)
-            face_encs = face_recognition.face_encodings(rgb_frame, face_locs)
+            packet = pipeline.get_output()
+            if packet is None:
+                continue
+            if first_frame:
+                self.startup.mark("first frame")
+                first_frame = False
+            if headless:
+                continue
 
-            for (t, r, b, l), enc in zip(face_locs, face_encs):
-                matches = face_recognition.compare_faces(self.known_face_encodings, enc)
-                name = self.known_face_names[matches.index(True)] if True in matches else "Unknown Person"
-                
-                # Logic Lions Distance Estimation
-                dist_factor = r - l
-                steps = round(450 / (dist_factor + 1)) 
-                
-                if name not in self.last_face_time or time.time() - self.last_face_time[name] > 12:
-                    self.speech_queue.put(f"{name} identified, {steps} steps away.")
-                    self.last_face_time[name] = time.time()
-
-                # Visual UI
-                cv2.rectangle(frame, (l, t), (r, b), (255, 0, 0), 2)
-                cv2.putText(frame, f"{name} ({steps} steps)", (l, t-10), 
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 0, 0), 2)
-
-            cv2.imshow("PRAGYAN-NETRA V4: LOGIC LIONS EDITION", frame)
-            if cv2.waitKey(1) & 0xFF == ord('q'): 
-                self.speech_queue.put("System shutting down. Goodbye Rohith.")
-                time.sleep(2)
+            if self.render(packet) == ord('q'): 
+                self.speech_queue.put("System shutting down. Goodbye Rohith.", "warning")
+                self.speech_queue.wait_idle(timeout=3)
                 break
 
-        cap.release()
-        cv2.destroyAllWindows()
+        self.running = False
+        self.speech_queue.stop()
+        self.audio.stop()
+        self.context.close()
+        # Obstacles met on the segment being walked
+        self.routes.learn()
+        self.memory.close()
+        pipeline.stop()
+        source.stop()
+        if not reported:
+            self.report_startup()
+        if headless:
+            pipeline.print_stats()
+            print(f"Speech: {self.speech_queue.get_metrics()}")
+        else:
+            cv2.destroyAllWindows()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="PRAGYAN-NETRA V4")
+    parser.add_argument("--video", help="Read frames from a video file instead of the webcam")
+    parser.add_argument("--headless", action="store_true", help="No display window, print pipeline stats")
+    parser.add_argument("--importtime", action="store_true", help="Report per-module import times at startup")
+    args = parser.parse_args()
+
     # SET YOUR DIRECTORIES HERE
     VOSK_DIR = r"C:\Users\Admin\PRAGYAN-NETRA\src\app\vosk-model"
     FACE_DIR = r"C:\Users\Admin\PRAGYAN-NETRA\data\faces"
     
-    netra = PragyanNetraOS(VOSK_DIR, FACE_DIR)
-    netra.run()
+    netra = PragyanNetraOS(VOSK_DIR, FACE_DIR, profile_imports=args.importtime)
+    netra.run(video_path=args.video, headless=args.headless)
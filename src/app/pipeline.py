@@ -0,0 +1,216 @@
+"""
+PRAGYAN-NETRA - Frame Pipeline
+Staged capture -> perception -> render pipeline with bounded queues
+"""
+
+import queue
+import threading
+import time
+
+
+class LatestQueue:
+    """Bounded queue that drops the oldest item when full"""
+
+    def __init__(self, maxsize=1, on_drop=None):
+        self.maxsize = maxsize
+        self.on_drop = on_drop
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self.dropped = 0
+        self.max_depth = 0
+
+    def put(self, item):
+        """Insert item, evicting the oldest one if the queue is full"""
+        with self._lock:
+            while True:
+                try:
+                    self._queue.put_nowait(item)
+                    break
+                except queue.Full:
+                    try:
+                        self._queue.get_nowait()
+                        self.dropped += 1
+                        if self.on_drop:
+                            self.on_drop()
+                    except queue.Empty:
+                        pass
+            self.max_depth = max(self.max_depth, self._queue.qsize())
+
+    def get(self, timeout=None):
+        """Get next item, or None when the timeout expires"""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def depth(self):
+        return self._queue.qsize()
+
+
+class StageStats:
+    """Throughput counters for a single pipeline stage"""
+
+    def __init__(self, name):
+        self.name = name
+        self.processed = 0
+        self.errors = 0
+        self.busy_time = 0.0
+        self.started = None
+
+    def record(self, duration):
+        if self.started is None:
+            self.started = time.perf_counter() - duration
+        self.processed += 1
+        self.busy_time += duration
+
+    def fps(self):
+        if self.started is None:
+            return 0.0
+        elapsed = time.perf_counter() - self.started
+        return self.processed / elapsed if elapsed > 0 else 0.0
+
+    def avg_ms(self):
+        return 1000 * self.busy_time / self.processed if self.processed else 0.0
+
+
+class FramePipeline:
+    """
+    Runs a frame source and a chain of processing stages in separate threads.
+
+    Each stage is a callable taking a packet dict and returning it (or None to
+    discard the frame). Stages are connected by LatestQueue instances so a slow
+    stage always works on the freshest frame instead of building up a backlog.
+    The last queue is drained by the caller through get_output(), which keeps
+    rendering (cv2.imshow) on the main thread.
+    """
+
+    def __init__(self, source, queue_size=1):
+        """
+        Args:
+            source: callable returning a frame (ndarray or FrameSource Frame),
+                or None when the stream ends
+            queue_size: capacity of every inter-stage queue
+        """
+        self.source = source
+        self.queue_size = queue_size
+        self.stages = []
+        self.queues = [LatestQueue(queue_size, self._leave)]
+        self.stats = {"capture": StageStats("capture")}
+        self.running = False
+        self.finished = threading.Event()
+        self._threads = []
+        # Packets captured and not yet dropped, discarded or returned by
+        # get_output(), including the ones a stage is working on
+        self._in_flight = 0
+        self._in_flight_lock = threading.Lock()
+
+    def add_stage(self, name, func):
+        """Append a processing stage"""
+        self.stages.append((name, func))
+        self.queues.append(LatestQueue(self.queue_size, self._leave))
+        self.stats[name] = StageStats(name)
+        return self
+
+    def start(self):
+        """Start capture and stage threads"""
+        self.running = True
+        self.finished.clear()
+        self._in_flight = 0
+        self._threads = [threading.Thread(target=self._capture_loop, daemon=True)]
+        for i, (name, func) in enumerate(self.stages):
+            self._threads.append(threading.Thread(
+                target=self._stage_loop, args=(name, func, i), daemon=True))
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self):
+        """Stop all threads"""
+        self.running = False
+        for thread in self._threads:
+            thread.join(timeout=2)
+        self._threads = []
+
+    def get_output(self, timeout=0.1):
+        """Get the newest fully processed packet, or None"""
+        packet = self.queues[-1].get(timeout=timeout)
+        if packet is not None:
+            self._leave()
+            packet['latency'] = time.perf_counter() - packet['captured']
+        return packet
+
+    def done(self):
+        """True once the source is exhausted and every packet has left the pipeline"""
+        with self._in_flight_lock:
+            return self.finished.is_set() and self._in_flight == 0
+
+    def _enter(self):
+        with self._in_flight_lock:
+            self._in_flight += 1
+
+    def _leave(self):
+        with self._in_flight_lock:
+            self._in_flight -= 1
+
+    def _capture_loop(self):
+        seq = 0
+        stats = self.stats["capture"]
+        while self.running:
+            start = time.perf_counter()
+            frame = self.source()
+            if frame is None:
+                break
+            stats.record(time.perf_counter() - start)
+            packet = {'seq': seq, 'frame': frame, 'captured': time.perf_counter()}
+            if hasattr(frame, 'image'):
+                packet.update(seq=frame.seq, frame=frame.image, timestamp=frame.timestamp)
+            self._enter()
+            self.queues[0].put(packet)
+            seq += 1
+        self.finished.set()
+
+    def _stage_loop(self, name, func, index):
+        stats = self.stats[name]
+        inbox, outbox = self.queues[index], self.queues[index + 1]
+        while self.running:
+            packet = inbox.get(timeout=0.05)
+            if packet is None:
+                continue
+            start = time.perf_counter()
+            try:
+                packet = func(packet)
+            except Exception as e:
+                # A failing frame is discarded; the stage keeps running
+                stats.errors += 1
+                print(f"⚠️ {name}: frame {packet['seq']} failed ({e})")
+                packet = None
+            stats.record(time.perf_counter() - start)
+            if packet is not None:
+                outbox.put(packet)
+            else:
+                self._leave()
+
+    def get_stats(self):
+        """Per-stage throughput and queue-depth counters"""
+        report = {}
+        names = ["capture"] + [name for name, _ in self.stages]
+        for i, name in enumerate(names):
+            stats = self.stats[name]
+            out_queue = self.queues[i]
+            report[name] = {
+                'processed': stats.processed,
+                'errors': stats.errors,
+                'fps': round(stats.fps(), 1),
+                'avg_ms': round(stats.avg_ms(), 2),
+                'queue_depth': out_queue.depth(),
+                'max_queue_depth': out_queue.max_depth,
+                'dropped': out_queue.dropped
+            }
+        return report
+
+    def print_stats(self):
+        """Print a stats table"""
+        print(f"{'STAGE':<10} {'FRAMES':>8} {'ERRORS':>7} {'FPS':>8} {'AVG ms':>8} {'QUEUE':>6} {'MAXQ':>6} {'DROPPED':>8}")
+        for name, s in self.get_stats().items():
+            print(f"{name:<10} {s['processed']:>8} {s['errors']:>7} {s['fps']:>8} {s['avg_ms']:>8} "
+                  f"{s['queue_depth']:>6} {s['max_queue_depth']:>6} {s['dropped']:>8}")
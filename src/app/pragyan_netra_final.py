@@ -14,10 +14,23 @@ import cv2
 import numpy as np
 import pyttsx3
 import time
-import json
 import os
+import sys
+import threading
 from datetime import datetime
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from memory.memory_store import open_store
+from navigation.hazard_prediction import HazardPredictor
+from navigation.route_graph import RouteGraph
+from vision.frame_source import open_source
+from vision.object_tracker import ObjectTracker
+from vision.synthetic_scene import OBJECTS_DATABASE, RegionDetector
+from voice.audio_output import AudioMixer, default_sink
+from voice.phrase_cache import PhraseBackend, PhraseCache, Pyttsx3Renderer, alert_fragments, template_fragments
+from voice.speech_scheduler import EngineThread, SpeechScheduler
+from voice.spatial_audio import BinauralRenderer, detection_cues
+
 print("\n📦 Initializing PRAGYAN-NETRA System...")
 
 # ==================== SYSTEM CONFIGURATION ====================
@@ -36,47 +49,49 @@ class SystemConfig:
         os.makedirs(os.path.join(self.data_dir, "faces"), exist_ok=True)
         os.makedirs(os.path.join(self.data_dir, "objects"), exist_ok=True)
         
-        # Load or create memory
-        self.memory = self.load_memory()
-        
-    def load_memory(self):
-        """Load cognitive memory from file"""
-        if os.path.exists(self.memory_file):
-            try:
-                with open(self.memory_file, 'r') as f:
-                    return json.load(f)
-            except:
-                pass
-        
-        # Default memory structure
-        return {
-            "familiar_faces": {},
-            "personal_objects": {},
-            "safe_paths": [],
-            "emergency_contacts": []
-        }
+        # Cognitive memory in the shared SQLite store (memory.json migrated once)
+        self.store = open_store(self.data_dir)
+        if self.store.get_value("safe_paths") is None:
+            self.store.set_value("safe_paths", [])
+            self.store.set_value("emergency_contacts", [])
+        # Indoor map; "safe_paths" entries flag its segments as safe
+        self.routes = RouteGraph(self.store)
     
     def save_memory(self):
-        """Save cognitive memory to file"""
-        with open(self.memory_file, 'w') as f:
-            json.dump(self.memory, f, indent=2)
+        """Write pending memory now (normally written immediately or in batches)"""
+        self.store.flush()
+        # Reweight the walked segments by the obstacles logged on them
+        self.routes.learn()
 
 # ==================== VOICE SYSTEM ====================
 class VoiceAssistant:
     def __init__(self):
         print("🔊 Initializing Voice Assistant...")
-        self.engine = pyttsx3.init()
-        self.engine.setProperty('rate', 160)
-        self.engine.setProperty('volume', 1.0)
+        # The engine is created on, and only driven by, its own thread
+        self.tts = EngineThread(self._create_engine)
+        
+        # Hazard alerts are assembled from pre-rendered fragments
+        self.phrases = PhraseCache(Pyttsx3Renderer(self.tts))
+        # Set by start_async(): the sound device and mixer thread, and the speech scheduler
+        self.audio = None
+        self.spatial = None
+        self.speech = None
+        self.clips = None
+        print("✅ Voice Assistant ready")
+    
+    @staticmethod
+    def _create_engine():
+        engine = pyttsx3.init()
+        engine.setProperty('rate', 160)
+        engine.setProperty('volume', 1.0)
         
         # Try to set female voice if available
-        voices = self.engine.getProperty('voices')
+        voices = engine.getProperty('voices')
         for voice in voices:
             if 'female' in voice.name.lower():
-                self.engine.setProperty('voice', voice.id)
+                engine.setProperty('voice', voice.id)
                 break
-        
-        print("✅ Voice Assistant ready")
+        return engine
     
     def speak(self, text, priority="normal"):
         """Speak with priority levels"""
@@ -91,8 +106,46 @@ class VoiceAssistant:
         color = colors.get(priority, colors["normal"])
         
         print(f"{color}🗣️  VOICE: {text}{reset}")
-        self.engine.say(text)
-        self.engine.runAndWait()
+        if self.speech is not None:
+            self.speech.say(text, priority)
+            return
+        self.tts.speak(text)
+    
+    def start_async(self):
+        """Make speak() non-blocking until stop_async()"""
+        if self.speech is None:
+            # Cached alerts and tones are mixed on a background thread
+            self.audio = AudioMixer(default_sink(channels=2)).start()
+            self.spatial = BinauralRenderer(self.audio.sample_rate)
+            if self.phrases is not None and self.audio.audible:
+                # Cached alerts are queued and preempted like live speech
+                self.clips = PhraseBackend(self.tts, self.audio, self.phrases)
+            self.speech = SpeechScheduler(self.clips or self.tts).start()
+    
+    def stop_async(self, timeout=5):
+        """Finish queued speech and return to blocking speak()"""
+        if self.speech is not None:
+            self.speech.wait_idle(timeout)
+            self.speech.stop()
+            self.speech = None
+            self.clips = None
+            self.audio.wait_idle(timeout)
+            self.audio.stop()
+            self.audio = None
+    
+    def speak_fragments(self, fragments, priority="normal"):
+        """Speak a templated alert from cached audio, falling back to live TTS"""
+        text = " ".join(fragments)
+        if self.clips is not None:
+            # Played from the cache if every fragment is rendered, else spoken live
+            self.clips.register(text, fragments)
+        self.speak(text, priority)
+    
+    def prewarm(self, objects):
+        """Pre-render alert fragments in the background so hazard alerts play without synthesis"""
+        if self.phrases is not None:
+            threading.Thread(target=self.phrases.prewarm, args=(template_fragments(objects),),
+                             name="phrase-prewarm", daemon=True).start()
     
     def welcome_message(self):
         """System welcome message"""
@@ -106,63 +159,16 @@ class VoiceAssistant:
 
 # ==================== SIMULATION MODE (No YOLO) ====================
 class SimulationDetector:
-    def __init__(self):
+    def __init__(self, seed=0):
         print("🤖 Initializing Simulation Detector...")
-        self.objects_database = {
-            "person": ["Subhiksha", "Jenisha", "Kaviyasri", "Sumithra", "Unknown"],
-            "chair": ["Office Chair", "Dining Chair", "Wheelchair"],
-            "table": ["Dining Table", "Study Table", "Coffee Table"],
-            "bottle": ["Water Bottle", "Medicine Bottle"],
-            "phone": ["Mobile Phone", "Landline"],
-            "stairs": ["Staircase Up", "Staircase Down"],
-            "door": ["Entrance Door", "Room Door"]
-        }
+        # Seeded, vectorized region detector: runs are reproducible
+        self.regions = RegionDetector(OBJECTS_DATABASE, seed=seed)
+        self.objects_database = self.regions.objects_database
         print("✅ Simulation Detector ready")
     
     def detect_objects(self, frame):
         """Simulate object detection"""
-        height, width = frame.shape[:2]
-        
-        # Divide frame into regions
-        regions = {
-            "left": frame[height//2:, :width//3],
-            "center": frame[height//2:, width//3:2*width//3],
-            "right": frame[height//2:, 2*width//3:]
-        }
-        
-        detections = []
-        
-        for region_name, region in regions.items():
-            # Simple brightness-based detection for simulation
-            avg_brightness = np.mean(region)
-            
-            if avg_brightness < 100:  # Dark area = potential obstacle
-                # Randomly select an object type
-                import random
-                obj_type = random.choice(list(self.objects_database.keys()))
-                obj_name = random.choice(self.objects_database[obj_type])
-                
-                # Estimate distance based on darkness
-                if avg_brightness < 50:
-                    distance = "VERY CLOSE"
-                    confidence = 0.85
-                elif avg_brightness < 80:
-                    distance = "CLOSE"
-                    confidence = 0.75
-                else:
-                    distance = "MODERATE"
-                    confidence = 0.65
-                
-                detections.append({
-                    "type": obj_type,
-                    "name": obj_name,
-                    "region": region_name.upper(),
-                    "distance": distance,
-                    "confidence": confidence,
-                    "brightness": avg_brightness
-                })
-        
-        return detections
+        return self.regions.detect_objects(frame)
 
 # ==================== MAIN SYSTEM ====================
 class PragyanNetraSystem:
@@ -175,12 +181,18 @@ class PragyanNetraSystem:
         self.config = SystemConfig()
         self.voice = VoiceAssistant()
         self.detector = SimulationDetector()
+        # Alerts name the detected objects (e.g. "Office Chair"); simulation mode uses the types
+        database = self.detector.objects_database
+        self.voice.prewarm(list(database) + [name for names in database.values() for name in names])
         
         # System state
         self.running = True
         self.emergency_mode = False
-        self.last_alert_time = 0
-        self.alert_cooldown = 5  # seconds
+        # Obstacles are tracked; each track is announced once (again if it comes closer)
+        self.tracker = ObjectTracker()
+        self.detect_every = 3  # frames between detector runs, tracks are predicted in between
+        # Time to collision from each track's box growth orders the announcements
+        self.hazards = HazardPredictor()
         
         # Statistics
         self.objects_detected = 0
@@ -234,12 +246,14 @@ class PragyanNetraSystem:
         """Real-time camera detection mode"""
         self.voice.speak("Starting camera mode. Opening webcam...", "info")
         
-        cap = cv2.VideoCapture(0)
-        if not cap.isOpened():
+        source = open_source(0).start()
+        if not source.isOpened():
             self.voice.speak("Cannot open webcam. Please check camera connection.", "warning")
             return
         
         self.voice.speak("Camera ready. Show objects to the camera. Press Q to quit.", "info")
+        # Speech and tones must not stall the frame loop
+        self.voice.start_async()
         
         print("\n" + "="*50)
         print("CAMERA MODE - LIVE DETECTION")
@@ -251,57 +265,90 @@ class PragyanNetraSystem:
         print("- Press 'M' to memorize current scene")
         print("="*50)
         
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
-            
-            # Display frame with UI
-            display_frame = frame.copy()
-            cv2.putText(display_frame, "PRAGYAN-NETRA - LIVE", (10, 30),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-            cv2.putText(display_frame, f"Objects: {self.objects_detected} | Warnings: {self.warnings_issued}", 
-                       (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 1)
-            cv2.putText(display_frame, "Press Q to quit | S: Speak | E: Emergency | M: Memorize", 
-                       (10, 90), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 255, 255), 1)
-            
-            # Run detection periodically
-            current_time = time.time()
-            if current_time - self.last_alert_time > self.alert_cooldown:
-                detections = self.detector.detect_objects(frame)
+        self.tracker = ObjectTracker()
+        self.hazards = HazardPredictor()
+        frame_index = 0
+        ttc = {}  # track id -> time to collision, from the last detector frame
+        try:
+            while True:
+                latest = source.read()
+                if latest is None:
+                    break
+                frame = latest.image
+                
+                # Display frame with UI
+                display_frame = frame.copy()
+                cv2.putText(display_frame, "PRAGYAN-NETRA - LIVE", (10, 30),
+                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+                cv2.putText(display_frame, f"Objects: {self.objects_detected} | Warnings: {self.warnings_issued}", 
+                           (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 1)
+                cv2.putText(display_frame, "Press Q to quit | S: Speak | E: Emergency | M: Memorize", 
+                           (10, 90), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 255, 255), 1)
+                
+                # Detect every few frames, track in between; announce per track
+                confirmed = self.tracker.confirmed_total
+                now = latest.timestamp
+                if frame_index % self.detect_every == 0:
+                    self.tracker.update(self.detector.detect_objects(frame), frame.shape)
+                    # Fit time to collision to detector boxes only: not to predicted
+                    # boxes or coasting tracks, which are the filter's own extrapolation
+                    matched = [track.as_detection() for track in self.tracker.active() if not track.misses]
+                    ttc = {det['track_id']: det.get('ttc', np.inf)
+                           for det in self.hazards.measure(matched, now, frame.shape[1])}
+                else:
+                    self.tracker.predict()
+                frame_index += 1
+                self.objects_detected += self.tracker.confirmed_total - confirmed
                 
-                if detections:
-                    self.objects_detected += len(detections)
+                # Fast-approaching tracks are news even without a closer distance class
+                due = self.tracker.announcements(now=now)
+                for track in self.tracker.active():
+                    if (track not in due and not track.misses and ttc.get(track.id, np.inf) < self.hazards.ttc_threshold
+                            and now - track.announced_at > self.hazards.ttc_threshold):
+                        track.announced_at = now
+                        due.append(track)
+                announce = [track.as_detection() for track in due]
+                # Most imminent first
+                announce.sort(key=lambda det: ttc.get(det['track_id'], np.inf))
+                if announce:
+                    # Binaural pulses place every new or approaching obstacle around the listener
+                    self.voice.audio.play(self.voice.spatial.render(detection_cues(announce, frame.shape), 0.6))
                     
-                    for det in detections:
-                        if det['distance'] in ["VERY CLOSE", "CLOSE"]:
+                    for det in announce:
+                        if det['distance'] in ["VERY CLOSE", "CLOSE"] or ttc.get(det['track_id'], np.inf) < self.hazards.ttc_threshold:
                             self.warnings_issued += 1
-                            alert_msg = f"Warning! {det['name']} {det['distance'].lower()} on your {det['region'].lower()}"
-                            self.voice.speak(alert_msg, "warning")
+                            self.voice.audio.beep(600, 250)
+                            self.voice.speak_fragments(
+                                alert_fragments(det['name'], det['region'], det['distance'], "warning"), "warning")
                         else:
-                            info_msg = f"{det['name']} detected {det['distance'].lower()} on your {det['region'].lower()}"
-                            self.voice.speak(info_msg, "info")
-                    
-                    self.last_alert_time = current_time
-            
-            # Show frame
-            cv2.imshow('PRAGYAN-NETRA - Live Camera', display_frame)
-            
-            # Handle keyboard input
-            key = cv2.waitKey(1) & 0xFF
-            if key == ord('q'):
-                break
-            elif key == ord('s'):
-                status = f"System active. Detected {self.objects_detected} objects so far."
-                self.voice.speak(status, "info")
-            elif key == ord('e'):
-                self.trigger_emergency()
-            elif key == ord('m'):
-                self.memorize_scene(frame)
-        
-        # Cleanup
-        cap.release()
-        cv2.destroyAllWindows()
+                            self.voice.speak_fragments(
+                                alert_fragments(det['name'], det['region'], det['distance'], "info"), "info")
+                
+                for track in self.tracker.active():
+                    x1, y1, x2, y2 = (int(v) for v in track.bbox)
+                    cv2.rectangle(display_frame, (x1, y1), (x2, y2), (0, 200, 255), 2)
+                    cv2.putText(display_frame, f"#{track.id} {track.name}", (x1 + 4, y1 + 16),
+                                cv2.FONT_HERSHEY_SIMPLEX, 0.45, (0, 200, 255), 1)
+                
+                # Show frame
+                cv2.imshow('PRAGYAN-NETRA - Live Camera', display_frame)
+                
+                # Handle keyboard input
+                key = cv2.waitKey(1) & 0xFF
+                if key == ord('q'):
+                    break
+                elif key == ord('s'):
+                    status = f"System active. Detected {self.objects_detected} objects so far."
+                    self.voice.speak(status, "info")
+                elif key == ord('e'):
+                    self.trigger_emergency()
+                elif key == ord('m'):
+                    self.memorize_scene(frame)
+        finally:
+            # Cleanup, also when a frame fails
+            source.stop()
+            cv2.destroyAllWindows()
+            self.voice.stop_async()
         self.voice.speak("Camera mode ended. Returning to main menu.", "info")
     
     def simulation_mode(self):
@@ -330,10 +377,10 @@ class PragyanNetraSystem:
                 print(f"📍 Detected: {obstacle} - Position: {pos} - Distance: {dist}")
                 
                 if dist in ["VERY CLOSE", "CLOSE"]:
-                    self.voice.speak(f"Warning! {obstacle} {dist.lower()} on your {pos.lower()}", "warning")
+                    self.voice.speak_fragments(alert_fragments(obstacle, pos, dist, "warning"), "warning")
                     self.warnings_issued += 1
                 else:
-                    self.voice.speak(f"{obstacle} detected {dist.lower()} on your {pos.lower()}", "info")
+                    self.voice.speak_fragments(alert_fragments(obstacle, pos, dist, "info"), "info")
                 
                 self.objects_detected += 1
                 time.sleep(1)
@@ -366,7 +413,7 @@ class PragyanNetraSystem:
         choice = input("Select option (1-4): ").strip()
         
         if choice == "1":
-            faces = self.config.memory.get("familiar_faces", {})
+            faces = self.config.store.all_faces()
             if faces:
                 print("\n👨‍👩‍👧‍👦 Familiar Faces:")
                 for name, details in faces.items():
@@ -376,7 +423,7 @@ class PragyanNetraSystem:
                 self.voice.speak("No familiar faces in memory yet.", "info")
         
         elif choice == "2":
-            objects = self.config.memory.get("personal_objects", {})
+            objects = self.config.store.all_objects()
             if objects:
                 print("\n📦 Personal Objects:")
                 for obj, details in objects.items():
@@ -394,12 +441,8 @@ class PragyanNetraSystem:
                 relation = input("Relation: ").strip()
                 
                 if name:
-                    self.config.memory.setdefault("familiar_faces", {})
-                    self.config.memory["familiar_faces"][name] = {
-                        "relation": relation,
-                        "added": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    }
-                    self.config.save_memory()
+                    self.config.store.add_face(name, relation=relation,
+                                               added=datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
                     print(f"✅ Added {name} to familiar faces.")
                     self.voice.speak(f"Added {name} to memory.", "info")
             
@@ -408,12 +451,8 @@ class PragyanNetraSystem:
                 location = input("Location: ").strip()
                 
                 if obj_name:
-                    self.config.memory.setdefault("personal_objects", {})
-                    self.config.memory["personal_objects"][obj_name] = {
-                        "location": location,
-                        "added": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    }
-                    self.config.save_memory()
+                    self.config.store.put_object(obj_name, location,
+                                                 added=datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
                     print(f"✅ Added {obj_name} to personal objects.")
                     self.voice.speak(f"Added {obj_name} to memory.", "info")
         
@@ -434,17 +473,9 @@ class PragyanNetraSystem:
         self.voice.speak("EMERGENCY ALERT ACTIVATED! Danger detected! Alerting caregivers!", "emergency")
         
         # Log emergency
-        emergency_log = {
-            "timestamp": datetime.now().isoformat(),
-            "type": "manual_trigger",
-            "location": "unknown"
-        }
-        
-        self.config.memory.setdefault("emergencies", [])
-        self.config.memory["emergencies"].append(emergency_log)
-        self.config.save_memory()
+        self.config.store.log_emergency("manual_trigger", "unknown")
         
-        print("🚨 EMERGENCY LOGGED: Check memory.json for details")
+        print(f"🚨 EMERGENCY LOGGED: Check {self.config.store.path} for details")
         time.sleep(2)
         self.voice.speak("Emergency response initiated. Help is on the way.", "warning")
     
@@ -480,10 +511,12 @@ class PragyanNetraSystem:
         print(f"Emergencies Handled: {self.emergencies_handled}")
         
         # Memory stats
-        faces = len(self.config.memory.get('familiar_faces', {}))
-        objects = len(self.config.memory.get('personal_objects', {}))
+        faces = len(self.config.store.all_faces())
+        objects = len(self.config.store.all_objects())
         print(f"Familiar Faces: {faces}")
         print(f"Personal Objects: {objects}")
+        print(f"Mapped Places: {len(self.config.routes.places)} "
+              f"({len(self.config.store.get_value('safe_paths') or [])} safe paths)")
         
         print("-"*50)
         self.voice.speak(f"System status: Active. Detected {self.objects_detected} objects. Issued {self.warnings_issued} warnings.", "info")
@@ -496,13 +529,15 @@ class PragyanNetraSystem:
         
         # Save final state
         self.config.save_memory()
+        memory_entries = len(self.config.store.all_faces()) + len(self.config.store.all_objects())
+        self.config.store.close()
         
         # Final report
         print(f"\n📊 FINAL REPORT:")
         print(f"  • Objects Detected: {self.objects_detected}")
         print(f"  • Warnings Issued: {self.warnings_issued}")
         print(f"  • Emergencies Handled: {self.emergencies_handled}")
-        print(f"  • Memory Entries: {len(self.config.memory.get('familiar_faces', {})) + len(self.config.memory.get('personal_objects', {}))}")
+        print(f"  • Memory Entries: {memory_entries}")
         
         # Goodbye message
         self.voice.speak(f"Pragyan Netra system shutting down. Thank you for using our system. Stay safe!", "info")
@@ -0,0 +1,169 @@
+"""
+PRAGYAN-NETRA - Staged Startup
+Background engine loading with phase timing and import-time reporting
+"""
+
+import builtins
+import sys
+import threading
+import time
+
+
+class ImportTimer:
+    """
+    Records self/cumulative time of every module imported while active,
+    in the spirit of `python -X importtime`. Works across threads.
+    """
+
+    def __init__(self):
+        self.records = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._original = None
+
+    def __enter__(self):
+        self._original = builtins.__import__
+        builtins.__import__ = self._import
+        return self
+
+    def __exit__(self, *exc):
+        builtins.__import__ = self._original
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if level != 0 or name in sys.modules:
+            return self._original(name, globals, locals, fromlist, level)
+
+        stack = self._local.__dict__.setdefault('stack', [])
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return self._original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            with self._lock:
+                self.records.append((name, elapsed - children, elapsed, len(stack),
+                                     threading.current_thread().name))
+
+    def report(self, limit=25):
+        """Print the slowest top-level imports and their heaviest children"""
+        print("import time: self [us] | cumulative | thread | imported package")
+        slowest = sorted(self.records, key=lambda r: r[2], reverse=True)[:limit]
+        for name, self_time, cumulative, depth, thread in slowest:
+            print(f"import time: {int(self_time * 1e6):>9} | {int(cumulative * 1e6):>10} | "
+                  f"{thread:<10} | {'  ' * depth}{name}")
+
+
+class StagedStartup:
+    """
+    Brings engines up progressively.
+
+    Heavy engines (YOLO, Vosk, face models, TTS) are loaded by loader
+    functions in background threads and register themselves when ready, so
+    the camera and wall-hazard loop can start immediately.
+    """
+
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.phases = []
+        self.engines = {}
+        self.errors = {}
+        self.pending = set()
+        self._lock = threading.Lock()
+
+    def phase(self, name):
+        """Context manager timing a synchronous startup phase"""
+        return _Phase(self, name)
+
+    def mark(self, name):
+        """Record a milestone measured from startup begin"""
+        self._record(name, 0.0, time.perf_counter() - self.t0, threading.current_thread().name)
+
+    def expect(self, name):
+        """Declare an engine that a thread will load later via run_loader"""
+        with self._lock:
+            self.pending.add(name)
+
+    def run_loader(self, name, loader):
+        """Run a loader in the current thread and register its result"""
+        try:
+            return self._load(name, loader)
+        finally:
+            with self._lock:
+                self.pending.discard(name)
+
+    def _load(self, name, loader):
+        with self._lock:
+            self.pending.add(name)
+        start = time.perf_counter()
+        engine = None
+        try:
+            engine = loader()
+        except Exception as e:
+            self.errors[name] = e
+            print(f"⚠️ {name}: failed to load ({e})")
+        elapsed = time.perf_counter() - start
+        self._record(name, elapsed, time.perf_counter() - self.t0, threading.current_thread().name)
+        with self._lock:
+            if name not in self.errors:
+                self.engines[name] = engine
+        return engine
+
+    def load_async(self, name, loader, on_ready=None):
+        """Load an engine in a background thread, then call on_ready(engine)"""
+        with self._lock:
+            self.pending.add(name)
+
+        def target():
+            # Still pending until on_ready has registered the engine with the app
+            try:
+                engine = self._load(name, loader)
+                if name in self.engines and on_ready is not None:
+                    on_ready(engine)
+            finally:
+                with self._lock:
+                    self.pending.discard(name)
+
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+        return thread
+
+    def ready(self, name):
+        return name in self.engines
+
+    def get(self, name):
+        return self.engines.get(name)
+
+    def all_done(self):
+        with self._lock:
+            return not self.pending
+
+    def _record(self, name, duration, at, thread):
+        with self._lock:
+            self.phases.append((name, duration, at, thread))
+
+    def report(self):
+        """Print the startup-phase timing breakdown"""
+        print("-" * 60)
+        print(f"{'STARTUP PHASE':<20} {'THREAD':<10} {'DURATION':>10} {'READY AT':>10}")
+        for name, duration, at, thread in sorted(self.phases, key=lambda p: p[2]):
+            status = " (failed)" if name in self.errors else ""
+            print(f"{name:<20} {thread:<10} {duration:>9.2f}s {at:>9.2f}s{status}")
+        print("-" * 60)
+
+
+class _Phase:
+    def __init__(self, startup, name):
+        self.startup = startup
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        now = time.perf_counter()
+        self.startup._record(self.name, now - self.start, now - self.startup.t0,
+                             threading.current_thread().name)
@@ -3,101 +3,132 @@ PRAGYAN-NETRA - Context Understanding Module
 Understands scenes and maintains context
 """
 
-import json
 import os
+import threading
 from datetime import datetime
 
+from memory.memory_store import open_store
+from memory.obstacle_stats import ObstacleStats
+from memory.persistence import open_document
+
+STATE_FILE = "context_state.json"
+
 class ContextManager:
-    def __init__(self, data_dir="../../data"):
+    def __init__(self, data_dir="../../data", store=None, batch_size=256, flush_interval=1.0,
+                 half_life_days=14.0, state_flush_interval=2.0, journal=True):
+        """
+        Args:
+            store: shared MemoryStore (default: the one for data_dir)
+            batch_size: obstacle events per batched insert
+            flush_interval: seconds between background inserts of pending events
+            half_life_days: decay of the obstacle prediction statistics
+            state_flush_interval: seconds between snapshots of the location state
+            journal: journal location updates so a crash between snapshots loses none
+        """
         self.data_dir = data_dir
-        self.context_file = os.path.join(data_dir, "context_memory.json")
-        self.load_context()
-        
-    def load_context(self):
-        """Load context memory"""
-        if os.path.exists(self.context_file):
-            with open(self.context_file, 'r') as f:
-                self.context = json.load(f)
+        # Obstacle events are buffered and inserted in batches by the store;
+        # context_memory.json is migrated on first open
+        self.store = store if store is not None else open_store(
+            data_dir, batch_size=batch_size, flush_interval=flush_interval)
+        # Location updates only touch memory; a background flusher writes
+        # atomic snapshots of context_state.json (seeded from the migrated setting)
+        self.state = open_document(
+            os.path.join(data_dir, STATE_FILE),
+            default={"current_location": self.store.get_value("current_location", "UNKNOWN")},
+            flush_interval=state_flush_interval, journal=journal)
+        self._lock = threading.Lock()
+        self.stats = self._load_stats(half_life_days)
+    
+    def _load_stats(self, half_life_days):
+        """Saved statistics plus any events logged after they were saved"""
+        saved = self.store.get_value("obstacle_stats")
+        if saved is None:
+            stats, last_id = ObstacleStats(half_life_days), 0
         else:
-            self.context = {
-                "current_location": "UNKNOWN",
-                "last_obstacles": [],
-                "frequent_paths": {},
-                "time_patterns": {}
-            }
+            stats, last_id = ObstacleStats.from_dict(saved), saved.get('last_event_id', 0)
+        for _, obs_type, position, timestamp in self.store.obstacle_events_after(last_id):
+            stats.update(obs_type, position, datetime.fromisoformat(timestamp))
+        return stats
+    
+    @property
+    def context(self):
+        """Snapshot of the context in the legacy context_memory.json layout"""
+        return {
+            "current_location": self.state.data.get("current_location", "UNKNOWN"),
+            "last_obstacles": self.store.recent_obstacles(50),
+            "frequent_paths": {f"{obs_type}_{position}": count
+                               for (obs_type, position), count in self.store.obstacle_counts().items()},
+            "time_patterns": self.stats.bucket_weights()
+        }
+    
+    def load_context(self):
+        """Context lives in the store; kept for compatibility"""
+        return self.context
     
     def save_context(self):
-        """Save context memory"""
-        with open(self.context_file, 'w') as f:
-            json.dump(self.context, f, indent=2)
+        """Snapshot the location state, insert pending obstacle events and save the prediction statistics"""
+        self.state.flush()
+        with self._lock:
+            snapshot = self.stats.to_dict()
+            snapshot['last_event_id'] = self.store.last_obstacle_id()
+        self.store.set_value("obstacle_stats", snapshot)
+    
+    def close(self):
+        """Save everything; the shared store and state document close at exit"""
+        self.save_context()
+    
+    def persistence_stats(self):
+        """Location snapshot flushes and obstacle event batches (counts and latency)"""
+        return {'state': self.state.stats(), 'events': self.store.stats()}
     
     def update_location(self, location, confidence=0.8):
         """Update current location context"""
-        self.context['current_location'] = location
-        self.context['location_confidence'] = confidence
-        self.context['last_updated'] = datetime.now().isoformat()
-        self.save_context()
+        self.state.set(['current_location'], location)
+        self.state.set(['location_confidence'], confidence)
+        self.state.set(['last_updated'], datetime.now().isoformat())
     
     def add_obstacle_context(self, obstacle_type, position, time_of_day=None):
-        """Add obstacle to context memory"""
-        if time_of_day is None:
-            time_of_day = datetime.now().strftime("%H:%M")
-        
-        obstacle_entry = {
-            "type": obstacle_type,
-            "position": position,
-            "time": time_of_day,
-            "timestamp": datetime.now().isoformat()
-        }
-        
-        self.context['last_obstacles'].append(obstacle_entry)
-        
-        # Keep only last 50 obstacles
-        if len(self.context['last_obstacles']) > 50:
-            self.context['last_obstacles'] = self.context['last_obstacles'][-50:]
-        
-        # Update frequency
-        key = f"{obstacle_type}_{position}"
-        self.context['frequent_paths'][key] = \
-            self.context['frequent_paths'].get(key, 0) + 1
-        
-        self.save_context()
+        """Add obstacle to context memory and the prediction statistics"""
+        now = datetime.now()
+        if time_of_day is not None:
+            hour, minute = (int(part) for part in time_of_day.split(':')[:2])
+            now = now.replace(hour=hour, minute=minute)
+        with self._lock:
+            self.store.log_obstacle(obstacle_type, position, now.strftime("%H:%M"), now.isoformat())
+            self.stats.update(obstacle_type, position, now)
     
-    def predict_obstacles(self, current_time=None):
-        """Predict likely obstacles based on history"""
-        if current_time is None:
-            current_time = datetime.now().strftime("%H:%M")
+    def predict_obstacles(self, current_time=None, k=5, min_probability=0.05):
+        """
+        Likely obstacles for this hour of the week, most likely first.
         
-        predictions = []
+        Args:
+            current_time: datetime or "HH:MM" today (default now)
         
-        # Analyze patterns
-        for obstacle in self.context['last_obstacles'][-20:]:  # Last 20
-            if obstacle['time'][:2] == current_time[:2]:  # Same hour
-                predictions.append({
-                    "type": obstacle['type'],
-                    "position": obstacle['position'],
-                    "confidence": 0.6,
-                    "based_on": "TIME_PATTERN"
-                })
-        
-        # Check frequent paths
-        for key, count in self.context['frequent_paths'].items():
-            if count > 3:  # Appeared at least 3 times
-                obs_type, position = key.split('_', 1)
-                predictions.append({
-                    "type": obs_type,
-                    "position": position,
-                    "confidence": min(0.9, count / 10),
-                    "based_on": "FREQUENCY"
-                })
+        Returns:
+            list of {type, position, probability, confidence, based_on}
+        """
+        if current_time is None:
+            current_time = datetime.now()
+        elif isinstance(current_time, str):
+            hour, minute = (int(part) for part in current_time.split(':')[:2])
+            current_time = datetime.now().replace(hour=hour, minute=minute)
         
-        return predictions
+        with self._lock:
+            predictions = self.stats.predict(current_time, k, min_probability)
+        return [{
+            "type": obs_type,
+            "position": position,
+            "probability": probability,
+            "confidence": probability,
+            "based_on": "HOUR_OF_WEEK"
+        } for obs_type, position, probability in predictions]
     
     def get_context_summary(self):
         """Get current context summary"""
+        context = self.context
         return {
-            "location": self.context['current_location'],
-            "recent_obstacles": len(self.context['last_obstacles']),
-            "known_patterns": len(self.context['frequent_paths']),
-            "time_patterns": len(self.context['time_patterns'])
+            "location": context['current_location'],
+            "recent_obstacles": len(context['last_obstacles']),
+            "known_patterns": len(context['frequent_paths']),
+            "time_patterns": len(context['time_patterns'])
         }
\ No newline at end of file
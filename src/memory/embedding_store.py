@@ -0,0 +1,166 @@
+"""
+PRAGYAN-NETRA - Embedding Store Module
+Persistent on-disk cache of face embeddings for fast startup
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
+def file_hash(path):
+    """SHA-1 of a file's content"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def encode_face_file(path):
+    """Encode the first face in an image file (runs in worker processes)"""
+    import face_recognition
+
+    img = face_recognition.load_image_file(path)
+    img = np.array(img, dtype='uint8')
+    enc = face_recognition.face_encodings(img)
+    return enc[0] if enc else None
+
+
+class EmbeddingStore:
+    """
+    Face embeddings cached in a memory-mapped .npy matrix plus a JSON manifest.
+
+    Entries are keyed by file path and validated by mtime and size; when those
+    changed the content hash decides whether the image really has to be
+    re-encoded. Images without a face are cached too so they are not
+    re-decoded on every boot.
+    """
+
+    def __init__(self, cache_dir, dim=128):
+        self.cache_dir = cache_dir
+        self.dim = dim
+        self.manifest_file = os.path.join(cache_dir, 'manifest.json')
+        self.matrix_file = os.path.join(cache_dir, 'embeddings.npy')
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self.load()
+
+    def load(self):
+        """Load manifest and memory-map the embedding matrix"""
+        self.entries = {}
+        self.matrix = np.zeros((0, self.dim), dtype=np.float32)
+        if os.path.exists(self.manifest_file) and os.path.exists(self.matrix_file):
+            try:
+                with open(self.manifest_file, 'r') as f:
+                    self.entries = json.load(f)['entries']
+                self.matrix = np.load(self.matrix_file, mmap_mode='r')
+            except (ValueError, KeyError, OSError):
+                self.entries = {}
+
+    def save(self, entries, matrix):
+        """Atomically replace matrix and manifest"""
+        # Release the memory map before replacing the file it points to; nothing
+        # else may hold a view of it (Windows refuses to replace a mapped file)
+        del self.matrix
+        self.matrix = np.zeros((0, self.dim), dtype=np.float32)
+
+        tmp_matrix = self.matrix_file + '.tmp.npy'
+        np.save(tmp_matrix, matrix)
+        os.replace(tmp_matrix, self.matrix_file)
+
+        tmp_manifest = self.manifest_file + '.tmp'
+        with open(tmp_manifest, 'w') as f:
+            json.dump({'dim': self.dim, 'entries': entries}, f, indent=2)
+        os.replace(tmp_manifest, self.manifest_file)
+
+        self.entries = entries
+        self.matrix = np.load(self.matrix_file, mmap_mode='r')
+
+    def _lookup(self, path, stat):
+        """Return the cached entry for path if it is still valid"""
+        entry = self.entries.get(path)
+        if entry is None or entry['size'] != stat.st_size:
+            return None
+        if entry['mtime'] == stat.st_mtime:
+            return entry
+        # Touched but maybe not modified - let the content decide
+        if entry['sha1'] == file_hash(path):
+            return dict(entry, mtime=stat.st_mtime)
+        return None
+
+    def sync(self, image_paths, encoder=encode_face_file, workers=None):
+        """
+        Bring the cache up to date with image_paths.
+
+        Args:
+            image_paths: images that make up the gallery
+            encoder: function path -> embedding or None
+            workers: encode new/changed images in a process pool of this size;
+                workers are spawned, not forked, as the caller may be one of
+                several running threads
+
+        Returns:
+            dict path -> embedding for every image that contains a face
+        """
+        self.hits = 0
+        self.misses = 0
+        entries = {}
+        cached_rows = {}
+        to_encode = []
+
+        for path in image_paths:
+            path = os.path.abspath(path)
+            stat = os.stat(path)
+            entry = self._lookup(path, stat)
+            if entry is not None:
+                self.hits += 1
+                entries[path] = entry
+                if entry['row'] is not None:
+                    cached_rows[path] = entry['row']
+            else:
+                self.misses += 1
+                to_encode.append((path, stat))
+
+        if workers and workers > 1 and len(to_encode) > 1:
+            with ProcessPoolExecutor(max_workers=workers,
+                                     mp_context=multiprocessing.get_context("spawn")) as pool:
+                encoded = list(pool.map(encoder, [p for p, _ in to_encode]))
+        else:
+            encoded = [encoder(p) for p, _ in to_encode]
+
+        # Copies, not views: a view would keep the memory map open past save()
+        result = {path: np.array(self.matrix[row], dtype=np.float32, copy=True)
+                  for path, row in cached_rows.items()}
+        for (path, stat), enc in zip(to_encode, encoded):
+            entries[path] = {
+                'mtime': stat.st_mtime,
+                'size': stat.st_size,
+                'sha1': file_hash(path),
+                'row': None
+            }
+            if enc is not None:
+                result[path] = np.asarray(enc, dtype=np.float32)
+
+        changed = bool(to_encode) or set(entries) != set(self.entries) or any(
+            entries[p]['mtime'] != self.entries[p]['mtime'] for p in entries if p in self.entries)
+        if changed:
+            matrix = np.zeros((len(result), self.dim), dtype=np.float32)
+            for row, (path, enc) in enumerate(result.items()):
+                matrix[row] = enc
+                entries[path] = dict(entries[path], row=row)
+            for path in entries:
+                if path not in result:
+                    entries[path] = dict(entries[path], row=None)
+            self.save(entries, matrix)
+
+        return result
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'cached': len(self.entries)}
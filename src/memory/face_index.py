@@ -0,0 +1,102 @@
+"""
+PRAGYAN-NETRA - Face Index Module
+Vectorized nearest-neighbour matching of 128-D face embeddings
+"""
+
+import numpy as np
+
+
+class FaceIndex:
+    """
+    Keeps every known embedding in one contiguous float32 matrix.
+
+    All faces of a frame are matched in a single matrix product, and the
+    closest identity under the tolerance wins (not the first one that happens
+    to be under it, as with face_recognition.compare_faces + index(True)).
+    """
+
+    def __init__(self, dim=128, tolerance=0.6, capacity=64):
+        self.dim = dim
+        self.tolerance = tolerance
+        self._matrix = np.zeros((capacity, dim), dtype=np.float32)
+        self._sq_norms = np.zeros(capacity, dtype=np.float32)
+        self.names = []
+
+    def __len__(self):
+        return len(self.names)
+
+    @property
+    def encodings(self):
+        """View of the active rows"""
+        return self._matrix[:len(self.names)]
+
+    def _reserve(self, extra):
+        needed = len(self.names) + extra
+        if needed <= len(self._matrix):
+            return
+        capacity = max(needed, 2 * len(self._matrix))
+        matrix = np.zeros((capacity, self.dim), dtype=np.float32)
+        sq_norms = np.zeros(capacity, dtype=np.float32)
+        matrix[:len(self.names)] = self.encodings
+        sq_norms[:len(self.names)] = self._sq_norms[:len(self.names)]
+        self._matrix, self._sq_norms = matrix, sq_norms
+
+    def add(self, name, encoding):
+        """Add one embedding, return its row"""
+        return self.add_many([name], [encoding])[0]
+
+    def add_many(self, names, encodings):
+        """Add several embeddings at once, return their rows"""
+        encodings = np.asarray(encodings, dtype=np.float32).reshape(-1, self.dim)
+        if len(names) != len(encodings):
+            raise ValueError("names and encodings must have the same length")
+        start = len(self.names)
+        self._reserve(len(names))
+        end = start + len(names)
+        self._matrix[start:end] = encodings
+        self._sq_norms[start:end] = np.einsum('ij,ij->i', encodings, encodings)
+        self.names.extend(names)
+        return list(range(start, end))
+
+    def remove(self, name):
+        """Remove every embedding stored under name, return how many were removed"""
+        rows = [i for i, n in enumerate(self.names) if n == name]
+        for row in reversed(rows):
+            last = len(self.names) - 1
+            # Move the last row into the hole to keep the matrix contiguous
+            self._matrix[row] = self._matrix[last]
+            self._sq_norms[row] = self._sq_norms[last]
+            self.names[row] = self.names[last]
+            self.names.pop()
+        return len(rows)
+
+    def distances(self, encodings):
+        """Euclidean distance matrix of shape (n_queries, n_known)"""
+        queries = np.asarray(encodings, dtype=np.float32).reshape(-1, self.dim)
+        n = len(self.names)
+        if n == 0 or len(queries) == 0:
+            return np.zeros((len(queries), n), dtype=np.float32)
+        sq = (np.einsum('ij,ij->i', queries, queries)[:, None]
+              + self._sq_norms[:n][None, :]
+              - 2.0 * queries @ self._matrix[:n].T)
+        return np.sqrt(np.maximum(sq, 0.0))
+
+    def match(self, encodings, tolerance=None):
+        """
+        Match all faces of a frame at once.
+
+        Returns:
+            list of (name, distance); name is None when no known face is
+            within the tolerance
+        """
+        tolerance = self.tolerance if tolerance is None else tolerance
+        dists = self.distances(encodings)
+        if dists.shape[1] == 0:
+            return [(None, float('inf'))] * len(dists)
+
+        best = np.argmin(dists, axis=1)
+        best_dist = dists[np.arange(len(dists)), best]
+        return [
+            (self.names[i] if d <= tolerance else None, float(d))
+            for i, d in zip(best, best_dist)
+        ]
@@ -4,48 +4,37 @@ Cognitive memory for familiar faces
 """
 
 import os
-import json
 import cv2
 import numpy as np
 
+from memory.memory_store import open_store
+
 class FaceMemory:
-    def __init__(self, data_dir='../../data'):
+    def __init__(self, data_dir='../../data', store=None):
         self.data_dir = data_dir
         self.faces_dir = os.path.join(data_dir, 'faces')
-        self.memory_file = os.path.join(data_dir, 'face_memory.json')
+        # Shared SQLite store; face_memory.json is migrated on first open
+        self.store = store if store is not None else open_store(data_dir)
         
         os.makedirs(self.faces_dir, exist_ok=True)
-        self.load_memory()
     
     def load_memory(self):
-        """Load face memory from file"""
-        if os.path.exists(self.memory_file):
-            with open(self.memory_file, 'r') as f:
-                self.memory = json.load(f)
-        else:
-            self.memory = {"known_faces": {}}
+        """Face memory lives in the store; kept for compatibility"""
+        return self.get_all_faces()
     
     def save_memory(self):
-        """Save face memory to file"""
-        with open(self.memory_file, 'w') as f:
-            json.dump(self.memory, f, indent=2)
+        """Faces are written immediately; kept for compatibility"""
+        self.store.flush()
     
     def add_face(self, name, image=None, features=None):
         """Add a new face to memory"""
-        face_id = len(self.memory['known_faces']) + 1
-        
-        self.memory['known_faces'][name] = {
-            'id': face_id,
-            'added': '2026-02-08',  # In real app, use datetime
-            'samples': 1
-        }
+        face_id = self.store.add_face(name)
         
         # Save face image if provided
         if image is not None:
             face_path = os.path.join(self.faces_dir, f"{name}_{face_id}.jpg")
             cv2.imwrite(face_path, image)
         
-        self.save_memory()
         return face_id
     
     def recognize_face(self, image):
@@ -54,12 +43,13 @@ class FaceMemory:
         # For simulation, return a random known face
         import random
         
-        if self.memory['known_faces']:
-            names = list(self.memory['known_faces'].keys())
+        faces = self.get_all_faces()
+        if faces:
+            names = list(faces.keys())
             return random.choice(names), 0.75
         else:
             return "UNKNOWN", 0.0
     
     def get_all_faces(self):
         """Get all known faces"""
-        return self.memory['known_faces']
\ No newline at end of file
+        return self.store.all_faces()
\ No newline at end of file
@@ -0,0 +1,375 @@
+"""
+PRAGYAN-NETRA - Memory Store Module
+Embedded SQLite store for faces, objects, obstacle events and emergencies
+"""
+
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+DB_NAME = "pragyan_memory.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS faces (
+    name TEXT PRIMARY KEY,
+    face_id INTEGER,
+    relation TEXT,
+    samples INTEGER DEFAULT 1,
+    added TEXT
+);
+CREATE TABLE IF NOT EXISTS objects (
+    name TEXT PRIMARY KEY,
+    location TEXT,
+    description TEXT DEFAULT '',
+    added TEXT,
+    last_seen TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_objects_location ON objects(location);
+CREATE TABLE IF NOT EXISTS obstacle_events (
+    id INTEGER PRIMARY KEY,
+    type TEXT NOT NULL,
+    position TEXT NOT NULL,
+    time_of_day TEXT,
+    timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_obstacle_events_timestamp ON obstacle_events(timestamp);
+CREATE INDEX IF NOT EXISTS idx_obstacle_events_type_position ON obstacle_events(type, position);
+CREATE TABLE IF NOT EXISTS obstacle_counts (
+    type TEXT NOT NULL,
+    position TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (type, position)
+);
+CREATE TABLE IF NOT EXISTS emergencies (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    type TEXT,
+    location TEXT,
+    details TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_emergencies_timestamp ON emergencies(timestamp);
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Fixed statement texts: sqlite3 keeps them prepared in its statement cache
+UPSERT_FACE = """
+INSERT INTO faces (name, face_id, relation, samples, added) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT(name) DO UPDATE SET relation = COALESCE(excluded.relation, relation),
+                                samples = samples + excluded.samples
+"""
+UPSERT_OBJECT = """
+INSERT INTO objects (name, location, description, added, last_seen) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT(name) DO UPDATE SET location = excluded.location, description = excluded.description,
+                                last_seen = excluded.last_seen
+"""
+UPDATE_OBJECT_LOCATION = "UPDATE objects SET location = ?, last_seen = ? WHERE name = ?"
+INSERT_OBSTACLE = "INSERT INTO obstacle_events (type, position, time_of_day, timestamp) VALUES (?, ?, ?, ?)"
+COUNT_OBSTACLE = """
+INSERT INTO obstacle_counts (type, position, count) VALUES (?, ?, ?)
+ON CONFLICT(type, position) DO UPDATE SET count = count + excluded.count
+"""
+INSERT_EMERGENCY = "INSERT INTO emergencies (timestamp, type, location, details) VALUES (?, ?, ?, ?)"
+SET_VALUE = "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)"
+
+
+class MemoryStore:
+    """
+    One SQLite database (WAL mode) shared by every memory module and thread.
+
+    Faces, objects and settings are written immediately. Obstacle events,
+    which can arrive every frame, are buffered and inserted with one
+    executemany per batch by a background flusher (batch_size events or
+    flush_interval seconds, whichever comes first) and on close/exit.
+    Reads of obstacle data flush the buffer first, so they are consistent.
+    """
+
+    def __init__(self, path, batch_size=256, flush_interval=1.0):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, cached_statements=64)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._events = []
+        self._wake = threading.Event()
+        self.batches = 0
+        self.events_written = 0
+        self.batch_times = deque(maxlen=1000)
+
+        self.running = True
+        self._thread = threading.Thread(target=self._flush_loop, name="memory-db", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # ---- faces ----------------------------------------------------------
+
+    def add_face(self, name, relation=None, samples=1, added=None):
+        """Insert a face (or add samples to an existing one); returns its id"""
+        with self._lock, self._conn:
+            face_id = self._conn.execute("SELECT COALESCE(MAX(face_id), 0) + 1 FROM faces").fetchone()[0]
+            self._conn.execute(UPSERT_FACE, (name, face_id, relation, samples,
+                                             added or datetime.now().isoformat()))
+            return self._conn.execute("SELECT face_id FROM faces WHERE name = ?", (name,)).fetchone()[0]
+
+    def get_face(self, name):
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM faces WHERE name = ?", (name,)).fetchone()
+        return _row_dict(row)
+
+    def all_faces(self):
+        """{name: {id, relation, samples, added}}"""
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM faces ORDER BY face_id").fetchall()
+        return {r['name']: {'id': r['face_id'], 'relation': r['relation'],
+                            'samples': r['samples'], 'added': r['added']} for r in rows}
+
+    # ---- objects --------------------------------------------------------
+
+    def put_object(self, name, location, description="", added=None):
+        now = datetime.now().isoformat()
+        with self._lock, self._conn:
+            self._conn.execute(UPSERT_OBJECT, (name, location, description, added or now, now))
+
+    def find_object(self, name):
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM objects WHERE name = ?", (name,)).fetchone()
+        return _row_dict(row)
+
+    def objects_at(self, location):
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM objects WHERE location = ?", (location,)).fetchall()
+        return [_row_dict(r) for r in rows]
+
+    def update_object_location(self, name, location):
+        with self._lock, self._conn:
+            cursor = self._conn.execute(UPDATE_OBJECT_LOCATION, (location, datetime.now().isoformat(), name))
+        return cursor.rowcount > 0
+
+    def all_objects(self):
+        """{name: {location, description, added, last_seen}}"""
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM objects ORDER BY name").fetchall()
+        return {r['name']: {k: r[k] for k in ('location', 'description', 'added', 'last_seen')}
+                for r in rows}
+
+    # ---- obstacle events --------------------------------------------------
+
+    def log_obstacle(self, obstacle_type, position, time_of_day=None, timestamp=None):
+        """Buffer one obstacle event; written in the next batch"""
+        now = datetime.now()
+        event = (obstacle_type, position, time_of_day or now.strftime("%H:%M"),
+                 timestamp or now.isoformat())
+        with self._lock:
+            self._events.append(event)
+            full = len(self._events) >= self.batch_size
+        if full:
+            self._wake.set()
+
+    def recent_obstacles(self, limit=50):
+        """Most recent events, oldest first"""
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT type, position, time_of_day, timestamp FROM obstacle_events "
+                "ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+        return [{'type': r['type'], 'position': r['position'], 'time': r['time_of_day'],
+                 'timestamp': r['timestamp']} for r in reversed(rows)]
+
+    def obstacle_counts(self):
+        """{(type, position): count} over all time"""
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute("SELECT type, position, count FROM obstacle_counts").fetchall()
+        return {(r['type'], r['position']): r['count'] for r in rows}
+
+    def obstacle_events_after(self, event_id=0):
+        """(id, type, position, timestamp) of events newer than event_id, in order"""
+        self.flush()
+        with self._lock:
+            return self._conn.execute(
+                "SELECT id, type, position, timestamp FROM obstacle_events WHERE id > ? ORDER BY id",
+                (event_id,)).fetchall()
+
+    def last_obstacle_id(self):
+        """Id of the newest event, after writing the pending ones"""
+        self.flush()
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(MAX(id), 0) FROM obstacle_events").fetchone()[0]
+
+    def obstacle_event_count(self):
+        self.flush()
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM obstacle_events").fetchone()[0]
+
+    # ---- emergencies ------------------------------------------------------
+
+    def log_emergency(self, event_type, location="unknown", timestamp=None, **details):
+        with self._lock, self._conn:
+            self._conn.execute(INSERT_EMERGENCY, (timestamp or datetime.now().isoformat(), event_type,
+                                                  location, json.dumps(details)))
+
+    def emergencies(self, limit=None):
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM emergencies ORDER BY id LIMIT ?",
+                                      (-1 if limit is None else limit,)).fetchall()
+        return [dict(_row_dict(r), details=json.loads(r['details'] or '{}')) for r in rows]
+
+    # ---- settings ---------------------------------------------------------
+
+    def set_value(self, key, value):
+        """Store a JSON-serializable setting (location, safe paths, contacts)"""
+        with self._lock, self._conn:
+            self._conn.execute(SET_VALUE, (key, json.dumps(value)))
+
+    def get_value(self, key, default=None):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM settings WHERE key = ?", (key,)).fetchone()
+        return default if row is None else json.loads(row['value'])
+
+    # ---- batching ---------------------------------------------------------
+
+    def flush(self):
+        """Insert buffered obstacle events in one transaction"""
+        with self._lock:
+            if not self._events:
+                return 0
+            events, self._events = self._events, []
+            start = time.perf_counter()
+            counts = {}
+            for obstacle_type, position, _, _ in events:
+                counts[(obstacle_type, position)] = counts.get((obstacle_type, position), 0) + 1
+            with self._conn:
+                self._conn.executemany(INSERT_OBSTACLE, events)
+                self._conn.executemany(COUNT_OBSTACLE, [(t, p, c) for (t, p), c in counts.items()])
+            self.batches += 1
+            self.events_written += len(events)
+            self.batch_times.append(time.perf_counter() - start)
+            return len(events)
+
+    def _flush_loop(self):
+        while self.running:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            if self.running:
+                self.flush()
+
+    def close(self):
+        if not self.running:
+            return
+        self.running = False
+        self._wake.set()
+        self._thread.join(timeout=2)
+        self.flush()
+        with self._lock:
+            self._conn.close()
+        atexit.unregister(self.close)
+        _STORES.pop(os.path.abspath(self.path), None)
+
+    def stats(self):
+        times = sorted(self.batch_times)
+        return {
+            'events': self.events_written,
+            'batches': self.batches,
+            'pending': len(self._events),
+            'batch_mean_ms': 1000 * sum(times) / len(times) if times else 0.0,
+            'batch_max_ms': 1000 * times[-1] if times else 0.0
+        }
+
+    # ---- migration --------------------------------------------------------
+
+    def migrate_json(self, data_dir):
+        """
+        One-time import of the legacy JSON memories in data_dir
+        (face_memory.json, object_memory.json, context_memory.json,
+        memory.json). Each file is imported once and recorded in settings.
+
+        Returns:
+            list of imported file names
+        """
+        imported = []
+        for name, importer in (("face_memory.json", self._import_faces),
+                               ("object_memory.json", self._import_objects),
+                               ("context_memory.json", self._import_context),
+                               ("memory.json", self._import_system)):
+            path = os.path.join(data_dir, name)
+            if not os.path.exists(path) or self.get_value(f"migrated:{name}"):
+                continue
+            try:
+                with open(path, 'r') as f:
+                    document = json.load(f)
+            except ValueError:
+                continue
+            importer(document)
+            self.set_value(f"migrated:{name}", datetime.now().isoformat())
+            imported.append(name)
+        return imported
+
+    def _import_faces(self, document):
+        for name, face in document.get('known_faces', {}).items():
+            self.add_face(name, samples=face.get('samples', 1), added=face.get('added'))
+
+    def _import_objects(self, document):
+        for name, obj in document.get('personal_objects', {}).items():
+            self.put_object(name, obj.get('location'), obj.get('description', ''), obj.get('added'))
+
+    def _import_context(self, document):
+        if 'current_location' in document:
+            self.set_value('current_location', document['current_location'])
+        with self._lock:
+            for obstacle in document.get('last_obstacles', []):
+                self._events.append((obstacle['type'], obstacle['position'], obstacle.get('time'),
+                                     obstacle.get('timestamp', datetime.now().isoformat())))
+        self.flush()
+        # Replace the counts derived from the imported window with the full history
+        with self._lock, self._conn:
+            for key, count in document.get('frequent_paths', {}).items():
+                obstacle_type, position = key.rsplit('_', 1)
+                self._conn.execute("INSERT OR REPLACE INTO obstacle_counts (type, position, count) "
+                                   "VALUES (?, ?, ?)", (obstacle_type, position, count))
+
+    def _import_system(self, document):
+        for name, face in document.get('familiar_faces', {}).items():
+            self.add_face(name, relation=face.get('relation'), added=face.get('added'))
+        for name, obj in document.get('personal_objects', {}).items():
+            self.put_object(name, obj.get('location'), obj.get('description', ''), obj.get('added'))
+        for key in ('safe_paths', 'emergency_contacts'):
+            if key in document:
+                self.set_value(key, document[key])
+        for event in document.get('emergencies', []):
+            event = dict(event)
+            self.log_emergency(event.pop('type', 'unknown'), event.pop('location', 'unknown'),
+                               event.pop('timestamp', None), **event)
+
+
+def _row_dict(row):
+    return None if row is None else {k: row[k] for k in row.keys()}
+
+
+_STORES = {}
+_STORES_LOCK = threading.Lock()
+
+
+def open_store(data_dir, **kwargs):
+    """
+    The process-wide MemoryStore for data_dir, created (and legacy JSON
+    migrated) on first use, so all memory modules and threads share it.
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    path = os.path.abspath(os.path.join(data_dir, DB_NAME))
+    with _STORES_LOCK:
+        store = _STORES.get(path)
+        if store is None:
+            store = _STORES[path] = MemoryStore(path, **kwargs)
+            store.migrate_json(data_dir)
+        return store
@@ -4,53 +4,40 @@ Remember personal objects and locations
 """
 
 import os
-import json
-from datetime import datetime
+
+from memory.memory_store import open_store
 
 class ObjectMemory:
-    def __init__(self, data_dir='../../data'):
+    def __init__(self, data_dir='../../data', store=None):
         self.data_dir = data_dir
-        self.memory_file = os.path.join(data_dir, 'object_memory.json')
+        # Shared SQLite store; object_memory.json is migrated on first open
+        self.store = store if store is not None else open_store(data_dir)
         
         os.makedirs(os.path.join(data_dir, 'objects'), exist_ok=True)
-        self.load_memory()
     
     def load_memory(self):
-        """Load object memory"""
-        if os.path.exists(self.memory_file):
-            with open(self.memory_file, 'r') as f:
-                self.memory = json.load(f)
-        else:
-            self.memory = {"personal_objects": {}}
+        """Object memory lives in the store; kept for compatibility"""
+        return self.get_all_objects()
     
     def save_memory(self):
-        """Save object memory"""
-        with open(self.memory_file, 'w') as f:
-            json.dump(self.memory, f, indent=2)
+        """Objects are written immediately; kept for compatibility"""
+        self.store.flush()
     
     def add_object(self, obj_name, location, description=""):
         """Add a personal object to memory"""
-        self.memory['personal_objects'][obj_name] = {
-            'location': location,
-            'description': description,
-            'added': datetime.now().isoformat(),
-            'last_seen': datetime.now().isoformat()
-        }
-        self.save_memory()
+        self.store.put_object(obj_name, location, description)
     
     def find_object(self, obj_name):
         """Find a remembered object"""
-        return self.memory['personal_objects'].get(obj_name)
+        found = self.store.find_object(obj_name)
+        if found is not None:
+            del found['name']
+        return found
     
     def get_all_objects(self):
         """Get all remembered objects"""
-        return self.memory['personal_objects']
+        return self.store.all_objects()
     
     def update_location(self, obj_name, new_location):
         """Update object location"""
-        if obj_name in self.memory['personal_objects']:
-            self.memory['personal_objects'][obj_name]['location'] = new_location
-            self.memory['personal_objects'][obj_name]['last_seen'] = datetime.now().isoformat()
-            self.save_memory()
-            return True
-        return False
\ No newline at end of file
+        return self.store.update_object_location(obj_name, new_location)
\ No newline at end of file
@@ -0,0 +1,133 @@
+"""
+PRAGYAN-NETRA - Obstacle Statistics Module
+Decayed obstacle counts per (type, position, hour-of-week) for prediction
+"""
+
+import heapq
+import math
+from datetime import datetime
+
+HOURS_PER_WEEK = 7 * 24
+
+
+def hour_of_week(when):
+    """0 = Monday 00:00-00:59 ... 167 = Sunday 23:00-23:59"""
+    return when.weekday() * 24 + when.hour
+
+
+class ObstacleStats:
+    """
+    Incremental obstacle index over the full history.
+
+    Every event adds 1 to the weight of its (type, position) in its
+    hour-of-week bucket and in a global table; weights decay exponentially
+    with half_life_days, lazily, so an update is O(1). Each table keeps at
+    most max_keys entries (the lightest is evicted), so memory is bounded
+    by 169 * max_keys however long the history grows.
+
+    predict() returns the posterior mean probability that an obstacle seen
+    in the bucket is a given (type, position), with the global distribution
+    as a Dirichlet prior of prior_weight pseudo-events. Buckets without
+    history therefore fall back to the global distribution.
+    """
+
+    def __init__(self, half_life_days=14.0, prior_weight=2.0, max_keys=64):
+        self.half_life_days = half_life_days
+        self.prior_weight = prior_weight
+        self.max_keys = max_keys
+        self._rate = math.log(2) / (half_life_days * 86400.0)
+        # {(type, position): [weight, as-of epoch seconds]} per bucket, plus totals
+        self._buckets = [{} for _ in range(HOURS_PER_WEEK)]
+        self._totals = [[0.0, 0.0] for _ in range(HOURS_PER_WEEK)]
+        self._global = {}
+        self._global_total = [0.0, 0.0]
+        self.events = 0
+
+    def __len__(self):
+        return len(self._global)
+
+    def _weight(self, entry, t):
+        return entry[0] * math.exp(-self._rate * (t - entry[1])) if t > entry[1] else entry[0]
+
+    def _add(self, entry, t):
+        if t >= entry[1]:
+            entry[0] = self._weight(entry, t) + 1.0
+            entry[1] = t
+        else:
+            # Out-of-order event: add it already decayed to the entry's time
+            entry[0] += math.exp(-self._rate * (entry[1] - t))
+
+    def _add_key(self, table, key, t):
+        entry = table.get(key)
+        if entry is None:
+            if len(table) >= self.max_keys:
+                lightest = min(table, key=lambda k: self._weight(table[k], t))
+                del table[lightest]
+            table[key] = entry = [0.0, t]
+        self._add(entry, t)
+
+    def update(self, obstacle_type, position, when=None):
+        """Count one obstacle seen at `when` (datetime, default now)"""
+        when = when or datetime.now()
+        t = when.timestamp()
+        bucket = hour_of_week(when)
+        key = (obstacle_type, position)
+        self._add_key(self._buckets[bucket], key, t)
+        self._add(self._totals[bucket], t)
+        self._add_key(self._global, key, t)
+        self._add(self._global_total, t)
+        self.events += 1
+
+    def predict(self, when=None, k=5, min_probability=0.0):
+        """
+        Most likely obstacles for the hour-of-week of `when`.
+
+        Returns:
+            up to k (type, position, probability), most likely first
+        """
+        when = when or datetime.now()
+        t = when.timestamp()
+        bucket = hour_of_week(when)
+        global_total = self._weight(self._global_total, t)
+        if global_total <= 0:
+            return []
+        table = self._buckets[bucket]
+        total = self._weight(self._totals[bucket], t) + self.prior_weight
+
+        def probability(key):
+            local = self._weight(table[key], t) if key in table else 0.0
+            prior = self._weight(self._global[key], t) / global_total if key in self._global else 0.0
+            return (local + self.prior_weight * prior) / total
+
+        candidates = set(table) | set(heapq.nlargest(k, self._global,
+                                                     key=lambda key: self._weight(self._global[key], t)))
+        best = heapq.nlargest(k, ((probability(key), key) for key in candidates))
+        return [(key[0], key[1], p) for p, key in best if p >= min_probability]
+
+    def bucket_weights(self, when=None):
+        """{hour_of_week: decayed event weight} of the buckets with history"""
+        t = (when or datetime.now()).timestamp()
+        return {b: self._weight(total, t) for b, total in enumerate(self._totals) if total[0] > 0}
+
+    def to_dict(self):
+        return {
+            'half_life_days': self.half_life_days,
+            'events': self.events,
+            'buckets': [[b, key[0], key[1], w, t] for b, table in enumerate(self._buckets)
+                        for key, (w, t) in table.items()],
+            'totals': self._totals,
+            'global': [[key[0], key[1], w, t] for key, (w, t) in self._global.items()],
+            'global_total': self._global_total
+        }
+
+    @classmethod
+    def from_dict(cls, data, **kwargs):
+        stats = cls(half_life_days=data.get('half_life_days', 14.0), **kwargs)
+        stats.events = data.get('events', 0)
+        for b, obstacle_type, position, w, t in data.get('buckets', []):
+            stats._buckets[b][(obstacle_type, position)] = [w, t]
+        stats._totals = [list(total) for total in data.get('totals', stats._totals)]
+        for obstacle_type, position, w, t in data.get('global', []):
+            stats._global[(obstacle_type, position)] = [w, t]
+        stats._global_total = list(data.get('global_total', stats._global_total))
+        return stats
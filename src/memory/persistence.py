@@ -0,0 +1,219 @@
+"""
+PRAGYAN-NETRA - Persistence Module
+Write-behind JSON documents with atomic snapshots and an optional journal
+"""
+
+import atexit
+import copy
+import json
+import os
+import threading
+import time
+from collections import deque
+
+
+def atomic_write_text(path, text):
+    """Write text to a temp file, fsync it and rename it over path"""
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def atomic_write_json(path, data, indent=None):
+    """Write JSON atomically, see atomic_write_text"""
+    atomic_write_text(path, json.dumps(data, indent=indent))
+
+
+class WriteBehindStore:
+    """
+    JSON document kept in memory and persisted by a background flusher.
+
+    Mutations (set/append/incr) only touch memory and count as pending; the
+    flusher writes an atomic snapshot once flush_interval seconds have
+    passed or max_pending mutations have accumulated, and again on close()
+    or interpreter exit. The document is serialized under the lock but
+    written and fsynced outside it, so mutators never wait for the disk.
+    With journal=True every mutation is also appended to '<path>.journal'
+    and replayed on load, so a crash between snapshots loses nothing.
+
+    Args:
+        path: JSON file
+        default: document used when the file does not exist
+        indent: JSON indent of snapshots (None = compact)
+    """
+
+    def __init__(self, path, default=None, flush_interval=2.0, max_pending=100, journal=False,
+                 indent=None):
+        self.path = path
+        self.default = default if default is not None else {}
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.indent = indent
+        self.journal_path = f"{path}.journal" if journal else None
+
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._journal = None
+        self.pending = 0
+        self.mutations = 0
+        self.flushes = 0
+        self.flush_times = deque(maxlen=1000)
+        self.data = None
+        self.load()
+
+        self.running = True
+        self._thread = threading.Thread(target=self._flush_loop, name="flusher", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def load(self):
+        """Read the snapshot, then replay any journaled mutations after it"""
+        with self._lock:
+            if os.path.exists(self.path):
+                with open(self.path, 'r') as f:
+                    self.data = json.load(f)
+            else:
+                self.data = copy.deepcopy(self.default)
+
+            if self.journal_path is None:
+                return self.data
+            replayed = 0
+            if os.path.exists(self.journal_path):
+                with open(self.journal_path, 'r') as f:
+                    for line in f:
+                        try:
+                            op = json.loads(line)
+                        except ValueError:
+                            break  # torn last line from a crash
+                        self._apply(*op)
+                        replayed += 1
+            self.pending = replayed
+            if self._journal is None:
+                self._journal = open(self.journal_path, 'a')
+            return self.data
+
+    # ---- mutations ----------------------------------------------------
+
+    def set(self, path, value):
+        """data[path[0]]...[path[-1]] = value"""
+        self._mutate("set", path, value)
+
+    def append(self, path, value, limit=None):
+        """Append to the list at path, keeping only the last `limit` items"""
+        self._mutate("append", path, value, limit)
+
+    def incr(self, path, amount=1):
+        """Add amount to the number at path (0 if missing)"""
+        self._mutate("incr", path, amount)
+
+    def _mutate(self, kind, path, value, limit=None):
+        op = [kind, list(path), value, limit]
+        with self._lock:
+            self._apply(*op)
+            if self._journal is not None:
+                self._journal.write(json.dumps(op) + "\n")
+                self._journal.flush()
+            self.pending += 1
+            self.mutations += 1
+            full = self.pending >= self.max_pending
+        if full:
+            self._wake.set()
+
+    def _apply(self, kind, path, value, limit=None):
+        node = self.data
+        for key in path[:-1]:
+            node = node.setdefault(key, {})
+        key = path[-1]
+        if kind == "set":
+            node[key] = value
+        elif kind == "append":
+            items = node.setdefault(key, [])
+            items.append(value)
+            if limit is not None and len(items) > limit:
+                del items[:len(items) - limit]
+        elif kind == "incr":
+            node[key] = node.get(key, 0) + value
+
+    # ---- flushing -----------------------------------------------------
+
+    def flush(self):
+        """Write a snapshot now if anything changed; returns True if written"""
+        with self._flush_lock:
+            with self._lock:
+                if not self.pending:
+                    return False
+                start = time.perf_counter()
+                text = json.dumps(self.data, indent=self.indent)
+                written = self.pending
+                journaled = self._journal.tell() if self._journal is not None else 0
+
+            atomic_write_text(self.path, text)
+
+            with self._lock:
+                if self._journal is not None:
+                    # The snapshot covers the journal up to `journaled`; keep the rest
+                    with open(self.journal_path, 'r') as f:
+                        f.seek(journaled)
+                        tail = f.read()
+                    self._journal.seek(0)
+                    self._journal.truncate(0)
+                    self._journal.write(tail)
+                    self._journal.flush()
+                self.pending -= written
+                self.flushes += 1
+                self.flush_times.append(time.perf_counter() - start)
+            return True
+
+    def _flush_loop(self):
+        while self.running:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            if self.running:
+                self.flush()
+
+    def close(self):
+        """Stop the flusher and write the final snapshot"""
+        if not self.running:
+            return
+        self.running = False
+        self._wake.set()
+        self._thread.join(timeout=2)
+        self.flush()
+        with self._lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+        atexit.unregister(self.close)
+        _DOCUMENTS.pop(os.path.abspath(self.path), None)
+
+    def stats(self):
+        times = sorted(self.flush_times)
+        return {
+            'mutations': self.mutations,
+            'flushes': self.flushes,
+            'pending': self.pending,
+            'flush_mean_ms': 1000 * sum(times) / len(times) if times else 0.0,
+            'flush_max_ms': 1000 * times[-1] if times else 0.0
+        }
+
+
+_DOCUMENTS = {}
+_DOCUMENTS_LOCK = threading.Lock()
+
+
+def open_document(path, **kwargs):
+    """
+    The process-wide WriteBehindStore for path, so two owners of the same
+    file never write (or journal) it independently.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    key = os.path.abspath(path)
+    with _DOCUMENTS_LOCK:
+        document = _DOCUMENTS.get(key)
+        if document is None:
+            document = _DOCUMENTS[key] = WriteBehindStore(path, **kwargs)
+        return document
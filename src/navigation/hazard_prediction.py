@@ -3,81 +3,277 @@ PRAGYAN-NETRA - Hazard Prediction Module
 Predicts potential hazards based on context
 """
 
+import time
+
 import numpy as np
 from datetime import datetime
 
+from navigation.collision_estimator import CollisionEstimator
+
+# Assumed time to impact at walking pace for obstacles without a measured TTC
+LABEL_TTC = {'VERY_CLOSE': 1.0, 'CLOSE': 2.5}
+HAZARD_TYPES = ['IMMEDIATE_COLLISION', 'PREDICTED_OBSTACLE', 'LOW_LIGHT']
+IMMEDIATE, PREDICTED, LOW_LIGHT = range(len(HAZARD_TYPES))
+SEVERITIES = ['LOW', 'MEDIUM', 'HIGH']
+SEVERITY_WEIGHTS = np.array([2.0, 5.0, 10.0])
+# Sort position of predicted obstacles, whose time to impact is 'SOON'
+SOON_SECONDS = 10.0
+# Largest imminence factor on a hazard's severity weight: one imminent HIGH
+# hazard scores 65, under the > 70 emergency threshold, as one HIGH hazard
+# (50) did before time to impact was weighed; two of them still exceed it
+MAX_IMMINENCE = 1.3
+
+
+class Codes:
+    """Stable integer codes for strings (object types, positions)"""
+
+    def __init__(self, names=()):
+        self.names = []
+        self.index = {}
+        for name in names:
+            self.code(name)
+
+    def code(self, name):
+        index = self.index.get(name)
+        if index is None:
+            index = self.index[name] = len(self.names)
+            self.names.append(name)
+        return index
+
+    def codes(self, names):
+        index = self.index
+        return np.array([index[name] if name in index else self.code(name) for name in names],
+                        dtype=np.int32)
+
+
+class HazardBatch:
+    """
+    Hazards as columns: one NumPy array per field, object type and position
+    as integer codes. Unknown times to impact are inf, 'SOON' is NaN;
+    missing velocities and confidences are NaN and missing track ids -1.
+
+    Iterating (or to_dicts()) gives the dicts predict_hazards returned
+    before, so callers written against those keep working.
+    """
+
+    COLUMNS = {'kind': np.int8, 'object': np.int32, 'position': np.int32, 'severity': np.int8,
+               'time_to_impact': np.float64, 'approach_velocity': np.float64,
+               'confidence': np.float64, 'track_id': np.int64}
+    DEFAULTS = {'time_to_impact': np.inf, 'approach_velocity': np.nan, 'confidence': np.nan, 'track_id': -1}
+
+    def __init__(self, objects, positions, size=0, **columns):
+        self.objects = objects
+        self.positions = positions
+        for name, dtype in self.COLUMNS.items():
+            value = columns.get(name, self.DEFAULTS.get(name, 0))
+            column = np.asarray(value, dtype=dtype)
+            setattr(self, name, np.full(size, column, dtype=dtype) if column.ndim == 0 else column)
+
+    def __len__(self):
+        return len(self.kind)
+
+    def take(self, index):
+        batch = HazardBatch.__new__(HazardBatch)
+        batch.objects, batch.positions = self.objects, self.positions
+        for name in self.COLUMNS:
+            setattr(batch, name, getattr(self, name)[index])
+        return batch
+
+    def urgency(self):
+        """Seconds to impact, SOON_SECONDS for 'SOON', inf when unknown"""
+        return np.where(np.isnan(self.time_to_impact), SOON_SECONDS, self.time_to_impact)
+
+    def deduplicate(self):
+        """Most imminent hazard per (kind, object, position), most imminent first"""
+        if len(self) < 2:
+            return self
+        key = ((self.kind.astype(np.int64) * len(self.objects.names) + self.object)
+               * len(self.positions.names) + self.position)
+        urgency = self.urgency()
+        order = np.lexsort((urgency, key))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = key[order[1:]] != key[order[:-1]]
+        keep = order[first]
+        # Ties keep their input order, as a stable sort of the dicts would
+        return self.take(keep[np.lexsort((keep, urgency[keep]))])
+
+    def risk(self, ttc_threshold=3.0):
+        """
+        0-100 risk: severity weights scaled by imminence, up to
+        MAX_IMMINENCE for hazards whose time to impact (measured, or assumed
+        from the distance label) is well under ttc_threshold.
+        """
+        if not len(self):
+            return 0
+        impact = self.urgency()
+        scale = np.clip(ttc_threshold / np.maximum(impact, 1e-3), 1.0, MAX_IMMINENCE)
+        return int(min(100, 5 * float(np.dot(SEVERITY_WEIGHTS[self.severity], scale))))
+
+    def to_dicts(self):
+        objects, positions = self.objects.names, self.positions.names
+        hazards = []
+        for kind, obj, position, severity, impact, velocity, confidence, track_id in zip(
+                self.kind.tolist(), self.object.tolist(), self.position.tolist(), self.severity.tolist(),
+                self.time_to_impact.tolist(), self.approach_velocity.tolist(),
+                self.confidence.tolist(), self.track_id.tolist()):
+            hazard = {'type': HAZARD_TYPES[kind], 'severity': SEVERITIES[severity]}
+            if kind == LOW_LIGHT:
+                hazard['recommendation'] = 'USE_ASSISTIVE_LIGHT'
+            elif kind == PREDICTED:
+                hazard.update(object=objects[obj], position=positions[position],
+                              time_to_impact='SOON', confidence=confidence)
+            else:
+                hazard.update(object=objects[obj], position=positions[position], time_to_impact=impact,
+                              approach_velocity=None if velocity != velocity else velocity,
+                              track_id=None if track_id < 0 else track_id)
+            hazards.append(hazard)
+        return hazards
+
+    def __iter__(self):
+        return iter(self.to_dicts())
+
+
+def is_low_light(hour):
+    """Evening or night"""
+    return hour >= 18 or hour <= 6
+
+
 class HazardPredictor:
-    def __init__(self):
+    """
+    Args:
+        estimator: CollisionEstimator fed with obstacles that carry a
+            'track_id' and 'bbox'
+        ttc_threshold: seconds under which an approaching obstacle is an
+            immediate collision whatever its distance label
+    """
+
+    def __init__(self, estimator=None, ttc_threshold=3.0):
         self.hazard_history = []
-        
-    def predict_hazards(self, current_obstacles, context=None):
-        """Predict potential hazards"""
-        hazards = []
-        
-        # Immediate hazards from current obstacles
-        for obs in current_obstacles:
-            if obs.get('distance') in ['VERY_CLOSE', 'CLOSE']:
-                hazards.append({
-                    'type': 'IMMEDIATE_COLLISION',
-                    'object': obs.get('type', 'UNKNOWN'),
-                    'position': obs.get('position', 'UNKNOWN'),
-                    'severity': 'HIGH',
-                    'time_to_impact': 'IMMEDIATE'
-                })
-        
-        # Context-based predictions
-        if context and 'predictions' in context:
-            for pred in context['predictions']:
-                if pred['confidence'] > 0.7:
-                    hazards.append({
-                        'type': 'PREDICTED_OBSTACLE',
-                        'object': pred['type'],
-                        'position': pred['position'],
-                        'severity': 'MEDIUM',
-                        'time_to_impact': 'SOON',
-                        'confidence': pred['confidence']
-                    })
-        
-        # Environmental hazards (simulated)
-        current_hour = datetime.now().hour
-        if 18 <= current_hour <= 6:  # Evening/Night
-            hazards.append({
-                'type': 'LOW_LIGHT',
-                'severity': 'MEDIUM',
-                'recommendation': 'USE_ASSISTIVE_LIGHT'
-            })
-        
-        # Remove duplicates
-        unique_hazards = []
-        seen = set()
-        for hazard in hazards:
-            key = (hazard['type'], hazard.get('object', ''), hazard.get('position', ''))
-            if key not in seen:
-                seen.add(key)
-                unique_hazards.append(hazard)
-        
-        return unique_hazards
-    
-    def calculate_risk_score(self, hazards):
-        """Calculate overall risk score (0-100)"""
-        if not hazards:
-            return 0
-        
-        severity_weights = {
-            'HIGH': 10,
-            'MEDIUM': 5,
-            'LOW': 2
+        self.estimator = estimator if estimator is not None else CollisionEstimator()
+        self.ttc_threshold = ttc_threshold
+        self.objects = Codes([''])
+        self.positions = Codes(['', 'LEFT', 'CENTER', 'RIGHT'])
+        self._labels = {}
+
+    def measure(self, obstacles, timestamp=None, image_width=None):
+        """Add 'ttc' and 'approach_velocity' to tracked obstacles"""
+        timestamp = time.time() if timestamp is None else timestamp
+        tracked = [o for o in obstacles if o.get('track_id') is not None and o.get('bbox') is not None]
+        self.estimator.observe([o['track_id'] for o in tracked], [o['bbox'] for o in tracked],
+                               timestamp, [o.get('type') for o in tracked])
+        estimates = self.estimator.estimate(timestamp, image_width)
+        for obs in tracked:
+            estimate = estimates.get(obs['track_id'])
+            if estimate is not None:
+                obs['ttc'] = estimate['ttc']
+                obs['approach_velocity'] = estimate['approach_velocity']
+        return obstacles
+
+    def _batch(self, size=0, **columns):
+        return HazardBatch(self.objects, self.positions, size, **columns)
+
+    def _label_ttc(self, label):
+        """LABEL_TTC of a raw distance label ('VERY CLOSE', 'close', ...), memoized"""
+        ttc = self._labels.get(label)
+        if ttc is None:
+            ttc = self._labels[label] = LABEL_TTC.get(str(label).upper().replace(' ', '_'), np.inf)
+        return ttc
+
+    def _immediate_columns(self, obstacles):
+        """IMMEDIATE_COLLISION columns for obstacles close by label or by time to collision"""
+        labels = self._labels
+        label_ttc = np.array([labels[d] if d in labels else self._label_ttc(d)
+                              for d in [o.get('distance', '') for o in obstacles]], dtype=np.float64)
+        ttc = np.array([o.get('ttc', np.inf) for o in obstacles], dtype=np.float64)
+        hit = np.flatnonzero((label_ttc < np.inf) | (ttc < self.ttc_threshold))
+        hits = [obstacles[i] for i in hit.tolist()]
+        velocity = [o.get('approach_velocity') for o in hits]
+        track_id = [o.get('track_id') for o in hits]
+        return {
+            'kind': [IMMEDIATE] * len(hits),
+            'object': [o.get('type', 'UNKNOWN') for o in hits],
+            'position': [o.get('position', o.get('region', 'UNKNOWN')) for o in hits],
+            'severity': [SEVERITIES.index('HIGH')] * len(hits),
+            'time_to_impact': np.minimum(ttc[hit], label_ttc[hit]).tolist(),
+            'approach_velocity': [np.nan if v is None else v for v in velocity],
+            'confidence': [np.nan] * len(hits),
+            'track_id': [-1 if t is None else t for t in track_id]
         }
-        
-        total_score = 0
-        for hazard in hazards:
-            severity = hazard.get('severity', 'LOW')
-            total_score += severity_weights.get(severity, 1)
-        
-        # Normalize to 0-100 scale
-        risk_score = min(100, total_score * 5)
-        return risk_score
-    
+
+    @staticmethod
+    def _predicted_columns(context):
+        """PREDICTED_OBSTACLE columns for confident context predictions"""
+        predictions = [p for p in (context or {}).get('predictions', []) if p['confidence'] > 0.7]
+        return {
+            'kind': [PREDICTED] * len(predictions),
+            'object': [p['type'] for p in predictions],
+            'position': [p['position'] for p in predictions],
+            'severity': [SEVERITIES.index('MEDIUM')] * len(predictions),
+            'time_to_impact': [np.nan] * len(predictions),
+            'approach_velocity': [np.nan] * len(predictions),
+            'confidence': [p['confidence'] for p in predictions],
+            'track_id': [-1] * len(predictions)
+        }
+
+    def predict_batch(self, current_obstacles, context=None, timestamp=None, image_width=None, hour=None):
+        """predict_hazards as a HazardBatch, deduplicated and most imminent first"""
+        self.measure(current_obstacles, timestamp, image_width)
+        parts = [self._immediate_columns(current_obstacles), self._predicted_columns(context)]
+        hour = datetime.now().hour if hour is None else hour
+        if is_low_light(hour):
+            parts.append({'kind': [LOW_LIGHT], 'object': [''], 'position': [''],
+                          'severity': [SEVERITIES.index('MEDIUM')], 'time_to_impact': [np.inf],
+                          'approach_velocity': [np.nan], 'confidence': [np.nan], 'track_id': [-1]})
+        columns = {name: [value for part in parts for value in part[name]] for name in HazardBatch.COLUMNS}
+        columns['object'] = self.objects.codes(columns['object'])
+        columns['position'] = self.positions.codes(columns['position'])
+        return self._batch(**columns).deduplicate()
+
+    def predict_hazards(self, current_obstacles, context=None, timestamp=None, image_width=None, hour=None):
+        """
+        Predict potential hazards, most imminent first.
+
+        Obstacles with a 'track_id' and 'bbox' get a measured time to
+        impact in seconds; the rest fall back to their distance label.
+        """
+        return self.predict_batch(current_obstacles, context, timestamp, image_width, hour).to_dicts()
+
+    @staticmethod
+    def urgency(hazard):
+        """Sort key: seconds to impact, 'SOON' after measured ones, the rest last"""
+        impact = hazard.get('time_to_impact')
+        if isinstance(impact, (int, float)):
+            return impact
+        return SOON_SECONDS if impact == 'SOON' else np.inf
+
+    def hazard_batch(self, hazards):
+        """HazardBatch of hazard dicts (the inverse of HazardBatch.to_dicts)"""
+        def impact(hazard):
+            value = hazard.get('time_to_impact')
+            if value == 'SOON':
+                return np.nan
+            return value if isinstance(value, (int, float)) else np.inf
+        velocity = [h.get('approach_velocity') for h in hazards]
+        confidence = [h.get('confidence') for h in hazards]
+        track_id = [h.get('track_id') for h in hazards]
+        return self._batch(
+            kind=[HAZARD_TYPES.index(h['type']) if h.get('type') in HAZARD_TYPES else IMMEDIATE
+                  for h in hazards],
+            object=self.objects.codes([h.get('object', '') for h in hazards]),
+            position=self.positions.codes([h.get('position', '') for h in hazards]),
+            severity=[SEVERITIES.index(h['severity']) if h.get('severity') in SEVERITIES else 0
+                      for h in hazards],
+            time_to_impact=[impact(h) for h in hazards],
+            approach_velocity=[np.nan if v is None else v for v in velocity],
+            confidence=[np.nan if c is None else c for c in confidence],
+            track_id=[-1 if t is None else t for t in track_id])
+
+    def calculate_risk_score(self, hazards):
+        """Calculate overall risk score (0-100) of a HazardBatch or list of hazard dicts"""
+        if not isinstance(hazards, HazardBatch):
+            hazards = self.hazard_batch(hazards)
+        return hazards.risk(self.ttc_threshold)
+
     def get_safety_recommendations(self, hazards, risk_score):
         """Get safety recommendations based on hazards"""
         recommendations = []
@@ -0,0 +1,141 @@
+"""
+PRAGYAN-NETRA - Occupancy Grid Module
+Rolling egocentric log-odds map built from detections and the wall/stair detectors
+"""
+
+import numpy as np
+from scipy.ndimage import binary_dilation
+
+# Assumed range in metres for each distance label when no metric distance is known
+LABEL_RANGES = {'VERY_CLOSE': 0.75, 'CLOSE': 1.5, 'MODERATE': 3.0, 'FAR': 5.0}
+# Bearing of each image third as a fraction of the field of view
+REGION_BEARINGS = {'LEFT': -1 / 3, 'CENTER': 0.0, 'RIGHT': 1 / 3}
+
+
+class OccupancyGrid:
+    """
+    Log-odds occupancy around the user, who stands at the bottom centre
+    cell facing up (row 0 is farthest ahead, column index grows to the
+    right).
+
+    Each observation adds l_occ to the cells an obstacle covers and l_free
+    to the visible cells in front of it; without new evidence every cell
+    decays back towards unknown (0) with the given half-life. A cell is
+    blocked while its log-odds exceed occ_threshold, grown by the user's
+    clearance radius.
+
+    Args:
+        width_m, depth_m: lateral and forward extent
+        resolution: cell size in metres
+        hfov: camera horizontal field of view in degrees
+        free_range: visible cells closer than this are observed free
+    """
+
+    def __init__(self, width_m=6.0, depth_m=8.0, resolution=0.2, hfov=60.0, half_life=2.0,
+                 l_occ=0.85, l_free=-0.4, l_min=-2.0, l_max=3.5, occ_threshold=0.7,
+                 clearance=0.3, free_range=3.0, obstacle_depth=0.4):
+        self.resolution = resolution
+        self.hfov = hfov
+        self.half_life = half_life
+        self.l_occ, self.l_free = l_occ, l_free
+        self.l_min, self.l_max = l_min, l_max
+        self.occ_threshold = occ_threshold
+        self.free_range = free_range
+        self.obstacle_depth = obstacle_depth
+        self.rows = int(round(depth_m / resolution))
+        self.cols = int(round(width_m / resolution)) | 1   # odd, so the user has a centre column
+        self.origin = (self.rows - 1, self.cols // 2)
+        self.log_odds = np.zeros((self.rows, self.cols), dtype=np.float32)
+
+        radius = int(np.ceil(clearance / resolution))
+        yy, xx = np.mgrid[-radius:radius + 1, -radius:radius + 1]
+        self._disk = xx ** 2 + yy ** 2 <= radius ** 2
+
+        # Polar coordinates of every cell, computed once
+        forward, right = self.metres(*np.indices((self.rows, self.cols)))
+        self._range = np.hypot(forward, right)
+        self._bearing = np.degrees(np.arctan2(right, forward))
+        self._visible = (np.abs(self._bearing) <= hfov / 2) & (self._range > 0)
+
+    def cell(self, forward, right=0.0):
+        """(row, col) of a point `forward` metres ahead and `right` metres to the right"""
+        return (int(np.clip(self.origin[0] - round(forward / self.resolution), 0, self.rows - 1)),
+                int(np.clip(self.origin[1] + round(right / self.resolution), 0, self.cols - 1)))
+
+    def metres(self, row, col):
+        """(forward, right) in metres of cell centres"""
+        return ((self.origin[0] - row) * self.resolution, (col - self.origin[1]) * self.resolution)
+
+    def decay(self, dt):
+        """Fade all evidence towards unknown over dt seconds"""
+        self.log_odds *= np.float32(0.5 ** (dt / self.half_life))
+
+    def _bearing_span(self, det, image_width):
+        """(centre, half width) in degrees of a detection"""
+        if det.get('bbox') is not None and image_width:
+            x1, _, x2, _ = det['bbox']
+            degrees_per_px = self.hfov / image_width
+            return ((x1 + x2) / 2 - image_width / 2) * degrees_per_px, max((x2 - x1) / 2 * degrees_per_px, 2.0)
+        region = det.get('region', det.get('position', 'CENTER'))
+        return REGION_BEARINGS.get(region, 0.0) * self.hfov, self.hfov / 6
+
+    def _range_of(self, det):
+        if det.get('distance_m') is not None:
+            return float(det['distance_m'])
+        label = str(det.get('distance', 'MODERATE')).upper().replace(' ', '_')
+        return LABEL_RANGES.get(label, LABEL_RANGES['MODERATE'])
+
+    def observe(self, detections=(), image_width=None, hazards=()):
+        """
+        Add one frame of evidence.
+
+        Args:
+            detections: dicts with 'region' (or 'position') or a 'bbox',
+                and a 'distance' label or 'distance_m'
+            hazards: (range_m, bearing_deg, half_width_deg, weight) bands
+                from the structural detectors
+        """
+        occupied = np.zeros_like(self._visible)
+        shadow = np.zeros_like(self._visible)
+        weight = np.zeros(self.log_odds.shape, dtype=np.float32)
+        bands = [(self._range_of(d), *self._bearing_span(d, image_width), 1.0) for d in detections]
+        for distance, bearing, half_width, w in bands + list(hazards):
+            span = np.abs(self._bearing - bearing) <= half_width
+            band = span & (self._range >= distance) & (self._range <= distance + self.obstacle_depth)
+            occupied |= band
+            weight[band] = np.maximum(weight[band], w)
+            shadow |= span & (self._range >= distance)
+        free = self._visible & (self._range <= self.free_range) & ~shadow
+        self.log_odds[occupied] += self.l_occ * weight[occupied]
+        self.log_odds[free] += self.l_free
+        np.clip(self.log_odds, self.l_min, self.l_max, out=self.log_odds)
+
+    def wall_band(self, distance=1.2):
+        """Hazard band for PragyanNetraOS.wall_hazard_check: a barrier across the view"""
+        return (distance, 0.0, self.hfov / 2, 1.0)
+
+    def stairs_band(self, result, distance=2.0):
+        """Hazard band for a StairDetector result, or None"""
+        if not result or not result.get('detected'):
+            return None
+        return (distance, 0.0, self.hfov / 6, result.get('confidence', 1.0))
+
+    def shift(self, forward, right=0.0):
+        """Move the map for the user walking `forward`/`right` metres; cells entering view are unknown"""
+        dr, dc = int(round(forward / self.resolution)), -int(round(right / self.resolution))
+        shifted = np.zeros_like(self.log_odds)
+        src = self.log_odds[max(0, -dr):self.rows - max(0, dr), max(0, -dc):self.cols - max(0, dc)]
+        shifted[max(0, dr):max(0, dr) + src.shape[0], max(0, dc):max(0, dc) + src.shape[1]] = src
+        self.log_odds = shifted
+
+    def occupied(self):
+        return self.log_odds > self.occ_threshold
+
+    def blocked(self):
+        """Occupied cells grown by the clearance radius; the user's own cell is never blocked"""
+        blocked = binary_dilation(self.occupied(), structure=self._disk)
+        blocked[self.origin] = False
+        return blocked
+
+    def probability(self):
+        return 1.0 / (1.0 + np.exp(-self.log_odds))
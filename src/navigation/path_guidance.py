@@ -3,32 +3,84 @@ PRAGYAN-NETRA - Path Guidance Module
 Navigation and route planning
 """
 
+import numpy as np
+
+from navigation.occupancy_grid import OccupancyGrid
+from navigation.path_planner import GridPlanner, instructions, simplify
+
+
 class PathGuide:
-    def __init__(self):
+    """
+    Turn-by-turn guidance over a rolling occupancy grid.
+
+    The planner is kept between calls: when only some grid cells changed
+    it repairs the previous plan instead of searching from scratch, and
+    it is rebuilt when the goal changes or the user moves (move()).
+    """
+
+    def __init__(self, grid=None):
         self.current_path = []
         self.obstacles = []
+        self.grid = grid if grid is not None else OccupancyGrid()
+        self.planner = None
+        self.waypoints = []
+        self._blocked = None
+        self._goal = None
         
+    def update(self, obstacles=(), dt=0.0, image_width=None, wall=False, stairs=None):
+        """Decay the grid by dt seconds and add one frame of detections and hazards"""
+        self.obstacles = list(obstacles)
+        self.grid.decay(dt)
+        hazards = [self.grid.wall_band()] if wall else []
+        band = self.grid.stairs_band(stairs)
+        if band is not None:
+            hazards.append(band)
+        self.grid.observe(self.obstacles, image_width, hazards)
+
+    def move(self, forward, right=0.0):
+        """The user walked forward/right metres: shift the map and replan from scratch"""
+        self.grid.shift(forward, right)
+        self.planner = None
+
     def plan_path(self, start, destination, obstacles=[]):
-        """Plan a safe path avoiding obstacles"""
-        self.obstacles = obstacles
-        
-        # Simplified path planning
-        # In real implementation, use A* or Dijkstra algorithm
-        path = [start]
-        
-        if not obstacles:
-            path.append("STRAIGHT_FOR_10M")
-        elif "LEFT" in [o['position'] for o in obstacles]:
-            path.append("TURN_RIGHT")
-            path.append("STRAIGHT_FOR_5M")
-        elif "RIGHT" in [o['position'] for o in obstacles]:
-            path.append("TURN_LEFT")
-            path.append("STRAIGHT_FOR_5M")
+        """
+        Plan a safe path avoiding obstacles.
+
+        Args:
+            start: label spoken first (the user is always at the grid origin)
+            destination: (forward, right) metres from the user, or a label
+                for the farthest cell straight ahead
+            obstacles: detections to add to the grid before planning
+
+        Returns:
+            [start, instruction..., destination]; NO_CLEAR_PATH when the
+            goal cannot be reached
+        """
+        if obstacles:
+            self.update(obstacles)
+
+        if isinstance(destination, (tuple, list)):
+            goal = self.grid.cell(*destination)
         else:
-            path.append("PROCEED_WITH_CAUTION")
-        
-        path.append(destination)
-        self.current_path = path
+            goal = (0, self.grid.origin[1])
+        blocked = self.grid.blocked()
+        if self.planner is None or goal != self._goal:
+            self.planner = GridPlanner(blocked, self.grid.origin, goal)
+            self._goal = goal
+        else:
+            self.planner.update_cells(np.flatnonzero(blocked != self._blocked), blocked)
+        self._blocked = blocked
+
+        cells = self.planner.path()
+        if cells is None:
+            self.waypoints = []
+            steps = ["NO_CLEAR_PATH"]
+        else:
+            self.waypoints = simplify(cells, blocked)
+            steps = instructions(self.waypoints, self.grid.resolution)
+
+        path = [start] + steps + [destination]
+        self.current_path = list(path)
         return path
     
     def get_next_instruction(self):
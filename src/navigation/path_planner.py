@@ -0,0 +1,201 @@
+"""
+PRAGYAN-NETRA - Path Planner Module
+D* Lite on the occupancy grid with incremental replanning and turn-by-turn output
+"""
+
+import heapq
+import math
+
+import numpy as np
+
+# Step costs in tenths of a cell: integers keep equal keys equal, which D* Lite's
+# termination test relies on (float sums of sqrt(2) differ in the last bit)
+MOVES = [(-1, 0, 10), (1, 0, 10), (0, -1, 10), (0, 1, 10),
+         (-1, -1, 14), (-1, 1, 14), (1, -1, 14), (1, 1, 14)]
+INF = float('inf')
+
+
+class GridPlanner:
+    """
+    D* Lite (Koenig & Likhachev) over an 8-connected grid.
+
+    The search runs from the goal towards the start, so when some cells
+    change update_cells() only repairs the costs that depend on them
+    instead of searching again; the first plan costs a full A*-like
+    search. Moving into a blocked cell is not allowed; leaving one is, so
+    a start inside an obstacle's clearance can still get out.
+    """
+
+    _neighbours = {}
+
+    def __init__(self, blocked, start, goal):
+        self.rows, self.cols = blocked.shape
+        self.blocked = blocked.ravel().tolist()
+        self.start = start[0] * self.cols + start[1]
+        self.goal = goal[0] * self.cols + goal[1]
+        self.nbrs = self._neighbour_lists(self.rows, self.cols)
+        n = self.rows * self.cols
+        self.g = [INF] * n
+        self.rhs = [INF] * n
+        self.km = 0
+        self.heap = []
+        self.keys = {}     # open cells and their current key; heap entries not matching are stale
+        self.expanded = 0
+        self.rhs[self.goal] = 0
+        self._push(self.goal)
+        self._compute()
+
+    @classmethod
+    def _neighbour_lists(cls, rows, cols):
+        """[(cell, step cost), ...] per cell, shared by planners of the same shape"""
+        if (rows, cols) not in cls._neighbours:
+            nbrs = []
+            for r in range(rows):
+                for c in range(cols):
+                    nbrs.append([((r + dr) * cols + c + dc, cost) for dr, dc, cost in MOVES
+                                 if 0 <= r + dr < rows and 0 <= c + dc < cols])
+            cls._neighbours[(rows, cols)] = nbrs
+        return cls._neighbours[(rows, cols)]
+
+    def _h(self, a, b):
+        """Octile distance in tenths of a cell"""
+        dr = abs(a // self.cols - b // self.cols)
+        dc = abs(a % self.cols - b % self.cols)
+        return 10 * max(dr, dc) + 4 * min(dr, dc)
+
+    def _key(self, u):
+        m = min(self.g[u], self.rhs[u])
+        return (m + self._h(self.start, u) + self.km, m)
+
+    def _push(self, u):
+        key = self._key(u)
+        self.keys[u] = key
+        heapq.heappush(self.heap, (key, u))
+
+    def _update(self, u):
+        if u != self.goal:
+            best = INF
+            g, blocked = self.g, self.blocked
+            for v, cost in self.nbrs[u]:
+                if not blocked[v] and cost + g[v] < best:
+                    best = cost + g[v]
+            self.rhs[u] = best
+        self.keys.pop(u, None)
+        if self.g[u] != self.rhs[u]:
+            self._push(u)
+
+    def _compute(self):
+        g, rhs, heap, keys = self.g, self.rhs, self.heap, self.keys
+        while heap:
+            key, u = heap[0]
+            if keys.get(u) != key:
+                heapq.heappop(heap)
+                continue
+            if not (key < self._key(self.start) or rhs[self.start] != g[self.start]):
+                break
+            heapq.heappop(heap)
+            del keys[u]
+            self.expanded += 1
+            new_key = self._key(u)
+            if key < new_key:
+                self._push(u)
+            elif g[u] > rhs[u]:
+                g[u] = rhs[u]
+                for v, _ in self.nbrs[u]:
+                    self._update(v)
+            elif g[u] != rhs[u]:
+                g[u] = INF
+                self._update(u)
+                for v, _ in self.nbrs[u]:
+                    self._update(v)
+
+    def update_cells(self, changed, blocked):
+        """
+        Replan after the cells at flat indices `changed` switched state.
+
+        Returns:
+            number of cells expanded by the repair
+        """
+        blocked = blocked.ravel()
+        expanded = self.expanded
+        for c in np.asarray(changed, dtype=np.int64).tolist():
+            self.blocked[c] = bool(blocked[c])
+            # Only edges into c changed, so only the cells that can step into it need new rhs
+            for v, _ in self.nbrs[c]:
+                self._update(v)
+        self._compute()
+        return self.expanded - expanded
+
+    def move_start(self, start):
+        """The user moved to another cell of the same map"""
+        start = start[0] * self.cols + start[1]
+        self.km += self._h(self.start, start)
+        self.start = start
+        self._compute()
+
+    def path(self):
+        """[(row, col), ...] from start to goal, or None if the goal is unreachable"""
+        if self.g[self.start] == INF:
+            return None
+        u, cells = self.start, [self.start]
+        while u != self.goal and len(cells) <= len(self.g):
+            u = min(((cost + self.g[v], v) for v, cost in self.nbrs[u] if not self.blocked[v]),
+                    default=(INF, None))[1]
+            if u is None:
+                return None
+            cells.append(u)
+        return [divmod(u, self.cols) for u in cells]
+
+
+def line_clear(blocked, a, b):
+    """True if the straight segment between cells a and b crosses no blocked cell"""
+    steps = int(max(abs(b[0] - a[0]), abs(b[1] - a[1]))) * 2 + 1
+    rows = np.rint(np.linspace(a[0], b[0], steps)).astype(np.int64)
+    cols = np.rint(np.linspace(a[1], b[1], steps)).astype(np.int64)
+    return not blocked[rows, cols].any()
+
+
+def simplify(cells, blocked):
+    """Drop waypoints the user can walk past in a straight line"""
+    if not cells:
+        return []
+    waypoints, anchor = [cells[0]], 0
+    for i in range(2, len(cells)):
+        if not line_clear(blocked, cells[anchor], cells[i]):
+            anchor = i - 1
+            waypoints.append(cells[anchor])
+    if cells[-1] != waypoints[-1]:
+        waypoints.append(cells[-1])
+    return waypoints
+
+
+def turn_instruction(angle):
+    """Instruction for a heading change in degrees (positive = right), or None"""
+    side = "RIGHT" if angle > 0 else "LEFT"
+    if abs(angle) < 20:
+        return None
+    if abs(angle) < 60:
+        return f"SLIGHT_{side}"
+    if abs(angle) < 135:
+        return f"TURN_{side}"
+    return "TURN_AROUND"
+
+
+def instructions(waypoints, resolution):
+    """
+    Turn-by-turn steps (TURN_LEFT, STRAIGHT_FOR_3M, ...) for waypoints,
+    starting from the user facing forward (decreasing row).
+    """
+    steps, heading = [], 0.0
+    for (r0, c0), (r1, c1) in zip(waypoints, waypoints[1:]):
+        forward, right = (r0 - r1) * resolution, (c1 - c0) * resolution
+        bearing = math.degrees(math.atan2(right, forward))
+        turn = turn_instruction((bearing - heading + 180) % 360 - 180)
+        if turn:
+            steps.append(turn)
+        heading = bearing
+        metres = max(1, round(math.hypot(forward, right)))
+        if steps and steps[-1].startswith("STRAIGHT_FOR_"):
+            metres += int(steps.pop()[len("STRAIGHT_FOR_"):-1])
+        steps.append(f"STRAIGHT_FOR_{metres}M")
+    return steps
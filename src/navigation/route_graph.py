@@ -0,0 +1,269 @@
+"""
+PRAGYAN-NETRA - Route Graph Module
+Indoor map of named places with precomputed shortest and safest routes
+"""
+
+from bisect import bisect_right
+from datetime import datetime
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import shortest_path
+
+MODES = ('shortest', 'safest')
+
+
+class RouteGraph:
+    """
+    Named places joined by walkable segments, kept in the MemoryStore.
+
+    Each segment has a length in metres, hazard annotations ('stairs',
+    'door', ...), a hazard level learned from the obstacles met while
+    walking it and a safe flag (set from the store's "safe_paths"). In
+    'safest' mode a segment costs
+
+        length * (1 + hazard_weight * hazards) * (1 if safe else unsafe_penalty)
+
+    Routes are precomputed for all pairs (scipy's Dijkstra from every
+    place), so a query is a name lookup plus a walk along the predecessor
+    table. Edits mark the affected mode stale and the next query rebuilds
+    it, about 3 ms for a hundred places.
+
+    Args:
+        store: MemoryStore to persist in (None keeps the graph in memory)
+        half_life_days: decay of the learned hazard level
+    """
+
+    def __init__(self, store=None, hazard_weight=1.0, unsafe_penalty=1.5, half_life_days=14.0,
+                 key="route_graph"):
+        self.store = store
+        self.key = key
+        self.hazard_weight = hazard_weight
+        self.unsafe_penalty = unsafe_penalty
+        self.half_life_days = half_life_days
+        self.places = []
+        self.aliases = {}
+        self._index = {}      # normalized name or alias -> place index
+        self.edges = {}       # (i, j), i < j -> segment dict
+        self.last_event_id = 0
+        self._tables = {}     # mode -> (costs, predecessors), all pairs
+        self._walks = []      # (start time, edge key) of segments walked, not yet fully learned
+        self.load()
+
+    # ---------- persistence ----------
+
+    def load(self):
+        """Read the graph and the safe paths from the store"""
+        saved = self.store.get_value(self.key) if self.store is not None else None
+        if saved:
+            for place in saved.get('places', []):
+                self.add_place(place['name'], place.get('aliases', ()), save=False)
+            for edge in saved.get('edges', []):
+                segment = self.add_edge(edge['a'], edge['b'], edge['distance'], edge.get('hazards', ()),
+                                        edge.get('safe', False), edge.get('note'), save=False)
+                segment['learned'] = edge.get('learned', 0.0)
+                segment['updated'] = edge.get('updated')
+            self.last_event_id = saved.get('last_event_id', 0)
+            # Walks of earlier sessions whose obstacles may not be learned yet
+            self._walks = [(datetime.fromisoformat(start), self._edge(a, b))
+                           for start, a, b in saved.get('walks', [])]
+        if self.store is not None:
+            for route in self.store.get_value("safe_paths") or []:
+                if all(self.resolve(name) is not None for name in route):
+                    self.mark_safe(route, save=False)
+
+    def save(self):
+        if self.store is None:
+            return
+        self.store.set_value(self.key, {
+            'places': [{'name': name, 'aliases': self.aliases.get(i, [])}
+                       for i, name in enumerate(self.places)],
+            'edges': [{'a': self.places[i], 'b': self.places[j], **segment}
+                      for (i, j), segment in self.edges.items()],
+            'last_event_id': self.last_event_id,
+            'walks': [[start.isoformat(), self.places[i], self.places[j]] for start, (i, j) in self._walks]
+        })
+
+    # ---------- editing ----------
+
+    @staticmethod
+    def _normalize(name):
+        words = str(name).lower().replace('_', ' ').split()
+        return ' '.join(w for w in words if w != 'the')
+
+    def resolve(self, name):
+        """Index of a place by name or alias (case-insensitive), or None"""
+        return self._index.get(self._normalize(name))
+
+    def add_place(self, name, aliases=(), save=True):
+        index = self.resolve(name)
+        if index is None:
+            index = len(self.places)
+            self.places.append(name)
+            self._index[self._normalize(name)] = index
+            self._tables.clear()
+        for alias in aliases:
+            self._index[self._normalize(alias)] = index
+            self.aliases.setdefault(index, [])
+            if alias not in self.aliases[index]:
+                self.aliases[index].append(alias)
+        if save:
+            self.save()
+        return index
+
+    def _edge(self, a, b):
+        i, j = self.resolve(a), self.resolve(b)
+        if i is None or j is None:
+            raise KeyError(f"Unknown place: {a if i is None else b}")
+        return (min(i, j), max(i, j))
+
+    def add_edge(self, a, b, distance, hazards=(), safe=False, note=None, save=True):
+        """
+        Join two places (added if new) by a walkable segment.
+
+        Args:
+            note: spoken when walking from a to b, e.g. "Turn right at the corridor"
+        """
+        i, j = self.add_place(a, save=False), self.add_place(b, save=False)
+        key = (min(i, j), max(i, j))
+        segment = self.edges.get(key)
+        if segment is None:
+            segment = self.edges[key] = {'distance': float(distance), 'hazards': list(hazards),
+                                         'safe': bool(safe), 'note': None, 'from': None,
+                                         'learned': 0.0, 'updated': None}
+        else:
+            segment.update(distance=float(distance), hazards=list(hazards), safe=segment['safe'] or safe)
+        if note is not None:
+            segment['note'], segment['from'] = note, self.places[i]
+        self._tables.clear()
+        if save:
+            self.save()
+        return segment
+
+    def mark_safe(self, route, save=True):
+        """Flag every segment of a route (list of place names) as safe"""
+        keys = [self._edge(a, b) for a, b in zip(route, route[1:])]
+        for key in keys:
+            self.edges[key]['safe'] = True
+        self._tables.pop('safest', None)
+        if save and self.store is not None:
+            safe_paths = self.store.get_value("safe_paths") or []
+            if list(route) not in safe_paths:
+                self.store.set_value("safe_paths", safe_paths + [list(route)])
+            self.save()
+
+    # ---------- learned hazards ----------
+
+    def _decayed(self, segment, when):
+        if not segment['updated']:
+            return segment['learned']
+        days = (when - datetime.fromisoformat(segment['updated'])).total_seconds() / 86400
+        return segment['learned'] * 0.5 ** (max(days, 0.0) / self.half_life_days)
+
+    def record_obstacle(self, a, b, weight=1.0, when=None):
+        """Add an obstacle met on the segment a-b to its learned hazard level"""
+        when = when or datetime.now()
+        segment = self.edges[self._edge(a, b)]
+        segment['learned'] = self._decayed(segment, when) + weight
+        segment['updated'] = when.isoformat()
+        self._tables.pop('safest', None)
+
+    def walk(self, a, b, when=None):
+        """
+        Note that the user started walking a-b, so obstacles logged from now
+        on belong to it. The walk is saved until learn() has used it.
+        """
+        self._walks.append(((when or datetime.now()), self._edge(a, b)))
+        self.save()
+
+    def learn(self, max_segment_seconds=600):
+        """
+        Reweight segments from the obstacle events logged (by ContextManager)
+        since the last call, attributing each to the segment being walked.
+        Call it when a segment has been walked and at shutdown.
+
+        An event no logged walk covers is skipped only once a later walk
+        exists; until then it waits, so events are never dropped because
+        their walk has not been logged (or loaded) yet.
+
+        Returns:
+            number of events attributed
+        """
+        if self.store is None:
+            return 0
+        starts = [start for start, _ in self._walks]
+        attributed = 0
+        for event_id, _, _, timestamp in self.store.obstacle_events_after(self.last_event_id):
+            when = datetime.fromisoformat(timestamp)
+            k = bisect_right(starts, when) - 1
+            on_walk = k >= 0 and (when - starts[k]).total_seconds() <= max_segment_seconds
+            if not on_walk and k == len(starts) - 1:
+                break  # newer than every logged walk: one logged later may still claim it
+            if on_walk:
+                i, j = self._walks[k][1]
+                self.record_obstacle(self.places[i], self.places[j], when=when)
+                attributed += 1
+            self.last_event_id = event_id
+            # Walks before this event's one can no longer receive events
+            if k > 0:
+                del self._walks[:k], starts[:k]
+        self.save()
+        return attributed
+
+    # ---------- routes ----------
+
+    def cost(self, segment, mode):
+        if mode == 'shortest':
+            return segment['distance']
+        hazard = len(segment['hazards']) + self._decayed(segment, datetime.now())
+        return (segment['distance'] * (1 + self.hazard_weight * hazard)
+                * (1.0 if segment['safe'] else self.unsafe_penalty))
+
+    def _build(self, mode):
+        """All-pairs costs and predecessors (Dijkstra from every place)"""
+        n = len(self.places)
+        rows, cols, costs = [], [], []
+        for (i, j), segment in self.edges.items():
+            rows.append(i)
+            cols.append(j)
+            costs.append(self.cost(segment, mode))
+        graph = csr_matrix((costs, (rows, cols)), shape=(n, n))
+        self._tables[mode] = shortest_path(graph, method='D', directed=False, return_predecessors=True)
+        return self._tables[mode]
+
+    def route(self, origin, destination, mode='safest'):
+        """
+        Route between two places.
+
+        Returns:
+            {'places', 'distance' (metres), 'cost', 'steps'} or None if
+            either place is unknown or unreachable
+        """
+        i, j = self.resolve(origin), self.resolve(destination)
+        if i is None or j is None:
+            return None
+        dist, pred = self._tables[mode] if mode in self._tables else self._build(mode)
+        if not np.isfinite(dist[i, j]):
+            return None
+        # Undirected: the predecessor of k on the tree rooted at j is k's next hop towards j
+        path = [i]
+        while path[-1] != j:
+            path.append(int(pred[j, path[-1]]))
+        names = [self.places[k] for k in path]
+        segments = [self.edges[(min(a, b), max(a, b))] for a, b in zip(path, path[1:])]
+        return {
+            'places': names,
+            'distance': sum(s['distance'] for s in segments),
+            'cost': float(dist[i, j]),
+            'steps': [self._step(a, b, s) for a, b, s in zip(names, names[1:], segments)]
+        }
+
+    @staticmethod
+    def _step(a, b, segment):
+        if segment['note'] and segment['from'] == a:
+            text = segment['note']
+        else:
+            text = f"Walk {segment['distance']:.0f} meters to {b}"
+        if segment['hazards']:
+            text += f". Caution: {', '.join(segment['hazards'])}"
+        return text
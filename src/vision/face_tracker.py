@@ -0,0 +1,176 @@
+"""
+PRAGYAN-NETRA - Face Tracking Module
+Downscaled periodic face detection with tracking and re-identification
+"""
+
+import itertools
+
+import cv2
+import numpy as np
+
+
+def box_iou(a, b):
+    """IoU of two (top, right, bottom, left) boxes"""
+    t, r = max(a[0], b[0]), min(a[1], b[1])
+    bt, l = min(a[2], b[2]), max(a[3], b[3])
+    inter = max(0, r - l) * max(0, bt - t)
+    area_a = (a[1] - a[3]) * (a[2] - a[0])
+    area_b = (b[1] - b[3]) * (b[2] - b[0])
+    union = area_a + area_b - inter
+    return inter / union if union > 0 else 0.0
+
+
+class FaceTrack:
+    """A face followed across frames"""
+
+    def __init__(self, track_id, box):
+        self.id = track_id
+        self.box = np.array(box, dtype=np.float32)  # top, right, bottom, left
+        self.name = None
+        self.distance = None
+        self.signature = None
+        self.needs_encoding = True
+        self.misses = 0
+        self.age = 0
+
+    def int_box(self):
+        return tuple(int(v) for v in self.box)
+
+
+class FaceTracker:
+    """
+    Runs the expensive face detector on a downscaled frame every N frames and
+    follows the boxes in between with optical flow. A track is only
+    re-encoded when it is new or its appearance drifted, so the identity
+    stays attached to the track id instead of being recomputed per frame.
+    """
+
+    def __init__(self, detect_fn, encode_fn, identify_fn, detect_every=5, scale=0.5,
+                 iou_threshold=0.3, drift_threshold=0.6, max_misses=2):
+        """
+        Args:
+            detect_fn: rgb image -> list of (top, right, bottom, left)
+            encode_fn: (rgb image, boxes) -> list of embeddings
+            identify_fn: embeddings -> list of (name or None, distance)
+            detect_every: run detection once every this many frames
+            scale: resize factor applied before detection
+            drift_threshold: re-encode when appearance correlation drops below this
+            max_misses: drop a track after this many detections without it
+        """
+        self.detect_fn = detect_fn
+        self.encode_fn = encode_fn
+        self.identify_fn = identify_fn
+        self.detect_every = max(1, detect_every)
+        self.scale = scale
+        self.iou_threshold = iou_threshold
+        self.drift_threshold = drift_threshold
+        self.max_misses = max_misses
+
+        self.tracks = []
+        self.frame_index = 0
+        self.prev_gray = None
+        self._ids = itertools.count(1)
+        self.detections_run = 0
+        self.encodings_run = 0
+
+    def update(self, frame):
+        """Process a BGR frame, return the active tracks"""
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+        if self.frame_index % self.detect_every == 0:
+            self._detect(frame, gray)
+        elif self.prev_gray is not None:
+            self._follow(gray)
+
+        self.prev_gray = gray
+        self.frame_index += 1
+        for track in self.tracks:
+            track.age += 1
+        return self.tracks
+
+    # ---------- detection frames ----------
+
+    def _detect(self, frame, gray):
+        self.detections_run += 1
+        rgb = np.ascontiguousarray(frame[:, :, ::-1])
+        small = cv2.resize(rgb, None, fx=self.scale, fy=self.scale) if self.scale != 1 else rgb
+        boxes = [np.array(b, dtype=np.float32) / self.scale for b in self.detect_fn(small)]
+
+        # Greedy IoU association, best pairs first
+        pairs = sorted(
+            ((box_iou(t.box, b), ti, bi) for ti, t in enumerate(self.tracks) for bi, b in enumerate(boxes)),
+            reverse=True)
+        used_tracks, used_boxes = set(), set()
+        for iou, ti, bi in pairs:
+            if iou < self.iou_threshold:
+                break
+            if ti in used_tracks or bi in used_boxes:
+                continue
+            used_tracks.add(ti)
+            used_boxes.add(bi)
+            track = self.tracks[ti]
+            track.box = boxes[bi]
+            track.misses = 0
+            if self._drifted(track, gray):
+                track.needs_encoding = True
+
+        for ti, track in enumerate(self.tracks):
+            if ti not in used_tracks:
+                track.misses += 1
+        self.tracks = [t for t in self.tracks if t.misses <= self.max_misses]
+
+        for bi, box in enumerate(boxes):
+            if bi not in used_boxes:
+                self.tracks.append(FaceTrack(next(self._ids), box))
+
+        self._encode(rgb, gray)
+
+    def _encode(self, rgb, gray):
+        pending = [t for t in self.tracks if t.needs_encoding and t.misses == 0]
+        if not pending:
+            return
+        self.encodings_run += len(pending)
+        encodings = self.encode_fn(rgb, [t.int_box() for t in pending])
+        for track, (name, distance) in zip(pending, self.identify_fn(encodings)):
+            track.name = name
+            track.distance = distance
+            track.signature = self._signature(gray, track.box)
+            track.needs_encoding = False
+
+    def _signature(self, gray, box):
+        t, r, b, l = (int(v) for v in box)
+        h, w = gray.shape
+        patch = gray[max(0, t):min(h, b), max(0, l):min(w, r)]
+        if patch.size == 0:
+            return None
+        thumb = cv2.resize(patch, (16, 16), interpolation=cv2.INTER_AREA).astype(np.float32).ravel()
+        thumb -= thumb.mean()
+        norm = np.linalg.norm(thumb)
+        return thumb / norm if norm > 0 else thumb
+
+    def _drifted(self, track, gray):
+        if track.signature is None:
+            return True
+        current = self._signature(gray, track.box)
+        if current is None:
+            return False
+        return float(np.dot(current, track.signature)) < self.drift_threshold
+
+    # ---------- tracking frames ----------
+
+    def _follow(self, gray):
+        """Shift every box by the median optical flow of its corner features"""
+        h, w = gray.shape
+        for track in self.tracks:
+            t, r, b, l = track.box
+            mask = np.zeros_like(gray)
+            mask[max(0, int(t)):min(h, int(b)), max(0, int(l)):min(w, int(r))] = 255
+            points = cv2.goodFeaturesToTrack(self.prev_gray, 20, 0.01, 3, mask=mask)
+            if points is None:
+                continue
+            moved, status, _ = cv2.calcOpticalFlowPyrLK(self.prev_gray, gray, points, None)
+            good = status.ravel() == 1
+            if good.sum() < 3:
+                continue
+            dx, dy = np.median((moved[good] - points[good]).reshape(-1, 2), axis=0)
+            track.box += np.array([dy, dx, dy, dx], dtype=np.float32)
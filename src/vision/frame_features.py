@@ -0,0 +1,128 @@
+"""
+PRAGYAN-NETRA - Frame Features Module
+Per-frame gray/edge/line cache shared by the structural detectors
+"""
+
+import threading
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+
+class FrameFeatures:
+    """
+    Lazily computed low-level features of one frame.
+
+    The grayscale image, Canny edges, the integral image of the edge map and
+    one Hough pass are each computed at most once, no matter how many
+    detectors ask for them. The integral image makes edge counts over any ROI
+    O(1). Longer Hough segments are filtered out of the shortest pass rather
+    than extracted again.
+    """
+
+    def __init__(self, frame, seq=None, canny_low=50, canny_high=150, min_line_length=50):
+        self.frame = frame
+        self.seq = seq
+        self.canny_low = canny_low
+        self.canny_high = canny_high
+        self.min_line_length = min_line_length
+        self._gray = None
+        self._edges = None
+        self._integral = None
+        self._lines = {}
+        self._lock = threading.RLock()
+
+    @property
+    def gray(self):
+        with self._lock:
+            if self._gray is None:
+                self._gray = cv2.cvtColor(self.frame, cv2.COLOR_BGR2GRAY)
+            return self._gray
+
+    @property
+    def edges(self):
+        with self._lock:
+            if self._edges is None:
+                self._edges = cv2.Canny(self.gray, self.canny_low, self.canny_high)
+            return self._edges
+
+    @property
+    def edge_integral(self):
+        """Integral image of the binary edge map, shape (h+1, w+1)"""
+        with self._lock:
+            if self._integral is None:
+                self._integral = cv2.integral((self.edges > 0).view(np.uint8))
+            return self._integral
+
+    def edge_count(self, x0, y0, x1, y1):
+        """Number of edge pixels in frame[y0:y1, x0:x1]"""
+        s = self.edge_integral
+        return int(s[y1, x1] - s[y0, x1] - s[y1, x0] + s[y0, x0])
+
+    def edge_density(self, x0=0, y0=0, x1=None, y1=None):
+        """Fraction of edge pixels in the ROI (whole frame by default)"""
+        h, w = self.edges.shape
+        if (x0, y0, x1, y1) == (0, 0, None, None):
+            return cv2.countNonZero(self.edges) / (h * w)
+        x1 = w if x1 is None else x1
+        y1 = h if y1 is None else y1
+        area = (x1 - x0) * (y1 - y0)
+        return self.edge_count(x0, y0, x1, y1) / area if area > 0 else 0.0
+
+    def lines(self, min_line_length=50, threshold=50, max_line_gap=10):
+        """
+        Hough line segments in cv2.HoughLinesP format (or None).
+
+        Segments of at least min_line_length are taken from a single pass at
+        self.min_line_length. HoughLinesP does not clear the votes of short
+        segments, so this can keep a few more long segments than a dedicated
+        pass (under 1% on textured 640x480 scenes, with the same stair
+        decisions). Shorter lengths need a pass of their own.
+        """
+        base = min(min_line_length, self.min_line_length)
+        with self._lock:
+            key = (base, threshold, max_line_gap)
+            if key not in self._lines:
+                self._lines[key] = cv2.HoughLinesP(self.edges, 1, np.pi/180, threshold,
+                                                   minLineLength=base, maxLineGap=max_line_gap)
+            if min_line_length == base:
+                return self._lines[key]
+
+            long_key = (min_line_length, threshold, max_line_gap)
+            if long_key not in self._lines:
+                segments = self._lines[key]
+                if segments is not None:
+                    # Same length test as HoughLinesP: the longer axis extent
+                    extent = np.abs(segments[:, 0, 2:] - segments[:, 0, :2]).max(axis=1)
+                    segments = segments[extent >= min_line_length]
+                self._lines[long_key] = segments if segments is not None and len(segments) else None
+            return self._lines[long_key]
+
+
+class FeatureCache:
+    """Keeps FrameFeatures for the most recent frame sequence numbers"""
+
+    def __init__(self, size=4):
+        self.size = size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, frame, seq=None):
+        """Features for frame; frames without a seq are never cached"""
+        if seq is None:
+            return FrameFeatures(frame)
+        with self._lock:
+            features = self._cache.get(seq)
+            if features is not None and features.frame is frame:
+                self._cache.move_to_end(seq)
+                self.hits += 1
+                return features
+            self.misses += 1
+            features = FrameFeatures(frame, seq)
+            self._cache[seq] = features
+            while len(self._cache) > self.size:
+                self._cache.popitem(last=False)
+            return features
@@ -0,0 +1,316 @@
+"""
+PRAGYAN-NETRA - Frame Source Module
+Latest-frame-only capture with webcam, video, image folder and synthetic backends
+"""
+
+import os
+import threading
+import time
+from collections import namedtuple
+
+import cv2
+import numpy as np
+
+Frame = namedtuple('Frame', ['seq', 'timestamp', 'image'])
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+
+class FrameSource:
+    """
+    Base class for all capture backends.
+
+    In threaded mode a background grabber keeps only the newest frame, so a
+    slow consumer never sees buffer lag. Frames are decoded into a ring of
+    preallocated arrays that is reused for the lifetime of the source, and
+    read() hands out a copy of the newest one, so a frame stays intact
+    however long the pipeline holds it. In non-threaded mode read() grabs
+    the next frame synchronously, which replays file and synthetic backends
+    deterministically at full speed; there copy=False returns the ring
+    buffer itself, valid until buffer_size - 1 more frames have been read.
+    """
+
+    def __init__(self, buffer_size=4, threaded=True, fps=None, copy=True):
+        """
+        Args:
+            buffer_size: number of preallocated frame buffers in the ring
+            threaded: grab in a background thread, keeping only the newest frame
+            fps: pace file/synthetic playback to this rate (None = full speed)
+            copy: return a private copy of each image (always on when threaded)
+        """
+        self.buffer_size = max(2, buffer_size)
+        self.threaded = threaded
+        self.fps = fps
+        self.copy = copy or threaded
+        self.ring = [None] * self.buffer_size
+        self.seq = 0
+        self.latest = None
+        self.last_read_seq = -1
+        self.ended = False
+        self.running = False
+        self._cond = threading.Condition()
+        self._thread = None
+
+    # ---------- backend hooks ----------
+
+    def _open(self):
+        """Open the underlying device/file, return True on success"""
+        return True
+
+    def _read_into(self, buffer):
+        """
+        Fill buffer with the next frame.
+
+        Returns the filled array (a new one if buffer is None or the wrong
+        shape) or None when the stream has ended.
+        """
+        raise NotImplementedError
+
+    def _close(self):
+        pass
+
+    # ---------- public API ----------
+
+    def start(self):
+        """Open the backend and start the grabber thread"""
+        if self.running:
+            return self
+        if not self._open():
+            self.ended = True
+            return self
+        self.running = True
+        if self.threaded:
+            self._thread = threading.Thread(target=self._grab_loop, daemon=True)
+            self._thread.start()
+        return self
+
+    def isOpened(self):
+        return self.running
+
+    def read(self, timeout=None):
+        """
+        Return the newest Frame not returned before.
+
+        Blocks until one is available; returns None when the stream has ended
+        or the optional timeout (seconds) expires.
+        """
+        if not self.running:
+            self.start()
+        if not self.threaded:
+            frame = self._grab_next()
+            if frame is not None and self.copy:
+                frame = frame._replace(image=frame.image.copy())
+            return frame
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while (self.latest is None or self.latest.seq <= self.last_read_seq) \
+                    and not self.ended and self.running:
+                if deadline is None:
+                    self._cond.wait(0.5)
+                    continue
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+            if self.latest is None or self.latest.seq <= self.last_read_seq:
+                return None
+            self.last_read_seq = self.latest.seq
+            # The grabber never writes the published slot while we hold the lock
+            return self.latest._replace(image=self.latest.image.copy())
+
+    def stop(self):
+        """Stop grabbing and release the backend"""
+        self.running = False
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+        self._close()
+
+    release = stop
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def __iter__(self):
+        while True:
+            frame = self.read()
+            if frame is None:
+                return
+            yield frame
+
+    # ---------- internals ----------
+
+    def _grab_next(self):
+        if self.ended:
+            return None
+        slot = self.seq % self.buffer_size
+        image = self._read_into(self.ring[slot])
+        if image is None:
+            self.ended = True
+            return None
+        self.ring[slot] = image
+        frame = Frame(self.seq, time.monotonic(), image)
+        self.seq += 1
+        return frame
+
+    def _grab_loop(self):
+        interval = 1.0 / self.fps if self.fps else 0
+        while self.running:
+            start = time.monotonic()
+            frame = self._grab_next()
+            with self._cond:
+                if frame is not None:
+                    self.latest = frame
+                self._cond.notify_all()
+            if frame is None:
+                break
+            if interval:
+                time.sleep(max(0, interval - (time.monotonic() - start)))
+
+
+class WebcamSource(FrameSource):
+    """Live camera backend"""
+
+    def __init__(self, device=0, **kwargs):
+        super().__init__(**kwargs)
+        self.device = device
+        self.cap = None
+
+    def _open(self):
+        self.cap = cv2.VideoCapture(self.device)
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        return self.cap.isOpened()
+
+    def _read_into(self, buffer):
+        ret, image = self.cap.read(buffer)
+        return image if ret else None
+
+    def _close(self):
+        if self.cap is not None:
+            self.cap.release()
+
+
+class VideoFileSource(WebcamSource):
+    """Recorded video backend; threaded playback runs at the file's frame rate"""
+
+    def __init__(self, path, loop=False, **kwargs):
+        super().__init__(device=path, **kwargs)
+        self.loop = loop
+
+    def _open(self):
+        self.cap = cv2.VideoCapture(self.device)
+        if self.threaded and not self.fps:
+            # Decoding at full speed would silently skip most of the file
+            self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+        return self.cap.isOpened()
+
+    def _read_into(self, buffer):
+        ret, image = self.cap.read(buffer)
+        if not ret and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, image = self.cap.read(buffer)
+        return image if ret else None
+
+
+class ImageDirectorySource(FrameSource):
+    """Backend replaying the images of a folder in sorted order"""
+
+    def __init__(self, directory, loop=False, **kwargs):
+        super().__init__(**kwargs)
+        self.directory = directory
+        self.loop = loop
+        self.files = []
+        self.index = 0
+
+    def _open(self):
+        if not os.path.isdir(self.directory):
+            return False
+        self.files = sorted(
+            os.path.join(self.directory, f) for f in os.listdir(self.directory)
+            if f.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        return bool(self.files)
+
+    def _read_into(self, buffer):
+        if self.index >= len(self.files):
+            if not self.loop:
+                return None
+            self.index = 0
+        image = cv2.imread(self.files[self.index])
+        self.index += 1
+        if image is None:
+            return self._read_into(buffer)
+        if buffer is not None and buffer.shape == image.shape:
+            np.copyto(buffer, image)
+            return buffer
+        return image
+
+
+class SyntheticSource(FrameSource):
+    """Seeded synthetic scene backend with moving blocks on a floor gradient"""
+
+    def __init__(self, width=640, height=480, num_frames=None, seed=0, num_objects=3, **kwargs):
+        super().__init__(**kwargs)
+        self.width = width
+        self.height = height
+        self.num_frames = num_frames
+        self.seed = seed
+        self.num_objects = num_objects
+        self.frame_index = 0
+        self.background = None
+
+    def _open(self):
+        rng = np.random.default_rng(self.seed)
+        self.frame_index = 0
+        self.positions = rng.uniform(0, 1, (self.num_objects, 2)) * (self.width, self.height)
+        self.velocities = rng.uniform(-4, 4, (self.num_objects, 2))
+        self.sizes = rng.integers(30, 120, (self.num_objects, 2))
+        self.colors = rng.integers(0, 255, (self.num_objects, 3))
+        gradient = np.linspace(200, 90, self.height, dtype=np.uint8)
+        self.background = np.repeat(gradient[:, None, None], self.width, axis=1).repeat(3, axis=2)
+        return True
+
+    def _read_into(self, buffer):
+        if self.num_frames is not None and self.frame_index >= self.num_frames:
+            return None
+        if buffer is None or buffer.shape != self.background.shape:
+            buffer = np.empty_like(self.background)
+        np.copyto(buffer, self.background)
+
+        t = self.frame_index
+        extent = np.array([self.width, self.height])
+        # Bounce the blocks off the frame edges
+        centers = np.abs((self.positions + self.velocities * t) % (2 * extent) - extent)
+        centers = extent - centers
+        for (cx, cy), (w, h), color in zip(centers.astype(int), self.sizes, self.colors):
+            cv2.rectangle(buffer, (cx - w // 2, cy - h // 2), (cx + w // 2, cy + h // 2),
+                          tuple(int(c) for c in color), -1)
+
+        self.frame_index += 1
+        return buffer
+
+
+def open_source(spec=0, **kwargs):
+    """
+    Create a frame source from a spec.
+
+    Args:
+        spec: camera index, "synthetic", "scene" (SceneSource with ground
+            truth), an image folder or a video file path
+    """
+    if spec is None:
+        spec = 0
+    if isinstance(spec, int) or (isinstance(spec, str) and spec.isdigit()):
+        return WebcamSource(int(spec), **kwargs)
+    if spec == "synthetic":
+        return SyntheticSource(**kwargs)
+    if spec == "scene":
+        from vision.synthetic_scene import SceneSource
+        return SceneSource(**kwargs)
+    if os.path.isdir(spec):
+        return ImageDirectorySource(spec, **kwargs)
+    return VideoFileSource(spec, **kwargs)
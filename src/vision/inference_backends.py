@@ -0,0 +1,255 @@
+"""
+PRAGYAN-NETRA - Inference Backends Module
+Pluggable CPU inference backends for obstacle detection
+"""
+
+import ast
+import time
+
+import cv2
+import numpy as np
+
+COCO_NAMES = [
+    'person', 'bicycle', 'car', 'motorcycle', 'airplane', 'bus', 'train', 'truck', 'boat',
+    'traffic light', 'fire hydrant', 'stop sign', 'parking meter', 'bench', 'bird', 'cat',
+    'dog', 'horse', 'sheep', 'cow', 'elephant', 'bear', 'zebra', 'giraffe', 'backpack',
+    'umbrella', 'handbag', 'tie', 'suitcase', 'frisbee', 'skis', 'snowboard', 'sports ball',
+    'kite', 'baseball bat', 'baseball glove', 'skateboard', 'surfboard', 'tennis racket',
+    'bottle', 'wine glass', 'cup', 'fork', 'knife', 'spoon', 'bowl', 'banana', 'apple',
+    'sandwich', 'orange', 'broccoli', 'carrot', 'hot dog', 'pizza', 'donut', 'cake', 'chair',
+    'couch', 'potted plant', 'bed', 'dining table', 'toilet', 'tv', 'laptop', 'mouse',
+    'remote', 'keyboard', 'cell phone', 'microwave', 'oven', 'toaster', 'sink',
+    'refrigerator', 'book', 'clock', 'vase', 'scissors', 'teddy bear', 'hair drier',
+    'toothbrush'
+]
+
+
+def nms(boxes, scores, classes, iou_threshold=0.45):
+    """
+    Class-aware non-maximum suppression in NumPy.
+
+    Args:
+        boxes: (N, 4) x1, y1, x2, y2
+        scores: (N,)
+        classes: (N,) integer class ids
+
+    Returns:
+        indices of the kept boxes, best score first
+    """
+    if len(boxes) == 0:
+        return np.zeros(0, dtype=np.int64)
+    # Offset every class into its own coordinate range so boxes of different
+    # classes never overlap
+    offset = classes[:, None].astype(np.float32) * (boxes.max() + 1)
+    b = boxes + offset
+    areas = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    order = np.argsort(-scores)
+    keep = []
+    while len(order):
+        i = order[0]
+        keep.append(i)
+        rest = order[1:]
+        xx1 = np.maximum(b[i, 0], b[rest, 0])
+        yy1 = np.maximum(b[i, 1], b[rest, 1])
+        xx2 = np.minimum(b[i, 2], b[rest, 2])
+        yy2 = np.minimum(b[i, 3], b[rest, 3])
+        inter = np.clip(xx2 - xx1, 0, None) * np.clip(yy2 - yy1, 0, None)
+        iou = inter / (areas[i] + areas[rest] - inter + 1e-9)
+        order = rest[iou <= iou_threshold]
+    return np.array(keep, dtype=np.int64)
+
+
+class Letterbox:
+    """Resize-and-pad preprocessing into buffers that are reused across frames"""
+
+    def __init__(self, size=640, pad_value=114):
+        self.size = size
+        self.pad_value = pad_value
+        self.canvas = np.full((size, size, 3), pad_value, dtype=np.uint8)
+        self.blob = np.zeros((1, 3, size, size), dtype=np.float32)
+        self._resized = {}
+        self._last_shape = None
+
+    def __call__(self, frame):
+        """
+        Returns:
+            (blob, ratio, (pad_x, pad_y)); blob is a reused (1, 3, S, S) RGB float32 array
+        """
+        h, w = frame.shape[:2]
+        ratio = min(self.size / h, self.size / w)
+        new_w, new_h = int(round(w * ratio)), int(round(h * ratio))
+        pad_x, pad_y = (self.size - new_w) // 2, (self.size - new_h) // 2
+
+        resized = self._resized.get((new_h, new_w))
+        if resized is None:
+            resized = self._resized[(new_h, new_w)] = np.empty((new_h, new_w, 3), dtype=np.uint8)
+        if self._last_shape != (new_h, new_w):
+            # Padding only needs repainting when the frame size changes
+            self.canvas.fill(self.pad_value)
+            self._last_shape = (new_h, new_w)
+        cv2.resize(frame, (new_w, new_h), dst=resized, interpolation=cv2.INTER_LINEAR)
+        self.canvas[pad_y:pad_y + new_h, pad_x:pad_x + new_w] = resized
+
+        # BGR HWC uint8 -> RGB CHW float32 in [0, 1]
+        np.multiply(self.canvas[:, :, ::-1].transpose(2, 0, 1), 1 / 255.0, out=self.blob[0])
+        return self.blob, ratio, (pad_x, pad_y)
+
+
+def decode_yolo_output(output, ratio, pad, conf_threshold=0.25, iou_threshold=0.45):
+    """
+    Convert a raw exported-YOLO output tensor to an (N, 6) box array in
+    original image coordinates.
+
+    Handles both YOLOv8-style (1, 4 + classes, anchors) outputs, which need
+    NMS, and end-to-end YOLOv10-style (1, max_det, 6) outputs.
+    """
+    out = np.asarray(output)[0]
+    if out.ndim == 2 and out.shape[1] == 6:
+        data = out[out[:, 4] > conf_threshold].astype(np.float32)
+    else:
+        preds = out.T  # (anchors, 4 + classes)
+        scores_all = preds[:, 4:]
+        cls = np.argmax(scores_all, axis=1)
+        scores = scores_all[np.arange(len(cls)), cls]
+        mask = scores > conf_threshold
+        preds, cls, scores = preds[mask], cls[mask], scores[mask]
+
+        cx, cy, w, h = preds[:, 0], preds[:, 1], preds[:, 2], preds[:, 3]
+        boxes = np.stack([cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2], axis=1)
+        keep = nms(boxes, scores, cls, iou_threshold)
+        data = np.concatenate([boxes[keep], scores[keep, None], cls[keep, None]], axis=1).astype(np.float32)
+
+    data[:, [0, 2]] = (data[:, [0, 2]] - pad[0]) / ratio
+    data[:, [1, 3]] = (data[:, [1, 3]] - pad[1]) / ratio
+    return data
+
+
+class InferenceBackend:
+    """
+    Common interface: predict(frames) returns one (N, 6) array per frame with
+    x1, y1, x2, y2, confidence, class id in original image coordinates.
+    """
+
+    name = "base"
+
+    def __init__(self, model_path, threads=None, input_size=640, conf_threshold=0.25):
+        self.model_path = model_path
+        self.threads = threads
+        self.input_size = input_size
+        self.conf_threshold = conf_threshold
+        self.names = dict(enumerate(COCO_NAMES))
+
+    def predict(self, frames):
+        raise NotImplementedError
+
+    def benchmark(self, frames, warmup=3):
+        """Per-frame latency statistics in milliseconds over the given frames"""
+        for frame in frames[:warmup]:
+            self.predict([frame])
+        latencies = []
+        for frame in frames:
+            start = time.perf_counter()
+            self.predict([frame])
+            latencies.append(1000 * (time.perf_counter() - start))
+        latencies = np.array(latencies)
+        return {
+            'backend': self.name,
+            'frames': len(latencies),
+            'mean_ms': float(latencies.mean()),
+            'p50_ms': float(np.percentile(latencies, 50)),
+            'p95_ms': float(np.percentile(latencies, 95)),
+            'fps': float(1000 / latencies.mean())
+        }
+
+
+class UltralyticsBackend(InferenceBackend):
+    """Native ultralytics YOLO model (.pt)"""
+
+    name = "ultralytics"
+
+    def __init__(self, model_path, **kwargs):
+        super().__init__(model_path, **kwargs)
+        from ultralytics import YOLO
+
+        if self.threads:
+            import torch
+            torch.set_num_threads(self.threads)
+        self.model = YOLO(model_path)
+        names = self.model.names
+        self.names = dict(enumerate(names)) if isinstance(names, (list, tuple)) else dict(names)
+
+    def predict(self, frames):
+        results = self.model(list(frames), verbose=False, imgsz=self.input_size, conf=self.conf_threshold)
+        outputs = []
+        for result in results:
+            data = result.boxes.data
+            outputs.append(data.cpu().numpy() if hasattr(data, 'cpu') else np.asarray(data))
+        return outputs
+
+
+class OnnxBackend(InferenceBackend):
+    """Exported ONNX model on ONNX Runtime (CPU)"""
+
+    name = "onnx"
+
+    def __init__(self, model_path, **kwargs):
+        super().__init__(model_path, **kwargs)
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        if self.threads:
+            options.intra_op_num_threads = self.threads
+        self.session = ort.InferenceSession(model_path, options, providers=['CPUExecutionProvider'])
+        self.input_name = self.session.get_inputs()[0].name
+        self.letterbox = Letterbox(self.input_size)
+
+        metadata = self.session.get_modelmeta().custom_metadata_map
+        if 'names' in metadata:
+            self.names = ast.literal_eval(metadata['names'])
+
+    def predict(self, frames):
+        outputs = []
+        for frame in frames:
+            blob, ratio, pad = self.letterbox(frame)
+            raw = self.session.run(None, {self.input_name: blob})[0]
+            outputs.append(decode_yolo_output(raw, ratio, pad, self.conf_threshold))
+        return outputs
+
+
+class OpenCVDnnBackend(InferenceBackend):
+    """Exported ONNX model on OpenCV's DNN module"""
+
+    name = "opencv"
+
+    def __init__(self, model_path, **kwargs):
+        super().__init__(model_path, **kwargs)
+        if self.threads:
+            cv2.setNumThreads(self.threads)
+        self.net = cv2.dnn.readNetFromONNX(model_path)
+        self.net.setPreferableBackend(cv2.dnn.DNN_BACKEND_OPENCV)
+        self.net.setPreferableTarget(cv2.dnn.DNN_TARGET_CPU)
+        self.letterbox = Letterbox(self.input_size)
+
+    def predict(self, frames):
+        outputs = []
+        for frame in frames:
+            blob, ratio, pad = self.letterbox(frame)
+            self.net.setInput(blob)
+            raw = self.net.forward()
+            outputs.append(decode_yolo_output(raw, ratio, pad, self.conf_threshold))
+        return outputs
+
+
+BACKENDS = {
+    UltralyticsBackend.name: UltralyticsBackend,
+    OnnxBackend.name: OnnxBackend,
+    OpenCVDnnBackend.name: OpenCVDnnBackend
+}
+
+
+def create_backend(name, model_path, threads=None, input_size=640, conf_threshold=0.25):
+    """Instantiate a backend by name ('ultralytics', 'onnx' or 'opencv')"""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown inference backend '{name}', choose from {sorted(BACKENDS)}")
+    return BACKENDS[name](model_path, threads=threads, input_size=input_size,
+                          conf_threshold=conf_threshold)
@@ -0,0 +1,288 @@
+"""
+PRAGYAN-NETRA - Object Tracker Module
+SORT-style multi-object tracking with per-track announcement deduplication
+"""
+
+import itertools
+import time
+from bisect import bisect_left
+from collections import Counter
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+DISTANCE_LABELS = ["VERY CLOSE", "CLOSE", "MODERATE", "FAR"]
+# Box/image area ratios separating the labels, as in utils.helpers.calculate_distance
+DISTANCE_RATIOS = [0.3, 0.15, 0.05]
+REGIONS = ["LEFT", "CENTER", "RIGHT"]
+
+# Constant-velocity model over (cx, cy, area, aspect) as in SORT
+_F = np.eye(7)
+_F[0, 4] = _F[1, 5] = _F[2, 6] = 1.0
+_Q = np.diag([1.0, 1.0, 1.0, 1.0, 0.01, 0.01, 1e-4])
+_R = np.diag([1.0, 1.0, 10.0, 10.0])
+_P0 = np.diag([10.0, 10.0, 10.0, 10.0, 1e4, 1e4, 1e4])
+
+
+def to_state(boxes):
+    """(N, 4) x1, y1, x2, y2 -> (N, 4) cx, cy, area, aspect"""
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+    w = boxes[:, 2] - boxes[:, 0]
+    h = boxes[:, 3] - boxes[:, 1]
+    return np.stack([boxes[:, 0] + w / 2, boxes[:, 1] + h / 2, w * h, w / np.maximum(h, 1e-6)], axis=1)
+
+
+def to_boxes(states):
+    """(N, >=4) cx, cy, area, aspect -> (N, 4) x1, y1, x2, y2"""
+    area = np.maximum(states[:, 2], 1e-6)
+    w = np.sqrt(area * np.maximum(states[:, 3], 1e-6))
+    h = area / w
+    return np.stack([states[:, 0] - w / 2, states[:, 1] - h / 2,
+                     states[:, 0] + w / 2, states[:, 1] + h / 2], axis=1)
+
+
+def iou_matrix(a, b):
+    """(len(a), len(b)) IoU of x1, y1, x2, y2 boxes"""
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - inter
+    return np.where(union > 0, inter / np.maximum(union, 1e-9), 0.0)
+
+
+def distance_rank(det, image_shape):
+    """Index into DISTANCE_LABELS from the detection's label or its bbox size"""
+    label = det.get('distance')
+    if label is not None:
+        label = label.upper().replace('_', ' ')
+        if label in DISTANCE_LABELS:
+            return DISTANCE_LABELS.index(label)
+    if image_shape is None:
+        return len(DISTANCE_LABELS) - 1
+    x1, y1, x2, y2 = det['bbox']
+    ratio = (x2 - x1) * (y2 - y1) / (image_shape[0] * image_shape[1])
+    return len(DISTANCE_RATIOS) - bisect_left(DISTANCE_RATIOS[::-1], ratio)
+
+
+class Track:
+    """One obstacle followed across frames"""
+
+    def __init__(self, track_id):
+        self.id = track_id
+        self.state = "tentative"    # -> confirmed -> lost (coasting) -> deleted
+        self.hits = 0
+        self.misses = 0
+        self.age = 0
+        self.bbox = None
+        self.region = None
+        self.confidence = 0.0
+        self.distance_rank = None     # exponential average of the class index
+        self.distance_class = None    # its label index, with hysteresis
+        self.types = Counter()
+        self.names = {}
+        self.announced_rank = None
+        self.announced_at = 0.0
+
+    @property
+    def type(self):
+        return self.types.most_common(1)[0][0] if self.types else "object"
+
+    @property
+    def name(self):
+        return self.names.get(self.type, self.type)
+
+    @property
+    def distance(self):
+        return DISTANCE_LABELS[self.distance_class]
+
+    def as_detection(self):
+        """Detection-shaped dict with the smoothed values"""
+        return {
+            'type': self.type,
+            'name': self.name,
+            'region': self.region,
+            'distance': self.distance,
+            'confidence': self.confidence,
+            'bbox': tuple(int(v) for v in self.bbox),
+            'track_id': self.id
+        }
+
+
+class ObjectTracker:
+    """
+    Tracks obstacle detections with a Kalman filter per track and Hungarian
+    assignment on IoU, all tracks' filters stepped together as arrays.
+
+    update() takes a frame's detections; predict() advances the tracks on
+    frames where the detector did not run, so it can run every N frames.
+    A track is confirmed after min_hits matched updates, coasts as 'lost'
+    while unmatched and is dropped after max_age missed updates; tentative
+    tracks are dropped on their first miss, which removes flicker. Type is
+    a majority vote, distance an exponential average of its class whose
+    label only changes once the average is more than `hysteresis` away.
+
+    Args:
+        distance_alpha: weight of the newest distance in the average
+    """
+
+    def __init__(self, iou_threshold=0.3, min_hits=3, max_age=3, distance_alpha=0.3, hysteresis=0.75):
+        self.iou_threshold = iou_threshold
+        self.min_hits = min_hits
+        self.max_age = max_age
+        self.distance_alpha = distance_alpha
+        self.hysteresis = hysteresis
+        self.tracks = []
+        self._x = np.zeros((0, 7))
+        self._p = np.zeros((0, 7, 7))
+        self._ids = itertools.count(1)
+        self.image_shape = None
+        self.confirmed_total = 0
+
+    def __len__(self):
+        return len(self.tracks)
+
+    def _step(self):
+        """Kalman predict for every track"""
+        if not len(self.tracks):
+            return
+        shrinking = self._x[:, 2] + self._x[:, 6] <= 0
+        self._x[shrinking, 6] = 0.0
+        self._x = self._x @ _F.T
+        self._p = _F @ self._p @ _F.T + _Q
+        for track in self.tracks:
+            track.age += 1
+
+    def _refresh(self):
+        """Copy the filtered boxes (and regions) into the Track objects"""
+        if not len(self.tracks):
+            return
+        boxes = to_boxes(self._x)
+        regions = [None] * len(boxes)
+        if self.image_shape is not None:
+            x_center = (boxes[:, 0] + boxes[:, 2]) / 2
+            index = np.clip((3 * x_center / self.image_shape[1]).astype(np.int64), 0, 2)
+            regions = [REGIONS[i] for i in index.tolist()]
+        for track, box, region in zip(self.tracks, boxes.tolist(), regions):
+            track.bbox = box
+            track.region = region
+
+    def predict(self):
+        """Advance all tracks one frame without detections"""
+        self._step()
+        self._refresh()
+        return self.active()
+
+    def update(self, detections, image_shape=None):
+        """
+        Match one frame of detections (dicts with a 'bbox') to the tracks.
+
+        Returns:
+            the active (confirmed or coasting) tracks
+        """
+        if image_shape is not None:
+            self.image_shape = image_shape[:2]
+        self._step()
+        boxes = np.array([d['bbox'] for d in detections], dtype=np.float64).reshape(-1, 4)
+
+        matches = []
+        if len(self.tracks) and len(boxes):
+            iou = iou_matrix(to_boxes(self._x), boxes)
+            rows, cols = linear_sum_assignment(-iou)
+            matches = [(t, d) for t, d in zip(rows, cols) if iou[t, d] >= self.iou_threshold]
+        matched_tracks = {t for t, _ in matches}
+        matched_dets = {d for _, d in matches}
+
+        if matches:
+            self._correct(np.array([t for t, _ in matches]), to_state(boxes[[d for _, d in matches]]))
+            for t, d in matches:
+                self._absorb(self.tracks[t], detections[d])
+
+        # Unmatched tracks miss; tentative ones and stale ones are dropped
+        keep = np.ones(len(self.tracks), dtype=bool)
+        for t, track in enumerate(self.tracks):
+            if t in matched_tracks:
+                continue
+            track.misses += 1
+            if track.state == "tentative" or track.misses > self.max_age:
+                keep[t] = False
+            else:
+                track.state = "lost"
+        if not keep.all():
+            self.tracks = [track for track, k in zip(self.tracks, keep) if k]
+            self._x, self._p = self._x[keep], self._p[keep]
+
+        new = [d for d in range(len(boxes)) if d not in matched_dets]
+        if new:
+            states = np.zeros((len(new), 7))
+            states[:, :4] = to_state(boxes[new])
+            self._x = np.concatenate([self._x, states])
+            self._p = np.concatenate([self._p, np.repeat(_P0[None], len(new), axis=0)])
+            for d in new:
+                track = Track(next(self._ids))
+                self.tracks.append(track)
+                self._absorb(track, detections[d])
+        self._refresh()
+        return self.active()
+
+    def _correct(self, index, z):
+        """Batched Kalman update of the tracks at `index` with measurements z"""
+        x, p = self._x[index], self._p[index]
+        residual = z - x[:, :4]
+        s = p[:, :4, :4] + _R
+        gain = p[:, :, :4] @ np.linalg.inv(s)                  # (k, 7, 4)
+        self._x[index] = x + np.einsum('kij,kj->ki', gain, residual)
+        self._p[index] = p - gain @ p[:, :4, :]
+
+    def _absorb(self, track, det):
+        track.hits += 1
+        track.misses = 0
+        track.confidence = det.get('confidence', track.confidence)
+        obj_type = det.get('type', 'object')
+        track.types[obj_type] += 1
+        track.names.setdefault(obj_type, det.get('name', obj_type))
+
+        rank = distance_rank(det, self.image_shape)
+        if track.distance_rank is None:
+            track.distance_rank = float(rank)
+            track.distance_class = rank
+        else:
+            track.distance_rank += self.distance_alpha * (rank - track.distance_rank)
+            if abs(track.distance_rank - track.distance_class) > self.hysteresis:
+                track.distance_class = int(round(track.distance_rank))
+
+        if track.state == "tentative" and track.hits >= self.min_hits:
+            self.confirmed_total += 1
+        if track.hits >= self.min_hits:
+            track.state = "confirmed"
+
+    def active(self):
+        """Confirmed tracks, including ones coasting through a missed detection"""
+        return [t for t in self.tracks if t.state != "tentative"]
+
+    def announcements(self, now=None, repeat_after=30.0):
+        """
+        Tracks that should be announced now, marked as announced.
+
+        A confirmed track is announced once, again when it moves into a
+        closer distance class than last announced (or since it moved away),
+        and otherwise only every repeat_after seconds.
+        """
+        now = time.time() if now is None else now
+        due = []
+        for track in self.tracks:
+            if track.state != "confirmed" or track.misses:
+                continue
+            rank = track.distance_class
+            if (track.announced_rank is None or rank < track.announced_rank
+                    or now - track.announced_at > repeat_after):
+                track.announced_rank = rank
+                track.announced_at = now
+                due.append(track)
+            elif rank > track.announced_rank:
+                # Moved away: coming closer again is news
+                track.announced_rank = rank
+        return due
@@ -3,38 +3,105 @@ PRAGYAN-NETRA - Obstacle Detection Module
 Uses YOLOv8 for real-time object detection
 """
 
+import os
+
 import cv2
 import numpy as np
-from ultralytics import YOLO
+
+from vision.inference_backends import InferenceBackend, create_backend
+
+POSITIONS = np.array(["LEFT", "CENTER", "RIGHT"])
 
 class ObstacleDetector:
-    def __init__(self, model_path='../models/yolo/yolov8n.pt'):
-        """Initialize YOLOv8 detector"""
-        self.model = YOLO(model_path)
+    def __init__(self, model_path='../models/yolo/yolov8n.pt', confidence_threshold=0.5,
+                 backend="ultralytics", threads=None, input_size=640):
+        """
+        Initialize YOLOv8 detector
+        
+        Args:
+            backend: 'ultralytics', 'onnx', 'opencv' or an InferenceBackend instance
+            threads: CPU threads used by the backend
+            input_size: network input resolution
+        """
+        if isinstance(backend, InferenceBackend):
+            self.backend = backend
+        else:
+            self.backend = create_backend(backend, model_path, threads=threads, input_size=input_size,
+                                          conf_threshold=min(0.25, confidence_threshold))
         self.obstacle_classes = ['person', 'chair', 'table', 'bottle', 
                                 'cell phone', 'stairs', 'door']
+        self.confidence_threshold = confidence_threshold
+        
+        # Filter on integer class ids instead of comparing label strings
+        self.class_names = self.backend.names
+        self.obstacle_class_ids = np.array(
+            sorted(i for i, n in self.class_names.items() if n in self.obstacle_classes), dtype=np.int64)
+    
+    @classmethod
+    def from_config(cls, config, base_dir=None):
+        """
+        Create a detector from the config/settings.py values (a dict as
+        returned by utils.helpers.load_config or runpy.run_path).
+
+        Args:
+            base_dir: directory relative model paths are resolved against
+        """
+        backend = config.get('INFERENCE_BACKEND', 'ultralytics')
+        model_path = config.get('ONNX_MODEL') if backend != 'ultralytics' else config.get('YOLO_MODEL')
+        if base_dir is not None and model_path and not os.path.isabs(model_path):
+            model_path = os.path.join(base_dir, model_path)
+        return cls(model_path,
+                   confidence_threshold=config.get('CONFIDENCE_THRESHOLD', 0.5),
+                   backend=backend,
+                   threads=config.get('INFERENCE_THREADS'),
+                   input_size=config.get('INFERENCE_INPUT_SIZE', 640))
         
     def detect(self, image):
         """Detect obstacles in image"""
-        results = self.model(image)
-        detections = []
+        return self.detect_batch([image])[0]
+    
+    def detect_batch(self, frames):
+        """Detect obstacles in several frames with a single forward pass"""
+        frames = list(frames)
+        if not frames:
+            return []
+        outputs = self.backend.predict(frames)
+        return [self._filter_boxes(data, frame.shape) for frame, data in zip(frames, outputs)]
+    
+    def _filter_boxes(self, data, image_shape):
+        """
+        Vectorized post-filtering of raw boxes.
         
-        for result in results:
-            for box in result.boxes:
-                cls_id = int(box.cls[0])
-                confidence = float(box.conf[0])
-                bbox = box.xyxy[0].tolist()
-                label = self.model.names[cls_id]
-                
-                if label in self.obstacle_classes and confidence > 0.5:
-                    detections.append({
-                        'type': label,
-                        'confidence': confidence,
-                        'bbox': bbox,
-                        'position': self._get_position(bbox, image.shape)
-                    })
+        Args:
+            data: array of shape (N, 6) with x1, y1, x2, y2, confidence, class id;
+                tracked results carry a track id before the confidence (N, 7)
+        """
+        data = np.asarray(data, dtype=np.float32)
+        data = data.reshape(0, 6) if data.size == 0 else data.reshape(len(data), -1)
+        if data.shape[1] > 6:
+            data = np.concatenate([data[:, :4], data[:, -2:]], axis=1)
+        cls_ids = data[:, 5].astype(np.int64)
+        keep = np.isin(cls_ids, self.obstacle_class_ids) & (data[:, 4] > self.confidence_threshold)
+        data, cls_ids = data[keep], cls_ids[keep]
         
-        return detections
+        positions = self._get_positions(data[:, :4], image_shape)
+        return [
+            {
+                'type': self.class_names[cls_id],
+                'confidence': confidence,
+                'bbox': bbox,
+                'position': position
+            }
+            for bbox, confidence, cls_id, position in zip(
+                data[:, :4].tolist(), data[:, 4].tolist(), cls_ids.tolist(), positions.tolist())
+        ]
+    
+    def _get_positions(self, bboxes, image_shape):
+        """Vectorized LEFT/CENTER/RIGHT for an (N, 4) box array"""
+        x_center = (bboxes[:, 0] + bboxes[:, 2]) / 2
+        width = image_shape[1]
+        index = (x_center >= width / 3).astype(np.int64) + (x_center > 2 * width / 3)
+        return POSITIONS[index]
     
     def _get_position(self, bbox, image_shape):
         """Determine if object is left, center, or right"""
@@ -3,22 +3,21 @@ PRAGYAN-NETRA - Stair Detection Module
 Simulated stair detection
 """
 
-import cv2
-import numpy as np
+from vision.frame_features import FrameFeatures
 
 class StairDetector:
     def __init__(self):
         self.stair_patterns = []
         
-    def detect_stairs(self, image):
+    def detect_stairs(self, image, features=None):
         """Simulate stair detection"""
         # In real implementation, this would use edge detection
         # For now, simulate based on horizontal lines
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        edges = cv2.Canny(gray, 50, 150)
+        if features is None:
+            features = FrameFeatures(image)
         
         # Detect horizontal lines (potential stairs)
-        lines = cv2.HoughLinesP(edges, 1, np.pi/180, 50, minLineLength=100, maxLineGap=10)
+        lines = features.lines(min_line_length=100)
         
         stair_detected = False
         if lines is not None:
@@ -6,23 +6,26 @@ Detects surface changes, slopes, uneven terrain
 import cv2
 import numpy as np
 
+from vision.frame_features import FrameFeatures
+
 class SurfaceAnalyzer:
     def __init__(self):
         self.prev_frame = None
         
-    def analyze_surface(self, frame):
+    def analyze_surface(self, frame, features=None):
         """Analyze surface for changes and hazards"""
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        if features is None:
+            features = FrameFeatures(frame)
+        gray = features.gray
         
         # Edge detection for surface patterns
-        edges = cv2.Canny(gray, 50, 150)
+        edges = features.edges
         
         # Detect lines (potential surface patterns)
-        lines = cv2.HoughLinesP(edges, 1, np.pi/180, 50, 
-                               minLineLength=50, maxLineGap=10)
+        lines = features.lines(min_line_length=50)
         
         analysis = {
-            'surface_type': self._classify_surface(edges),
+            'surface_type': self._classify_surface(features),
             'hazards': self._detect_hazards(edges),
             'slope': self._estimate_slope(lines) if lines is not None else 0,
             'confidence': 0.7
@@ -31,9 +34,9 @@ class SurfaceAnalyzer:
         self.prev_frame = gray
         return analysis
     
-    def _classify_surface(self, edges):
+    def _classify_surface(self, features):
         """Classify surface type based on edge patterns"""
-        edge_density = np.sum(edges > 0) / edges.size
+        edge_density = features.edge_density()
         
         if edge_density > 0.3:
             return "ROUGH"
@@ -0,0 +1,253 @@
+"""
+PRAGYAN-NETRA - Audio Output Module
+Non-blocking mixer thread, cached tone synthesis and pluggable output sinks
+"""
+
+import threading
+import time
+import wave
+from collections import deque
+from functools import lru_cache
+
+import numpy as np
+
+SAMPLE_RATE = 22050
+
+
+@lru_cache(maxsize=64)
+def tone(frequency, duration_ms, sample_rate=SAMPLE_RATE, volume=0.5, fade_ms=5):
+    """Sine tone as read-only float32 PCM, with short fades to avoid clicks"""
+    n = int(sample_rate * duration_ms / 1000)
+    t = np.arange(n, dtype=np.float32) / sample_rate
+    pcm = (volume * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+    fade = min(int(sample_rate * fade_ms / 1000), n // 2)
+    if fade:
+        ramp = np.linspace(0.0, 1.0, fade, dtype=np.float32)
+        pcm[:fade] *= ramp
+        pcm[-fade:] *= ramp[::-1]
+    pcm.setflags(write=False)
+    return pcm
+
+
+def to_float(pcm):
+    """int16 or float PCM -> float32 in [-1, 1]"""
+    pcm = np.asarray(pcm)
+    if pcm.dtype == np.int16:
+        return pcm.astype(np.float32) / 32768.0
+    return pcm.astype(np.float32, copy=False)
+
+
+def resample(pcm, from_rate, to_rate):
+    """Linear-interpolation resample along the first axis"""
+    if from_rate == to_rate or len(pcm) == 0:
+        return pcm
+    n = int(round(len(pcm) * to_rate / from_rate))
+    positions = np.linspace(0, len(pcm) - 1, n)
+    if pcm.ndim == 1:
+        return np.interp(positions, np.arange(len(pcm)), pcm).astype(np.float32)
+    return np.stack([np.interp(positions, np.arange(len(pcm)), pcm[:, c])
+                     for c in range(pcm.shape[1])], axis=1).astype(np.float32)
+
+
+class NullSink:
+    """
+    Discards audio; counts what would have been played (tests, headless).
+
+    Args:
+        keep: store written blocks for inspection
+        realtime: sleep for each block's duration, emulating a device clock
+    """
+
+    audible = False
+
+    def __init__(self, sample_rate=SAMPLE_RATE, channels=1, keep=False, realtime=False):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.keep = keep
+        self.realtime = realtime
+        self.blocks = []
+        self.frames_written = 0
+
+    def write(self, block):
+        self.frames_written += len(block)
+        if self.keep:
+            self.blocks.append(block.copy())
+        if self.realtime:
+            time.sleep(len(block) / self.sample_rate)
+
+    def output(self):
+        """Everything written so far as one array (keep=True only)"""
+        if not self.blocks:
+            return np.zeros((0, self.channels), dtype=np.float32)
+        return np.concatenate(self.blocks)
+
+    def close(self):
+        pass
+
+
+class WavFileSink:
+    """Writes the mixed output to a 16-bit WAV file"""
+
+    audible = False
+
+    def __init__(self, path, sample_rate=SAMPLE_RATE, channels=1):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self._wav = wave.open(path, 'wb')
+        self._wav.setnchannels(channels)
+        self._wav.setsampwidth(2)
+        self._wav.setframerate(sample_rate)
+
+    def write(self, block):
+        self._wav.writeframes((np.clip(block, -1, 1) * 32767).astype(np.int16).tobytes())
+
+    def close(self):
+        self._wav.close()
+
+
+class SoundDeviceSink:
+    """Plays through the default output device (requires sounddevice)"""
+
+    audible = True
+
+    def __init__(self, sample_rate=SAMPLE_RATE, channels=1, block_size=512):
+        import sounddevice as sd
+
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.stream = sd.OutputStream(samplerate=sample_rate, channels=channels,
+                                      dtype='float32', blocksize=block_size)
+        self.stream.start()
+
+    def write(self, block):
+        # Blocks only the mixer thread, pacing it to the device clock
+        self.stream.write(block)
+
+    def close(self):
+        self.stream.stop()
+        self.stream.close()
+
+
+def default_sink(sample_rate=SAMPLE_RATE, channels=1):
+    """Sound device if available, otherwise a null sink"""
+    try:
+        return SoundDeviceSink(sample_rate, channels)
+    except Exception:
+        return NullSink(sample_rate, channels)
+
+
+class AudioMixer:
+    """
+    Single mixer thread fed by a queue of PCM buffers.
+
+    play() and beep() only append to a deque and never block the caller.
+    The mixer sums all active cues block by block, so overlapping alerts
+    are heard together instead of queueing behind each other.
+
+    Args:
+        sink: NullSink, WavFileSink, SoundDeviceSink or any object with
+            write(block) and close()
+        block_size: frames mixed per sink write
+    """
+
+    def __init__(self, sink=None, block_size=512):
+        self.sink = sink if sink is not None else NullSink()
+        self.sample_rate = self.sink.sample_rate
+        self.channels = self.sink.channels
+        self.block_size = block_size
+        self._incoming = deque()
+        self._cancelled = deque()
+        self._wake = threading.Event()
+        self._voices = []
+        self._thread = None
+        self.running = False
+
+        self.cues_played = 0
+        self.blocks_mixed = 0
+        self.max_overlap = 0
+
+    @property
+    def audible(self):
+        return getattr(self.sink, 'audible', False)
+
+    def start(self):
+        self.running = True
+        self._thread = threading.Thread(target=self._mix_loop, name="audio", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=2):
+        self.running = False
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+        self.sink.close()
+
+    def play(self, pcm, sample_rate=None, volume=1.0):
+        """Queue mono (N,) or multi-channel (N, C) PCM, int16 or float; returns the cue"""
+        pcm = to_float(pcm)
+        if sample_rate is not None:
+            pcm = resample(pcm, sample_rate, self.sample_rate)
+        if volume != 1.0:
+            pcm = pcm * volume
+        # deque.append is atomic, so callers never wait on the mixer
+        self._incoming.append(pcm)
+        self._wake.set()
+        return pcm
+
+    def cancel(self, cue):
+        """Stop a cue returned by play(), whether or not it has started"""
+        self._cancelled.append(cue)
+        self._wake.set()
+
+    def beep(self, frequency, duration_ms, volume=0.5):
+        """Non-blocking warning tone"""
+        self.play(tone(frequency, duration_ms, self.sample_rate, volume))
+
+    def busy(self):
+        return bool(self._incoming or self._voices)
+
+    def wait_idle(self, timeout=5):
+        """Block until every queued cue has been written to the sink"""
+        deadline = time.monotonic() + timeout
+        while self.busy() and time.monotonic() < deadline:
+            time.sleep(0.005)
+        return not self.busy()
+
+    def _mix_loop(self):
+        while self.running:
+            while self._incoming:
+                # Append before popping so busy() never sees the cue in neither place
+                self._voices.append([self._incoming[0], 0])
+                self._incoming.popleft()
+                self.cues_played += 1
+            while self._cancelled:
+                cue = self._cancelled.popleft()
+                self._voices = [voice for voice in self._voices if voice[0] is not cue]
+            if not self._voices:
+                self._wake.wait(0.1)
+                self._wake.clear()
+                continue
+            block, remaining = self._mix_block()
+            self.sink.write(block)
+            self._voices = remaining
+
+    def _mix_block(self):
+        out = np.zeros((self.block_size, self.channels), dtype=np.float32)
+        self.max_overlap = max(self.max_overlap, len(self._voices))
+        remaining = []
+        for voice in self._voices:
+            pcm, pos = voice
+            chunk = pcm[pos:pos + self.block_size]
+            if chunk.ndim == 2 and chunk.shape[1] != self.channels:
+                chunk = chunk.mean(axis=1)  # downmix, e.g. spatial cues on a mono sink
+            if chunk.ndim == 1:
+                out[:len(chunk)] += chunk[:, None]
+            else:
+                out[:len(chunk)] += chunk
+            voice[1] = pos + len(chunk)
+            if voice[1] < len(pcm):
+                remaining.append(voice)
+        self.blocks_mixed += 1
+        np.clip(out, -1.0, 1.0, out=out)
+        return out, remaining
@@ -0,0 +1,250 @@
+"""
+PRAGYAN-NETRA - Voice Intents Module
+Offline command grammar, streaming trie/fuzzy matching and intent dispatch
+"""
+
+import difflib
+import json
+import time
+import wave
+from collections import namedtuple
+
+IntentMatch = namedtuple('IntentMatch', ['name', 'slots', 'text', 'partial'])
+
+# Filler words that may precede or separate command words
+FILLER = {"please", "netra", "hey", "can", "you", "the", "a"}
+
+
+def tokenize(text):
+    return [w for w in text.lower().replace("'", " ").split() if w]
+
+
+class IntentEngine:
+    """
+    Maps (partial) transcripts to registered intents.
+
+    Phrases are stored word by word in a trie. A phrase may contain one
+    {slot} placeholder, expanded against the slot's known values, e.g.
+    "where is my {item}" with the names from ObjectMemory. Slot values may
+    be given as a callable; refresh() re-reads it and rebuilds the trie when
+    its values change, so newly added objects are recognized. It runs once
+    per utterance - from grammar() at every wake, from handle() and
+    recognize_wav() - never per streamed partial. Words not in the vocabulary are snapped to the closest
+    known word, so small recognition errors still match.
+    """
+
+    def __init__(self, fuzzy_cutoff=0.75):
+        self.fuzzy_cutoff = fuzzy_cutoff
+        self.intents = {}
+        self._phrases = {}
+        self._slot_values = {}
+        self._trie = {}
+        self._vocab = set()
+
+    def register(self, name, phrases, handler, slots=None):
+        """
+        Args:
+            phrases: trigger phrases, optionally with '{slot}' placeholders
+            handler: called as handler(**slot_values) when the intent fires
+            slots: {slot name: [values] or callable returning them} used to
+                expand placeholders
+        """
+        self.intents[name] = handler
+        self._phrases[name] = (phrases, slots or {})
+        self._slot_values[name] = self._read_slots(slots or {})
+        self._add(name)
+
+    @staticmethod
+    def _read_slots(slots):
+        return {slot: tuple(values() if callable(values) else values) for slot, values in slots.items()}
+
+    def _add(self, name, trie=None, vocab=None):
+        trie = self._trie if trie is None else trie
+        vocab = self._vocab if vocab is None else vocab
+        for phrase in self._phrases[name][0]:
+            for words, values in self._expand(tokenize(phrase), self._slot_values[name]):
+                node = trie
+                for word in words:
+                    node = node.setdefault(word, {})
+                    vocab.add(word)
+                node[None] = (name, values)
+
+    def refresh(self):
+        """Rebuild the trie if any callable slot changed its values; True if rebuilt"""
+        changed = False
+        for name, (_, slots) in self._phrases.items():
+            if any(callable(values) for values in slots.values()):
+                values = self._read_slots(slots)
+                if values != self._slot_values[name]:
+                    self._slot_values[name] = values
+                    changed = True
+        if changed:
+            trie, vocab = {}, set()
+            for name in self._phrases:
+                self._add(name, trie, vocab)
+            self._trie, self._vocab = trie, vocab
+        return changed
+
+    @staticmethod
+    def _expand(words, slots):
+        expansions = [([], {})]
+        for word in words:
+            if word.startswith('{') and word.endswith('}'):
+                slot = word[1:-1]
+                expansions = [(w + tokenize(value), dict(v, **{slot: value}))
+                              for w, v in expansions for value in slots.get(slot, [])]
+            else:
+                expansions = [(w + [word], v) for w, v in expansions]
+        return expansions
+
+    def grammar(self):
+        """Vosk grammar (JSON list) restricted to the registered vocabulary"""
+        self.refresh()
+        return json.dumps(sorted(self._vocab | FILLER) + ["[unk]"])
+
+    def _snap(self, word):
+        if word in self._vocab or word in FILLER:
+            return word
+        close = difflib.get_close_matches(word, self._vocab, n=1, cutoff=self.fuzzy_cutoff)
+        return close[0] if close else word
+
+    def match(self, text, partial=False):
+        """
+        Best intent for a transcript, or None.
+
+        For partial transcripts only unambiguous matches are returned: the
+        phrase must be complete and no longer registered phrase may extend
+        it, so "stop" does not fire while "stop navigation" could follow.
+        Slot values are as of the last refresh().
+        """
+        words = [self._snap(w) for w in tokenize(text)]
+        best = None
+        for start in range(len(words)):
+            node, i = self._trie, start
+            while i < len(words):
+                word = words[i]
+                if word in node:
+                    node = node[word]
+                    i += 1
+                    if None in node and (best is None or i - start > best[0]):
+                        ambiguous = len(node) > 1
+                        best = (i - start, node[None], ambiguous and partial)
+                elif word in FILLER and node is not self._trie:
+                    i += 1
+                else:
+                    break
+        if best is None or best[2]:
+            return None
+        name, slots = best[1]
+        return IntentMatch(name, slots, text, partial)
+
+    def dispatch(self, match):
+        """Run the handler of a match and return its result"""
+        return self.intents[match.name](**match.slots)
+
+    def handle(self, text, partial=False):
+        """Refresh, match and dispatch in one step; None if nothing matched"""
+        self.refresh()
+        match = self.match(text, partial)
+        return None if match is None else self.dispatch(match)
+
+
+def build_default_intents(speak, object_memory=None, context=None, on_emergency=None,
+                          on_status=None, on_navigation=None, routes=None):
+    """
+    IntentEngine with the commands listed by VoiceListener.get_voice_commands
+    plus status, find-object and take-me-to.
+
+    Args:
+        speak: callable(text, priority) used for spoken answers
+        object_memory: ObjectMemory for "where is my ..." queries
+        context: ContextManager for "where am i" (and the route origin)
+        routes: RouteGraph for "take me to ..." queries
+    """
+    engine = IntentEngine()
+
+    def emergency():
+        speak("Emergency alert activated. Alerting caregivers.", "emergency")
+        if on_emergency:
+            on_emergency()
+        return "emergency"
+
+    def status():
+        speak(on_status() if on_status else "All systems nominal.", "info")
+        return "status"
+
+    def where_am_i():
+        location = context.get_context_summary()['location'] if context else "UNKNOWN"
+        speak("Location unknown." if location == "UNKNOWN" else f"You are at {location.lower()}.", "info")
+        return location
+
+    def find_object(item):
+        found = object_memory.find_object(item) if object_memory else None
+        if found is None:
+            speak(f"I don't remember where your {item} is.", "info")
+        else:
+            speak(f"Your {item} is at {found['location']}.", "info")
+        return found
+
+    def navigation(active=True):
+        speak("Starting navigation assistance." if active else "Navigation stopped.", "info")
+        if on_navigation:
+            on_navigation(active)
+        return active
+
+    def take_me_to(place):
+        origin = context.get_context_summary()['location'] if context else "UNKNOWN"
+        route = routes.route(origin, place)
+        if route is None:
+            speak(f"I don't know the way to {place} from here.", "info")
+        else:
+            speak(f"Route to {route['places'][-1]}, {route['distance']:.0f} meters. "
+                  + ". ".join(route['steps'][:1]), "info")
+        return route
+
+    def show_help():
+        speak("Say start navigation, stop, where am I, where is my, status, or emergency.", "info")
+        return "help"
+
+    engine.register("emergency", ["emergency", "help me", "call for help"], emergency)
+    engine.register("status", ["status", "system status"], status)
+    engine.register("where_am_i", ["where am i"], where_am_i)
+    engine.register("start_navigation", ["start navigation", "navigate"], lambda: navigation(True))
+    engine.register("stop", ["stop", "stop navigation"], lambda: navigation(False))
+    engine.register("help", ["help", "what can you do"], show_help)
+    if object_memory is not None:
+        # Re-read on every refresh: objects added later are recognized too
+        engine.register("find_object", ["where is my {item}", "find my {item}"], find_object,
+                        slots={'item': lambda: list(object_memory.get_all_objects())})
+    if routes is not None:
+        engine.register("take_me_to", ["take me to {place}", "navigate to {place}", "go to {place}"],
+                        take_me_to, slots={'place': lambda: list(routes.places)})
+    return engine
+
+
+def recognize_wav(recognizer, engine, path, chunk_size=1600):
+    """
+    Stream a 16-bit mono WAV through a recognizer and the intent matcher.
+
+    Returns:
+        (IntentMatch or None, audio seconds until the match, decoder CPU seconds)
+    """
+    engine.refresh()
+    with wave.open(path, 'rb') as wav:
+        rate = wav.getframerate()
+        samples, cpu = 0, 0.0
+        while True:
+            data = wav.readframes(chunk_size)
+            if not data:
+                break
+            samples += len(data) // 2
+            start = time.thread_time()
+            final = recognizer.AcceptWaveform(data)
+            result = json.loads(recognizer.Result() if final else recognizer.PartialResult())
+            cpu += time.thread_time() - start
+            text = result.get('text', result.get('partial', ''))
+            match = engine.match(text, partial=not final) if text else None
+            if match is not None:
+                return match, samples / rate, cpu
+    final = json.loads(recognizer.FinalResult()).get('text', '')
+    return engine.match(final), samples / rate, cpu
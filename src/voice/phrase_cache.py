@@ -0,0 +1,238 @@
+"""
+PRAGYAN-NETRA - Phrase Cache Module
+Pre-synthesized PCM fragments assembled into alerts without live TTS
+"""
+
+import os
+import tempfile
+import threading
+import wave
+from collections import OrderedDict
+
+import numpy as np
+
+POSITIONS = ["left", "center", "right", "front"]
+# "ahead" stands in for the distance of moderate-range alerts
+DISTANCES = ["very close", "close", "moderate", "far", "ahead"]
+
+# Alert templates, split into the fragments they are assembled from
+ALERT_TEMPLATES = {
+    "emergency": ["Emergency!", "{obj}", "very close on your", "{position}"],
+    "warning": ["Warning!", "{obj}", "{distance}", "on your", "{position}"],
+    "info": ["{obj}", "detected", "{distance}", "on your", "{position}"]
+}
+
+
+def alert_fragments(obj, position, distance, level="warning"):
+    """Fragments of a templated hazard alert, e.g. ['Warning!', 'chair', 'close', 'on your', 'left']"""
+    values = {'obj': obj.lower(), 'position': position.lower(),
+              'distance': distance.lower().replace('_', ' ')}
+    return [part.format(**values) for part in ALERT_TEMPLATES[level]]
+
+
+def template_fragments(objects=()):
+    """
+    Every fixed fragment worth pre-rendering: template words, positions,
+    distances and object names - the parts alert_fragments() is built from.
+    """
+    fragments = []
+    for parts in ALERT_TEMPLATES.values():
+        fragments += [p for p in parts if '{' not in p]
+    fragments += POSITIONS + DISTANCES + [obj.lower() for obj in objects]
+    return list(dict.fromkeys(fragments))
+
+
+def read_wav(path):
+    """Mono int16 PCM and sample rate of a 16-bit WAV file"""
+    with wave.open(path, 'rb') as wav:
+        channels = wav.getnchannels()
+        if wav.getsampwidth() != 2:
+            raise ValueError(f"{path}: expected 16-bit PCM")
+        rate = wav.getframerate()
+        pcm = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+    if channels > 1:
+        pcm = pcm.reshape(-1, channels).mean(axis=1).astype(np.int16)
+    return pcm, rate
+
+
+class Pyttsx3Renderer:
+    """
+    Renders text to PCM through pyttsx3's save_to_file.
+
+    Rendering runs on the EngineThread that owns the engine, so it never
+    overlaps live speech from a SpeechScheduler sharing that engine.
+    """
+
+    def __init__(self, engine_thread, tmp_dir=None):
+        self.engine_thread = engine_thread
+        self.tmp_dir = tmp_dir or tempfile.mkdtemp(prefix="netra_tts_")
+
+    def __call__(self, text):
+        return self.engine_thread.call(self._render, text)
+
+    def _render(self, engine, text):
+        path = os.path.join(self.tmp_dir, "fragment.wav")
+        engine.save_to_file(text, path)
+        engine.runAndWait()
+        pcm, rate = read_wav(path)
+        os.remove(path)
+        return pcm, rate
+
+
+class PhraseCache:
+    """
+    LRU cache of synthesized fragments bounded by a byte budget.
+
+    Alerts are assembled by concatenating cached fragment buffers with a
+    short pause between them, so only never-seen fragments cost a synthesis.
+
+    Args:
+        renderer: callable text -> (int16 pcm, sample_rate)
+        max_bytes: total PCM kept in memory before least-recently-used
+            fragments are evicted
+        gap_ms: silence inserted between fragments
+    """
+
+    def __init__(self, renderer, max_bytes=16 * 1024 * 1024, gap_ms=60):
+        self.renderer = renderer
+        self.max_bytes = max_bytes
+        self.gap_ms = gap_ms
+        self.sample_rate = None
+        self._clips = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, fragment):
+        return fragment in self._clips
+
+    def __len__(self):
+        return len(self._clips)
+
+    def get(self, fragment):
+        """PCM for one fragment, rendering it on first use"""
+        with self._lock:
+            pcm = self._clips.get(fragment)
+            if pcm is not None:
+                self._clips.move_to_end(fragment)
+                self.hits += 1
+                return pcm
+            self.misses += 1
+
+        pcm, rate = self.renderer(fragment)
+        pcm = np.ascontiguousarray(pcm, dtype=np.int16)
+        with self._lock:
+            if self.sample_rate is None:
+                self.sample_rate = rate
+            elif rate != self.sample_rate:
+                raise ValueError(f"Fragment '{fragment}' rendered at {rate} Hz, cache is {self.sample_rate} Hz")
+            if fragment not in self._clips:
+                self._clips[fragment] = pcm
+                self.bytes += pcm.nbytes
+                self._evict()
+        return pcm
+
+    def _evict(self):
+        while self.bytes > self.max_bytes and len(self._clips) > 1:
+            _, pcm = self._clips.popitem(last=False)
+            self.bytes -= pcm.nbytes
+            self.evictions += 1
+
+    def prewarm(self, fragments):
+        """Render fragments ahead of time (call from a background thread at startup)"""
+        for fragment in fragments:
+            self.get(fragment)
+        return len(self._clips)
+
+    def cached(self, fragments):
+        """Assembled alert if every fragment is cached, else None; never synthesizes"""
+        with self._lock:
+            if not all(f in self._clips for f in fragments if f):
+                return None
+        return self.assemble(fragments)
+
+    def assemble(self, fragments):
+        """One int16 buffer for the whole alert"""
+        clips = [self.get(f) for f in fragments if f]
+        if not clips:
+            return np.zeros(0, dtype=np.int16)
+        gap = np.zeros(int(self.sample_rate * self.gap_ms / 1000), dtype=np.int16)
+        parts = []
+        for clip in clips:
+            parts += [clip, gap]
+        return np.concatenate(parts[:-1])
+
+    def stats(self):
+        return {
+            'fragments': len(self._clips),
+            'bytes': self.bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions
+        }
+
+
+class PhraseBackend:
+    """
+    SpeechScheduler backend that plays cached alerts and speaks the rest.
+
+    A message registered with its fragments is played from the phrase cache
+    on the mixer when every fragment is already rendered. Otherwise it is
+    spoken live and its missing fragments are rendered in the background
+    for next time. Cached alerts thus go through the scheduler like live
+    speech: same priority order, preemption and coalescing, never on top
+    of each other.
+
+    Args:
+        tts: EngineThread (or any backend with speak/stop) for live speech
+        mixer: started AudioMixer the cached alerts are played on
+        phrases: PhraseCache
+        max_messages: registered messages remembered, least recent dropped
+    """
+
+    def __init__(self, tts, mixer, phrases, max_messages=256):
+        self.tts = tts
+        self.mixer = mixer
+        self.phrases = phrases
+        self.max_messages = max_messages
+        self._fragments = OrderedDict()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._rendering = None
+
+    def register(self, text, fragments):
+        """Let later speak(text) calls use the cached fragments of the message"""
+        with self._lock:
+            self._fragments[text] = list(fragments)
+            self._fragments.move_to_end(text)
+            while len(self._fragments) > self.max_messages:
+                self._fragments.popitem(last=False)
+
+    def speak(self, text):
+        with self._lock:
+            fragments = self._fragments.get(text)
+        pcm = self.phrases.cached(fragments) if fragments else None
+        if pcm is None:
+            if fragments:
+                self.render_async(fragments)
+            return self.tts.speak(text)
+
+        self._stop.clear()
+        cue = self.mixer.play(pcm, self.phrases.sample_rate)
+        if self._stop.wait(len(pcm) / self.phrases.sample_rate):
+            self.mixer.cancel(cue)
+
+    def stop(self):
+        self._stop.set()
+        self.tts.stop()
+
+    def render_async(self, fragments):
+        """Render uncached fragments on a background thread, one batch at a time"""
+        missing = [f for f in fragments if f and f not in self.phrases]
+        if missing and (self._rendering is None or not self._rendering.is_alive()):
+            self._rendering = threading.Thread(target=self.phrases.prewarm, args=(missing,),
+                                               name="phrase-render", daemon=True)
+            self._rendering.start()
+        return self._rendering
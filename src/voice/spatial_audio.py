@@ -0,0 +1,172 @@
+"""
+PRAGYAN-NETRA - Spatial Audio Module
+Binaural obstacle cues from detection azimuth and distance
+"""
+
+from collections import namedtuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from voice.audio_output import SAMPLE_RATE, WavFileSink
+
+SPEED_OF_SOUND = 343.0
+HEAD_RADIUS = 0.0875
+
+# Pulse rate (Hz) by distance class, closer objects pulse faster
+PULSE_RATES = {"VERY_CLOSE": 8.0, "CLOSE": 5.0, "MODERATE": 3.0, "FAR": 1.5}
+# Box/image area ratio above which a detection is in each class (as utils.helpers.calculate_distance)
+DISTANCE_THRESHOLDS = [(0.3, "VERY_CLOSE"), (0.15, "CLOSE"), (0.05, "MODERATE")]
+# Typical box/image area ratio per class, used when a detection has no bbox
+DISTANCE_RATIOS = {"VERY_CLOSE": 0.35, "CLOSE": 0.2, "MODERATE": 0.1, "FAR": 0.03}
+POSITION_AZIMUTHS = {"LEFT": -30.0, "CENTER": 0.0, "RIGHT": 30.0}
+CUE_FREQUENCIES = {
+    'person': 440.0, 'chair': 523.3, 'table': 587.3, 'door': 659.3,
+    'stairs': 349.2, 'bottle': 784.0, 'cell phone': 880.0
+}
+
+SpatialCue = namedtuple('SpatialCue', ['azimuth', 'distance', 'ratio', 'frequency'])
+
+
+def bbox_azimuth(bbox, image_width, hfov=60.0):
+    """Horizontal angle of the bbox centre in degrees, negative = left"""
+    x_center = (bbox[0] + bbox[2]) / 2
+    return (x_center / image_width - 0.5) * hfov
+
+
+def bbox_distance(bbox, image_shape):
+    """Distance class and box/image area ratio of a bbox"""
+    x1, y1, x2, y2 = bbox
+    ratio = (x2 - x1) * (y2 - y1) / (image_shape[0] * image_shape[1])
+    for threshold, distance in DISTANCE_THRESHOLDS:
+        if ratio > threshold:
+            return distance, ratio
+    return "FAR", ratio
+
+
+def detection_cues(detections, image_shape, hfov=60.0, distance_fn=bbox_distance):
+    """
+    SpatialCues for detector output.
+
+    Detections with a 'bbox' get a continuous azimuth and a distance from
+    distance_fn; others fall back to their 'position'/'region' and
+    'distance' labels.
+    """
+    cues = []
+    for det in detections:
+        frequency = CUE_FREQUENCIES.get(det.get('type', '').lower(), 698.5)
+        if 'bbox' in det:
+            azimuth = bbox_azimuth(det['bbox'], image_shape[1], hfov)
+            distance, ratio = distance_fn(det['bbox'], image_shape)
+        else:
+            position = det.get('position', det.get('region', 'CENTER')).upper()
+            azimuth = POSITION_AZIMUTHS.get(position, 0.0)
+            distance = det.get('distance', 'FAR').upper().replace(' ', '_')
+            ratio = DISTANCE_RATIOS.get(distance, 0.03)
+        cues.append(SpatialCue(azimuth, distance, ratio, frequency))
+    return cues
+
+
+class BinauralRenderer:
+    """
+    Renders many pulsed tone sources to stereo in fixed-size blocks.
+
+    Each source is placed with a per-ear FIR looked up from a table built
+    once per azimuth step: a windowed-sinc low-pass whose fractional delay
+    gives the interaural time difference (Woodworth model) and whose gain
+    and cutoff give the interaural level difference and head shadow of the
+    far ear. A block for all sources is one vectorized synthesis plus one
+    einsum over sliding windows.
+
+    Args:
+        block_size: frames per rendered block
+        azimuth_step: table resolution in degrees over [-90, 90]
+        taps: FIR length per ear
+    """
+
+    def __init__(self, sample_rate=SAMPLE_RATE, block_size=256, azimuth_step=5.0, taps=32,
+                 pulse_duty=0.35):
+        self.sample_rate = sample_rate
+        self.block_size = block_size
+        self.azimuth_step = azimuth_step
+        self.taps = taps
+        self.pulse_duty = pulse_duty
+        self.azimuths = np.arange(-90.0, 90.0 + azimuth_step / 2, azimuth_step)
+        # Stored time-reversed so the einsum below is a convolution
+        self.filters = self._build_filters()[:, :, ::-1].copy()
+
+        self._frame = 0
+        self._history = None
+        self.set_cues([])
+
+    def _build_filters(self):
+        """(azimuths, 2 ears, taps) FIR table"""
+        theta = np.radians(np.abs(self.azimuths))
+        itd = HEAD_RADIUS / SPEED_OF_SOUND * (theta + np.sin(theta)) * self.sample_rate
+        shadow = np.sin(theta)
+        far_gain = 10 ** (-10.0 * shadow / 20)          # up to 10 dB quieter
+        far_cutoff = 0.5 * (1 - 0.7 * shadow)            # cycles/sample
+
+        n = np.arange(self.taps)
+        center = (self.taps - 1) / 2 - itd.max() / 2
+        window = np.hanning(self.taps)
+
+        def fir(delay, cutoff, gain):
+            h = 2 * cutoff[:, None] * np.sinc(2 * cutoff[:, None] * (n - center - delay[:, None])) * window
+            return gain[:, None] * h / h.sum(axis=1, keepdims=True)
+
+        near = fir(np.zeros_like(itd), np.full_like(itd, 0.5), np.ones_like(itd))
+        far = fir(itd, far_cutoff, far_gain)
+        right_near = self.azimuths >= 0
+        left = np.where(right_near[:, None], far, near)
+        right = np.where(right_near[:, None], near, far)
+        return np.stack([left, right], axis=1).astype(np.float32)
+
+    def azimuth_index(self, azimuth):
+        azimuth = np.clip(np.asarray(azimuth, dtype=np.float64), -90.0, 90.0)
+        return np.rint((azimuth + 90.0) / self.azimuth_step).astype(np.int64)
+
+    def set_cues(self, cues):
+        """Replace the active sources (typically once per detection frame)"""
+        count = len(cues)
+        self._index = self.azimuth_index([c.azimuth for c in cues])
+        self._frequency = np.array([c.frequency for c in cues], dtype=np.float64)
+        self._rate = np.array([PULSE_RATES.get(c.distance, 1.5) for c in cues], dtype=np.float64)
+        self._gain = np.clip(np.sqrt(np.array([c.ratio for c in cues], dtype=np.float64) / 0.3), 0.2, 1.0)
+        if self._history is None or len(self._history) != count:
+            self._history = np.zeros((count, self.taps - 1), dtype=np.float32)
+
+    def render_block(self):
+        """Next (block_size, 2) float32 block of all active sources"""
+        t = (self._frame + np.arange(self.block_size)) / self.sample_rate
+        self._frame += self.block_size
+        if not len(self._index):
+            return np.zeros((self.block_size, 2), dtype=np.float32)
+
+        # Raised-cosine pulses of a sine carrier, one row per source
+        cycle = (t[None, :] * self._rate[:, None]) % 1.0 / self.pulse_duty
+        envelope = np.where(cycle < 1.0, 0.5 - 0.5 * np.cos(2 * np.pi * cycle), 0.0)
+        mono = (self._gain[:, None] * envelope *
+                np.sin(2 * np.pi * self._frequency[:, None] * t[None, :])).astype(np.float32)
+
+        signal = np.concatenate([self._history, mono], axis=1)
+        self._history = signal[:, -(self.taps - 1):]
+        windows = sliding_window_view(signal, self.taps, axis=1)   # (sources, block, taps)
+        out = np.einsum('sbt,sct->bc', windows, self.filters[self._index], optimize=True)
+        out *= 0.5 / max(1.0, np.sqrt(len(self._index)))
+        return np.clip(out, -1.0, 1.0, out=out)
+
+    def render(self, cues, seconds):
+        """Stereo buffer of the given cues, e.g. for AudioMixer.play"""
+        self.set_cues(cues)
+        blocks = int(np.ceil(seconds * self.sample_rate / self.block_size))
+        return np.concatenate([self.render_block() for _ in range(blocks)])
+
+    def render_to_wav(self, path, cues, seconds):
+        """Offline rendering to a stereo WAV file"""
+        sink = WavFileSink(path, self.sample_rate, channels=2)
+        self.set_cues(cues)
+        for _ in range(int(np.ceil(seconds * self.sample_rate / self.block_size))):
+            sink.write(self.render_block())
+        sink.close()
+        return path
@@ -0,0 +1,249 @@
+"""
+PRAGYAN-NETRA - Speech Scheduler Module
+Blocking priority queue for spoken feedback with preemption and coalescing
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# Lower value = more urgent, same levels as VoiceAssistant.speak
+PRIORITIES = {
+    "emergency": 0,
+    "warning": 1,
+    "info": 2,
+    "success": 2,
+    "normal": 2
+}
+
+
+class Pyttsx3Backend:
+    """Speaks through a pyttsx3 engine"""
+
+    def __init__(self, engine=None, rate=160, volume=1.0):
+        if engine is None:
+            import pyttsx3
+            engine = pyttsx3.init()
+            engine.setProperty('rate', rate)
+            engine.setProperty('volume', volume)
+        self.engine = engine
+
+    def speak(self, text):
+        self.engine.say(text)
+        self.engine.runAndWait()
+
+    def stop(self):
+        self.engine.stop()
+
+
+def _pyttsx3_engine():
+    import pyttsx3
+    return pyttsx3.init()
+
+
+def _say(engine, text):
+    engine.say(text)
+    engine.runAndWait()
+
+
+class EngineThread:
+    """
+    Owns a pyttsx3 engine on one dedicated thread.
+
+    pyttsx3 drivers (SAPI5/COM on Windows) must be driven by the thread that
+    created the engine, and only one runAndWait() loop may run at a time.
+    The engine is therefore created on this thread, and every use of it -
+    live speech, rendering phrases to files - is submitted with call() and
+    runs there, one at a time. speak()/stop() make it a SpeechScheduler
+    backend; stop() is the only call made from other threads, to interrupt.
+    """
+
+    def __init__(self, factory=None):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts-engine")
+        self.engine = self._executor.submit(factory or _pyttsx3_engine).result()
+
+    def call(self, fn, *args):
+        """Run fn(engine, *args) on the engine thread and return its result"""
+        return self._executor.submit(fn, self.engine, *args).result()
+
+    def speak(self, text):
+        self.call(_say, text)
+
+    def stop(self):
+        self.engine.stop()
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+
+class FakeTTSBackend:
+    """Test backend that records utterances instead of speaking them"""
+
+    def __init__(self, seconds_per_char=0.0):
+        self.seconds_per_char = seconds_per_char
+        self.spoken = []
+        self.interrupted = []
+        self._stop = threading.Event()
+
+    def speak(self, text):
+        self._stop.clear()
+        if self._stop.wait(self.seconds_per_char * len(text)):
+            self.interrupted.append(text)
+        else:
+            self.spoken.append(text)
+
+    def stop(self):
+        self._stop.set()
+
+
+class SpeechScheduler:
+    """
+    Speaks queued messages most-urgent first on a single worker thread.
+
+    - The worker blocks on a condition variable instead of polling.
+    - An emergency message interrupts a less urgent utterance in progress;
+      the interrupted message is queued again behind it.
+    - A message identical to one already pending is coalesced into it.
+    - Info messages older than info_ttl seconds are dropped as stale.
+
+    The worker runs either in its own thread (start) or in the caller's
+    thread (run), e.g. when the TTS engine must be driven by the thread that
+    created it.
+    """
+
+    def __init__(self, backend=None, info_ttl=4.0, max_samples=1000):
+        self.backend = backend
+        self.info_ttl = info_ttl
+        self._heap = []
+        self._pending = {}
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+        self._current = None
+        self._interrupted = False
+        self._thread = None
+        self.running = True
+
+        self.latencies = {name: deque(maxlen=max_samples) for name in ("emergency", "warning", "info")}
+        self.dropped = 0
+        self.coalesced = 0
+        self.preempted = 0
+
+    def start(self):
+        """Run the worker in a background thread"""
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=2):
+        with self._cond:
+            self.running = False
+            self._cond.notify_all()
+        if self._current is not None:
+            self.backend.stop()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+
+    def say(self, text, priority="info", ttl="default"):
+        """
+        Queue a message without blocking the caller
+
+        Args:
+            ttl: seconds after which an unspoken info message is dropped;
+                None keeps it until spoken
+        """
+        level = PRIORITIES.get(priority, PRIORITIES["info"])
+        if ttl == "default":
+            ttl = self.info_ttl if level == PRIORITIES["info"] else None
+        with self._cond:
+            if text in self._pending:
+                self.coalesced += 1
+                # Keep the more urgent priority of the two
+                if level >= self._pending[text][0]:
+                    return
+                self._pending[text][3] = None  # invalidate the old entry
+            self._push(level, time.monotonic(), text, ttl)
+
+            current = self._current
+            if current is not None and level == 0 and current[0] > 0 and not self._interrupted:
+                self.preempted += 1
+                self._interrupted = True
+                self.backend.stop()
+
+    # Queue-compatible alias so the scheduler can replace a speech_queue
+    put = say
+
+    def pending(self):
+        with self._cond:
+            return len(self._pending)
+
+    def wait_idle(self, timeout=5):
+        """Block until nothing is pending or speaking (used by tests and shutdown)"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._cond:
+                if not self._pending and self._current is None:
+                    return True
+            time.sleep(0.01)
+        return False
+
+    def _push(self, level, queued_at, text, ttl, retry=False):
+        entry = [level, next(self._counter), queued_at, text, ttl, retry]
+        self._pending[text] = entry
+        heapq.heappush(self._heap, entry)
+        self._cond.notify()
+
+    def _next(self):
+        with self._cond:
+            while self.running:
+                while self._heap:
+                    level, _, queued_at, text, ttl, retry = heapq.heappop(self._heap)
+                    if text is None:
+                        continue
+                    del self._pending[text]
+                    if ttl is not None and time.monotonic() - queued_at > ttl:
+                        self.dropped += 1
+                        continue
+                    self._current = (level, queued_at, text, ttl)
+                    return level, queued_at, text, retry
+                self._cond.wait()
+            return None
+
+    def run(self):
+        """Worker loop, blocks until stop()"""
+        names = {0: "emergency", 1: "warning", 2: "info"}
+        while self.running:
+            item = self._next()
+            if item is None:
+                break
+            level, queued_at, text, retry = item
+            if not retry:
+                self.latencies[names[level]].append(time.monotonic() - queued_at)
+            try:
+                self.backend.speak(text)
+            finally:
+                with self._cond:
+                    if self._interrupted and self.running and text not in self._pending:
+                        # Say the preempted message again after the emergency,
+                        # unless its TTL has run out by then
+                        self._push(level, queued_at, text, self._current[3], retry=True)
+                    self._current = None
+                    self._interrupted = False
+
+    def get_metrics(self):
+        """Queue latency (seconds from say() to start of speech) per priority"""
+        metrics = {}
+        for name, values in self.latencies.items():
+            values = sorted(values)
+            metrics[name] = {
+                'count': len(values),
+                'mean': sum(values) / len(values) if values else 0.0,
+                'p95': values[int(0.95 * (len(values) - 1))] if values else 0.0,
+                'max': values[-1] if values else 0.0
+            }
+        metrics['dropped'] = self.dropped
+        metrics['coalesced'] = self.coalesced
+        metrics['preempted'] = self.preempted
+        return metrics
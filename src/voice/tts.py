@@ -3,23 +3,40 @@ PRAGYAN-NETRA - Text-to-Speech Module
 Voice guidance and alerts
 """
 
+import threading
+
 import pyttsx3
 
+from voice.audio_output import AudioMixer, default_sink
+from voice.phrase_cache import PhraseBackend, PhraseCache, Pyttsx3Renderer, alert_fragments, template_fragments
+from voice.speech_scheduler import EngineThread, SpeechScheduler
+
 class VoiceAssistant:
-    def __init__(self):
-        self.engine = pyttsx3.init()
+    def __init__(self, use_phrase_cache=True):
+        # The engine is created on, and only driven by, its own thread
+        self.tts = EngineThread(pyttsx3.init)
         self.setup_voice()
+        # Hazard alerts are assembled from pre-rendered fragments
+        self.phrases = PhraseCache(Pyttsx3Renderer(self.tts)) if use_phrase_cache else None
+        # Set by start_async(): the sound device and mixer thread, and the speech scheduler
+        self.audio = None
+        self.speech = None
+        self.clips = None
     
     def setup_voice(self, rate=160, volume=1.0):
         """Configure voice settings"""
-        self.engine.setProperty('rate', rate)
-        self.engine.setProperty('volume', volume)
+        self.tts.call(self._configure, rate, volume)
+    
+    @staticmethod
+    def _configure(engine, rate, volume):
+        engine.setProperty('rate', rate)
+        engine.setProperty('volume', volume)
         
         # Try to set female voice
-        voices = self.engine.getProperty('voices')
+        voices = engine.getProperty('voices')
         for voice in voices:
             if 'female' in voice.name.lower():
-                self.engine.setProperty('voice', voice.id)
+                engine.setProperty('voice', voice.id)
                 break
     
     def speak(self, text, priority="info"):
@@ -34,17 +51,60 @@ class VoiceAssistant:
         icon = priorities.get(priority, "🗣️")
         print(f"{icon} {text}")
         
-        self.engine.say(text)
-        self.engine.runAndWait()
+        if self.speech is not None:
+            self.speech.say(text, priority)
+            return
+        self.tts.speak(text)
+    
+    def start_async(self):
+        """Make speak() non-blocking until stop_async() (e.g. around a camera loop)"""
+        if self.speech is None:
+            # Cached alerts and tones are mixed on a background thread
+            self.audio = AudioMixer(default_sink()).start()
+            if self.phrases is not None and self.audio.audible:
+                # Cached alerts are queued and preempted like live speech
+                self.clips = PhraseBackend(self.tts, self.audio, self.phrases)
+                self.prewarm()
+            self.speech = SpeechScheduler(self.clips or self.tts).start()
+    
+    def stop_async(self, timeout=5):
+        """Finish queued speech and return to blocking speak()"""
+        if self.speech is not None:
+            self.speech.wait_idle(timeout)
+            self.speech.stop()
+            self.speech = None
+            self.clips = None
+            self.audio.wait_idle(timeout)
+            self.audio.stop()
+            self.audio = None
+    
+    def beep(self, frequency=600, duration_ms=250):
+        """Non-blocking warning tone (needs the mixer opened by start_async)"""
+        if self.audio is not None:
+            self.audio.beep(frequency, duration_ms)
+    
+    def speak_fragments(self, fragments, priority="info"):
+        """Speak a templated message from cached audio, falling back to live TTS"""
+        text = " ".join(fragments)
+        if self.clips is not None:
+            # Played from the cache if every fragment is rendered, else spoken live
+            self.clips.register(text, fragments)
+        self.speak(text, priority)
+    
+    def prewarm(self, objects=()):
+        """Pre-render alert fragments in the background so the first alerts play without synthesis"""
+        if self.phrases is not None:
+            threading.Thread(target=self.phrases.prewarm, args=(template_fragments(objects),),
+                             name="phrase-prewarm", daemon=True).start()
     
     def obstacle_alert(self, obj_name, position, distance):
         """Generate obstacle alert"""
         if distance in ["VERY_CLOSE", "CLOSE"]:
-            self.speak(f"Emergency! {obj_name} very close on your {position}!", "emergency")
+            self.speak_fragments(alert_fragments(obj_name, position, distance, "emergency"), "emergency")
         elif distance == "MODERATE":
-            self.speak(f"Warning: {obj_name} ahead on your {position}", "warning")
+            self.speak_fragments(alert_fragments(obj_name, position, "ahead", "warning"), "warning")
         else:
-            self.speak(f"{obj_name} detected {distance} on your {position}", "info")
+            self.speak_fragments(alert_fragments(obj_name, position, distance, "info"), "info")
     
     def navigation_guide(self, direction, distance=""):
         """Give navigation instructions"""
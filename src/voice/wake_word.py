@@ -0,0 +1,222 @@
+"""
+PRAGYAN-NETRA - Wake Word Module
+Two-tier voice input: energy VAD + wake-word spotter, full recognizer after wake
+"""
+
+import json
+import time
+import wave
+
+import numpy as np
+
+
+class EnergyVAD:
+    """
+    Frame-energy voice activity detector with an adaptive noise floor.
+
+    Args:
+        frame_ms: analysis frame length
+        margin_db: energy above the noise floor that counts as speech
+        hangover_ms: speech state held after the last loud frame
+    """
+
+    def __init__(self, sample_rate=16000, frame_ms=20, margin_db=12.0, min_db=-50.0,
+                 hangover_ms=300, adapt=0.05):
+        self.frame = int(sample_rate * frame_ms / 1000)
+        self.margin_db = margin_db
+        self.min_db = min_db
+        self.hangover_frames = int(hangover_ms / frame_ms)
+        self.adapt = adapt
+        self.noise_db = min_db
+        self._hangover = 0
+
+    def frame_energies(self, pcm):
+        """dBFS of every complete frame in an int16 chunk"""
+        n = len(pcm) // self.frame * self.frame
+        frames = pcm[:n].reshape(-1, self.frame).astype(np.float32) / 32768.0
+        rms = np.sqrt(np.mean(frames * frames, axis=1)) + 1e-9
+        return 20 * np.log10(rms)
+
+    def is_speech(self, pcm):
+        """True if the chunk contains (or is within hangover of) speech"""
+        energies = self.frame_energies(pcm)
+        if not len(energies):
+            return self._hangover > 0
+        loud = energies > max(self.noise_db + self.margin_db, self.min_db)
+        quiet = energies[~loud]
+        if len(quiet):
+            # Track the noise floor on non-speech frames only
+            self.noise_db += self.adapt * (float(quiet.mean()) - self.noise_db)
+        if loud.any():
+            self._hangover = self.hangover_frames
+            return True
+        self._hangover = max(0, self._hangover - len(energies))
+        return self._hangover > 0
+
+
+def create_vosk_recognizers(model_path, wake_word="netra", sample_rate=16000, command_grammar=None):
+    """
+    Grammar-restricted wake recognizer and command recognizer sharing one model.
+
+    The wake grammar only knows the wake word, so its decoder search is tiny
+    compared to the large-vocabulary one. The command recognizer is
+    restricted too when command_grammar (e.g. IntentEngine.grammar()) is given.
+    """
+    from vosk import KaldiRecognizer, Model
+
+    model = Model(model_path)
+    wake = KaldiRecognizer(model, sample_rate, json.dumps([wake_word, "[unk]"]))
+    if command_grammar is not None:
+        full = KaldiRecognizer(model, sample_rate, command_grammar)
+    else:
+        full = KaldiRecognizer(model, sample_rate)
+    return wake, full
+
+
+class WakeWordListener:
+    """
+    Streaming two-tier voice pipeline.
+
+    While idle, chunks pass through the VAD and only voiced chunks reach the
+    wake recognizer, whose partial results trigger as soon as the wake word
+    appears. After wake, audio goes to the full recognizer until it returns
+    a final result or command_timeout seconds of audio pass.
+
+    feed() returns events: ('wake', text, latency_s) and ('command', text),
+    or ('intent', IntentMatch, latency_s) when an intent matcher is given;
+    intents are matched on partial results as they stream in. Latencies are
+    in audio time, from speech onset to wake and from wake to intent.
+    command_grammar (e.g. IntentEngine.grammar) is re-read on every wake and
+    set on the command recognizer when it changed.
+    """
+
+    def __init__(self, wake_recognizer, command_recognizer, wake_word="netra", vad=None,
+                 sample_rate=16000, command_timeout=5.0, intent_matcher=None, command_grammar=None):
+        self.wake = wake_recognizer
+        self.command = command_recognizer
+        self.wake_word = wake_word
+        self.sample_rate = sample_rate
+        self.vad = vad if vad is not None else EnergyVAD(sample_rate)
+        self.command_timeout = command_timeout
+        self.intent_matcher = intent_matcher
+        self.command_grammar = command_grammar
+        self._grammar = command_grammar() if command_grammar else None
+
+        self.state = "idle"
+        self._samples = 0
+        self._speech_onset = None
+        self._command_start = 0
+
+        self.chunks = 0
+        self.chunks_skipped = 0
+        self.wake_cpu = 0.0
+        self.command_cpu = 0.0
+        self.wake_latencies = []
+        self.intent_latencies = {}
+
+    def _decode(self, recognizer, data):
+        """AcceptWaveform plus (partial) text, with its CPU time"""
+        start = time.thread_time()
+        final = recognizer.AcceptWaveform(data)
+        result = recognizer.Result() if final else recognizer.PartialResult()
+        elapsed = time.thread_time() - start
+        result = json.loads(result)
+        return final, result.get('text', result.get('partial', '')), elapsed
+
+    def feed(self, data):
+        """Process one chunk of 16-bit mono PCM bytes"""
+        pcm = np.frombuffer(data, dtype=np.int16)
+        chunk_start = self._samples
+        self._samples += len(pcm)
+        self.chunks += 1
+
+        if self.state == "idle":
+            return self._feed_idle(data, pcm, chunk_start)
+        return self._feed_command(data)
+
+    def _feed_idle(self, data, pcm, chunk_start):
+        if not self.vad.is_speech(pcm):
+            self.chunks_skipped += 1
+            if self._speech_onset is not None:
+                self._speech_onset = None
+                self._reset(self.wake)
+            return []
+        if self._speech_onset is None:
+            self._speech_onset = chunk_start
+
+        final, text, cpu = self._decode(self.wake, data)
+        self.wake_cpu += cpu
+        if self.wake_word not in text.split():
+            if final:
+                self._speech_onset = None
+            return []
+
+        latency = (self._samples - self._speech_onset) / self.sample_rate
+        self.wake_latencies.append(latency)
+        self._reset(self.wake)
+        self._reset(self.command)
+        self._update_grammar()
+        self._speech_onset = None
+        self._command_start = self._samples
+        self.state = "command"
+        return [('wake', text, latency)]
+
+    def _feed_command(self, data):
+        final, text, cpu = self._decode(self.command, data)
+        self.command_cpu += cpu
+        elapsed = (self._samples - self._command_start) / self.sample_rate
+        timed_out = elapsed > self.command_timeout
+        if self.intent_matcher is not None and text:
+            match = self.intent_matcher(text, not final)
+            if match is not None:
+                self.intent_latencies.setdefault(match.name, []).append(elapsed)
+                self.state = "idle"
+                return [('intent', match, elapsed)]
+        if not final and not timed_out:
+            return []
+        if not final:
+            text = json.loads(self.command.FinalResult()).get('text', '')
+        self.state = "idle"
+        return [('command', text)] if text else []
+
+    def _update_grammar(self):
+        if self.command_grammar is None:
+            return
+        grammar = self.command_grammar()
+        if grammar != self._grammar and hasattr(self.command, 'SetGrammar'):
+            self.command.SetGrammar(grammar)
+            self._grammar = grammar
+
+    @staticmethod
+    def _reset(recognizer):
+        if hasattr(recognizer, 'Reset'):
+            recognizer.Reset()
+
+    def feed_wav(self, path, chunk_size=1600):
+        """Stream a 16-bit mono WAV file through feed(); returns all events"""
+        events = []
+        with wave.open(path, 'rb') as wav:
+            if wav.getnchannels() != 1 or wav.getsampwidth() != 2 or wav.getframerate() != self.sample_rate:
+                raise ValueError(f"{path}: expected 16-bit mono {self.sample_rate} Hz")
+            while True:
+                data = wav.readframes(chunk_size)
+                if not data:
+                    break
+                events += self.feed(data)
+        return events
+
+    def get_metrics(self):
+        audio = self._samples / self.sample_rate
+        latencies = np.array(self.wake_latencies)
+        return {
+            'audio_s': audio,
+            'chunks': self.chunks,
+            'vad_skipped': self.chunks_skipped,
+            'wake_cpu_s': self.wake_cpu,
+            'command_cpu_s': self.command_cpu,
+            'cpu_load': (self.wake_cpu + self.command_cpu) / audio if audio else 0.0,
+            'wakes': len(latencies),
+            'wake_latency_mean_s': float(latencies.mean()) if len(latencies) else 0.0,
+            'wake_latency_max_s': float(latencies.max()) if len(latencies) else 0.0,
+            'intent_latency_s': {name: sum(v) / len(v) for name, v in self.intent_latencies.items()}
+        }
@@ -0,0 +1,314 @@
+"""
+Test Memory Module
+"""
+
+import sys
+import os
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+import numpy as np
+
+from memory.face_index import FaceIndex
+from memory.embedding_store import EmbeddingStore
+from memory.context_understanding import ContextManager
+from memory.memory_store import MemoryStore, open_store
+from memory.obstacle_stats import ObstacleStats
+from memory.object_memory import ObjectMemory
+from memory.persistence import WriteBehindStore
+
+
+def fake_encoder(path):
+    """Deterministic stand-in for face_recognition"""
+    data = open(path, 'rb').read()
+    if data.startswith(b'noface'):
+        return None
+    return np.frombuffer(data.ljust(128, b'\0')[:128], dtype=np.uint8).astype(np.float32)
+
+
+def test_face_index_returns_closest_match():
+    """Closest identity wins, not the first one under tolerance"""
+    print("🧪 Testing FaceIndex matching...")
+
+    index = FaceIndex(tolerance=0.6)
+    base = np.zeros(128)
+    index.add("far_friend", base + 0.05)    # distance ~0.57
+    index.add("close_friend", base + 0.01)  # distance ~0.11
+
+    (name, distance), (unknown, _) = index.match([base, base + 1.0])
+
+    assert name == "close_friend"
+    assert abs(distance - 0.01 * np.sqrt(128)) < 1e-4
+    assert unknown is None
+    print("  ✅ Best match returned with its distance")
+
+
+def test_face_index_add_remove():
+    """Incremental add/remove keeps the matrix consistent"""
+    print("🧪 Testing FaceIndex add/remove...")
+
+    rng = np.random.default_rng(3)
+    encodings = rng.normal(0, 1, (300, 128))
+    index = FaceIndex(capacity=8)
+    index.add_many([f"p{i}" for i in range(300)], encodings)
+
+    assert index.remove("p5") == 1
+    assert len(index) == 299
+
+    names = [name for name, _ in index.match(encodings[[0, 5, 299]])]
+    assert names == ["p0", None, "p299"]
+    print("  ✅ Index grows and shrinks correctly")
+
+
+def test_embedding_store_only_encodes_changes(tmp_path):
+    """Second boot is served from the cache"""
+    print("🧪 Testing EmbeddingStore...")
+
+    faces = tmp_path / "faces"
+    faces.mkdir()
+    for name in ("alice", "bob"):
+        (faces / f"{name}.jpg").write_bytes(name.encode())
+    (faces / "empty.jpg").write_bytes(b"noface")
+    paths = sorted(str(p) for p in faces.iterdir())
+
+    store = EmbeddingStore(str(tmp_path / "cache"))
+    first = store.sync(paths, fake_encoder)
+    assert (store.hits, store.misses) == (0, 3)
+    assert len(first) == 2
+
+    store = EmbeddingStore(str(tmp_path / "cache"))
+    second = store.sync(paths, fake_encoder)
+    assert (store.hits, store.misses) == (3, 0)
+    assert all(np.array_equal(first[p], second[p]) for p in first)
+    assert all(v.base is None for v in second.values())  # no views into the memory map
+
+    # Touched but unchanged content is still a hit, modified content is a miss
+    os.utime(paths[0], (1, 1))
+    (faces / "bob.jpg").write_bytes(b"robert")
+    third = store.sync(paths, fake_encoder)
+    assert (store.hits, store.misses) == (2, 1)
+    assert np.array_equal(third[str(faces / "bob.jpg")], fake_encoder(str(faces / "bob.jpg")))
+    print("  ✅ Only new or changed images re-encoded")
+
+
+def test_context_batches_obstacle_events(tmp_path):
+    """Obstacles are buffered until the batch size, flush() or close()"""
+    print("🧪 Testing batched context persistence...")
+
+    store = MemoryStore(str(tmp_path / "memory.db"), batch_size=20, flush_interval=60)
+    context = ContextManager(str(tmp_path), store=store, state_flush_interval=60)
+    for i in range(10):
+        context.add_obstacle_context("chair", "LEFT")
+    assert store.batches == 0
+
+    for i in range(60):
+        context.add_obstacle_context("table", "RIGHT")
+    deadline = time.time() + 2
+    while store.batches == 0 and time.time() < deadline:
+        time.sleep(0.01)
+    assert store.batches >= 1
+
+    context.update_location("KITCHEN")
+    saved = context.context
+    assert saved['current_location'] == "KITCHEN"
+    assert len(saved['last_obstacles']) == 50
+    assert saved['frequent_paths'] == {"chair_LEFT": 10, "table_RIGHT": 60}
+    assert context.state.pending == 3  # location updates wait for the flusher
+    context.close()
+    store.close()
+
+    reopened = MemoryStore(str(tmp_path / "memory.db"))
+    assert reopened.obstacle_event_count() == 70
+    reopened.close()
+    state = json.loads(open(tmp_path / "context_state.json").read())
+    assert state['current_location'] == "KITCHEN"
+    assert context.persistence_stats()['state']['flushes'] == 1
+    print("  ✅ Batched and persisted across reopen")
+
+
+def test_memory_store_migrates_json_once(tmp_path):
+    """Legacy JSON memories are imported on first open only"""
+    print("🧪 Testing JSON migration...")
+
+    (tmp_path / "face_memory.json").write_text(json.dumps(
+        {"known_faces": {"amma": {"id": 1, "added": "2026-02-08", "samples": 2}}}))
+    (tmp_path / "object_memory.json").write_text(json.dumps(
+        {"personal_objects": {"keys": {"location": "table", "description": "", "added": "x"}}}))
+    (tmp_path / "context_memory.json").write_text(json.dumps({
+        "current_location": "HALL",
+        "last_obstacles": [{"type": "door", "position": "CENTER", "time": "09:00",
+                            "timestamp": "2026-02-08T09:00:00"}],
+        "frequent_paths": {"door_CENTER": 7, "cell phone_LEFT": 2}}))
+    (tmp_path / "memory.json").write_text(json.dumps({
+        "familiar_faces": {"ravi": {"relation": "friend"}},
+        "personal_objects": {},
+        "safe_paths": ["hall"],
+        "emergencies": [{"timestamp": "2026-02-08T10:00:00", "type": "manual_trigger",
+                         "location": "unknown"}]}))
+
+    store = open_store(str(tmp_path))
+    assert sorted(store.all_faces()) == ["amma", "ravi"]
+    assert store.all_faces()["ravi"]["relation"] == "friend"
+    assert ObjectMemory(str(tmp_path), store=store).find_object("keys")['location'] == "table"
+    assert store.obstacle_counts() == {("door", "CENTER"): 7, ("cell phone", "LEFT"): 2}
+    assert store.get_value("current_location") == "HALL"
+    assert store.get_value("safe_paths") == ["hall"]
+    assert store.emergencies()[0]['type'] == "manual_trigger"
+    assert open_store(str(tmp_path)) is store
+
+    # Ids stay unique after a face is removed
+    with store._conn:
+        store._conn.execute("DELETE FROM faces WHERE name = 'amma'")
+    assert store.add_face("meena") != store.all_faces()["ravi"]["id"]
+    store.close()
+
+    again = MemoryStore(str(tmp_path / "pragyan_memory.db"))
+    assert again.migrate_json(str(tmp_path)) == []
+    assert again.obstacle_event_count() == 1
+    again.close()
+    print("  ✅ Imported once, shared per data directory")
+
+
+def test_memory_store_concurrent_writers(tmp_path):
+    """Several threads can log events through one store"""
+    print("🧪 Testing concurrent writers...")
+
+    store = MemoryStore(str(tmp_path / "memory.db"), batch_size=64, flush_interval=0.05)
+    objects = ObjectMemory(str(tmp_path), store=store)
+
+    def worker(n):
+        for i in range(500):
+            store.log_obstacle("chair", f"P{n}")
+        objects.add_object(f"item{n}", "shelf")
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert store.obstacle_event_count() == 2000
+    assert store.obstacle_counts() == {("chair", f"P{n}"): 500 for n in range(4)}
+    assert objects.update_location("item0", "drawer")
+    assert not objects.update_location("missing", "drawer")
+    assert objects.get_all_objects()["item0"]["location"] == "drawer"
+    store.close()
+    print("  ✅ No lost events or objects")
+
+
+def test_obstacle_stats_predicts_by_hour_of_week():
+    """Probabilities follow the hour-of-week history and stay bounded"""
+    print("🧪 Testing obstacle statistics...")
+
+    stats = ObstacleStats(half_life_days=7, max_keys=4)
+    monday_9 = datetime(2026, 2, 9, 9, 15)
+    for week in range(4):
+        for i in range(8):
+            stats.update("traffic_light", "LEFT", monday_9 + timedelta(weeks=week, minutes=i))
+        stats.update("door", "CENTER", monday_9 + timedelta(weeks=week, minutes=30))
+        stats.update("chair", "RIGHT", monday_9 + timedelta(weeks=week, hours=5))
+
+    now = monday_9 + timedelta(weeks=4)
+    (first, position, p_light), (second, _, p_door) = stats.predict(now, k=2)
+    assert (first, position) == ("traffic_light", "LEFT")
+    assert second == "door"
+    assert 0.7 < p_light < 0.9 and p_light + p_door < 1.0
+
+    # An hour without history falls back to the global distribution
+    assert stats.predict(now + timedelta(hours=2), k=1)[0][0] == "traffic_light"
+
+    # Old habits fade: after a month of chairs at 9:00 they take over
+    for day in range(30):
+        stats.update("chair", "RIGHT", now + timedelta(weeks=1 + day // 7, minutes=day))
+    assert stats.predict(now + timedelta(weeks=6), k=1)[0][0] == "chair"
+
+    for i in range(20):
+        stats.update(f"thing{i}", "LEFT", now)
+    assert len(stats) <= 4
+    assert len(ObstacleStats.from_dict(stats.to_dict())) == len(stats)
+    print("  ✅ Decayed, calibrated and bounded")
+
+
+def test_context_predictions_survive_restart(tmp_path):
+    """Saved statistics plus newer events are restored on restart"""
+    print("🧪 Testing prediction persistence...")
+
+    store = MemoryStore(str(tmp_path / "memory.db"), flush_interval=60)
+    context = ContextManager(str(tmp_path), store=store)
+    for i in range(5):
+        context.add_obstacle_context("wet_floor", "CENTER", "08:10")
+    context.save_context()
+    context.add_obstacle_context("wet_floor", "CENTER", "08:20")
+    store.flush()
+
+    restored = ContextManager(str(tmp_path), store=store)
+    assert restored.stats.events == 6
+    prediction = restored.predict_obstacles("08:45")[0]
+    assert (prediction['type'], prediction['position']) == ("wet_floor", "CENTER")
+    assert prediction['probability'] > 0.7
+    assert restored.get_context_summary()['time_patterns'] == 1
+    store.close()
+    print("  ✅ Underscored types and unsaved events restored")
+
+
+def test_journal_recovers_unflushed_changes(tmp_path):
+    """A crash before the snapshot loses nothing when journaling"""
+    print("🧪 Testing journal recovery...")
+
+    path = str(tmp_path / "doc.json")
+    store = WriteBehindStore(path, default={'count': 0}, flush_interval=60, journal=True)
+    store.incr(['count'], 5)
+    store.append(['events'], "stairs", limit=2)
+    store.append(['events'], "door", limit=2)
+    store.append(['events'], "wall", limit=2)
+    # Simulate a crash: the flusher never writes a snapshot
+    store.running = False
+    store._journal.flush()
+
+    recovered = WriteBehindStore(path, flush_interval=60, journal=True)
+    assert recovered.data == {'count': 5, 'events': ["door", "wall"]}
+    recovered.close()
+    assert json.loads(open(path).read()) == recovered.data
+    assert os.path.getsize(path + ".journal") == 0
+    print("  ✅ Journal replayed, then truncated after the snapshot")
+
+
+def test_flush_does_not_block_mutations(tmp_path, monkeypatch):
+    """Mutators run while a snapshot is written; later changes stay journaled"""
+    print("🧪 Testing write-behind flush...")
+
+    import memory.persistence as persistence
+    write = persistence.atomic_write_text
+
+    def slow_write(path, text):
+        time.sleep(0.3)
+        write(path, text)
+
+    monkeypatch.setattr(persistence, 'atomic_write_text', slow_write)
+    path = str(tmp_path / "doc.json")
+    store = WriteBehindStore(path, default={'count': 0}, flush_interval=60, journal=True)
+    store.incr(['count'])
+    flusher = threading.Thread(target=store.flush)
+    flusher.start()
+    time.sleep(0.05)
+    start = time.perf_counter()
+    store.incr(['count'])
+    assert time.perf_counter() - start < 0.1
+    flusher.join()
+
+    assert json.loads(open(path).read()) == {'count': 1} and store.pending == 1
+    store.running = False
+    store._journal.flush()
+    recovered = WriteBehindStore(path, flush_interval=60, journal=True)
+    assert recovered.data == {'count': 2}
+    recovered.close()
+    print("  ✅ Snapshot written outside the lock, later change replayed")
+
+
+if __name__ == "__main__":
+    test_face_index_returns_closest_match()
+    test_face_index_add_remove()
+    test_obstacle_stats_predicts_by_hour_of_week()
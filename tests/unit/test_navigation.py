@@ -0,0 +1,253 @@
+"""
+Test Navigation Modules
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+import numpy as np
+
+from memory.context_understanding import ContextManager
+from memory.memory_store import MemoryStore
+from navigation.collision_estimator import CollisionEstimator
+from navigation.hazard_prediction import HazardPredictor
+from navigation.occupancy_grid import OccupancyGrid
+from navigation.path_guidance import PathGuide
+from navigation.path_planner import GridPlanner
+from navigation.route_graph import RouteGraph
+from voice.intents import build_default_intents
+
+
+def approaching_box(distance, size=0.9, focal=554.0, center=(320, 240)):
+    """Box of an object `size` metres across at `distance` metres"""
+    half = focal * size / distance / 2
+    return (center[0] - half, center[1] - half, center[0] + half, center[1] + half)
+
+
+def test_collision_estimator_measures_ttc():
+    """TTC and approach speed from box growth, per track"""
+    print("🧪 Testing CollisionEstimator...")
+
+    estimator = CollisionEstimator(window=1.0, capacity=2)
+    # Track 1 walks in at 1.5 m/s from 6 m, 2 recedes, 3 stands still
+    for i in range(31):
+        t = i / 30
+        boxes = [approaching_box(6.0 - 1.5 * t), approaching_box(3.0 + t), approaching_box(4.0)]
+        estimator.observe([1, 2, 3], boxes, t, ['person'] * 3)
+
+    result = estimator.estimate(1.0, image_width=640)
+    assert abs(result[1]['ttc'] - 3.0) < 0.1
+    assert abs(result[1]['approach_velocity'] - 1.5) < 0.1
+    assert abs(result[1]['distance_m'] - 4.5) < 0.2
+    assert result[2]['ttc'] == np.inf and result[2]['approach_velocity'] < 0
+    assert result[3]['ttc'] == np.inf
+    print("  ✅ Approaching, receding and still tracks measured")
+
+    # Tracks not seen within the window are released
+    estimator.observe([1], [approaching_box(4.0)], 2.5)
+    assert set(estimator.estimate(2.5)) == set()
+    estimator.observe([4], [approaching_box(4.0)], 2.6)
+    assert set(estimator._rows) == {1, 4}
+    print("  ✅ Stale tracks released")
+
+
+def test_hazards_ordered_by_time_to_collision():
+    """Hazards carry numeric time to impact and the most imminent comes first"""
+    print("🧪 Testing HazardPredictor TTC ordering...")
+
+    predictor = HazardPredictor(ttc_threshold=3.0)
+    hazards = []
+    for i in range(16):
+        t = i / 15
+        obstacles = [
+            {'type': 'chair', 'region': 'LEFT', 'distance': 'CLOSE', 'track_id': 1,
+             'bbox': approaching_box(3.0, center=(100, 240))},
+            {'type': 'person', 'region': 'CENTER', 'distance': 'MODERATE', 'track_id': 2,
+             'bbox': approaching_box(4.0 - 2.0 * t)},
+            {'type': 'door', 'region': 'RIGHT', 'distance': 'FAR'}
+        ]
+        hazards = predictor.predict_hazards(obstacles, timestamp=t, image_width=640, hour=12)
+
+    assert [h['object'] for h in hazards] == ['person', 'chair']
+    assert abs(hazards[0]['time_to_impact'] - 1.0) < 0.1
+    assert abs(hazards[0]['approach_velocity'] - 2.0) < 0.2
+    assert hazards[1]['time_to_impact'] == 2.5  # no approach measured, label fallback
+    print("  ✅ Approaching person outranks a closer static chair")
+
+
+def test_hazard_batch_dedup_and_risk():
+    """Columnar hazards deduplicate, weight risk by TTC and flag night as low light"""
+    print("🧪 Testing HazardBatch...")
+
+    predictor = HazardPredictor(ttc_threshold=3.0)
+    obstacles = [
+        {'type': 'chair', 'region': 'LEFT', 'distance': 'CLOSE'},
+        {'type': 'chair', 'region': 'LEFT', 'distance': 'VERY CLOSE'},
+        {'type': 'chair', 'region': 'RIGHT', 'distance': 'CLOSE'},
+        {'type': 'door', 'region': 'CENTER', 'distance': 'FAR'}
+    ]
+    context = {'predictions': [{'type': 'person', 'position': 'CENTER', 'confidence': 0.9}]}
+    batch = predictor.predict_batch(obstacles, context, hour=12)
+    hazards = list(batch)
+    assert [(h['object'], h['position'], h['time_to_impact']) for h in hazards] == [
+        ('chair', 'LEFT', 1.0), ('chair', 'RIGHT', 2.5), ('person', 'CENTER', 'SOON')]
+    assert hazards == predictor.predict_hazards(obstacles, context, hour=12)
+    print("  ✅ One hazard per object and position, most imminent kept")
+
+    assert predictor.calculate_risk_score(batch) == predictor.calculate_risk_score(hazards)
+    assert list(predictor.hazard_batch(hazards)) == hazards
+    far = [{'severity': 'HIGH', 'time_to_impact': 'SOON'}]
+    near = [{'severity': 'HIGH', 'time_to_impact': 0.5}]
+    assert predictor.calculate_risk_score(far) == 50
+    assert predictor.calculate_risk_score(near) == 65
+    print("  ✅ Risk grows as time to impact shrinks")
+
+    # One very close obstacle is a warning; two imminent ones are an emergency
+    single = predictor.predict_batch([{'type': 'chair', 'region': 'LEFT', 'distance': 'VERY CLOSE'}], hour=12)
+    risk = predictor.calculate_risk_score(single)
+    assert predictor.get_safety_recommendations(single, risk) == ["⚠️ Avoid chair on your LEFT"]
+    pair = predictor.predict_batch([{'type': 'chair', 'region': 'LEFT', 'distance': 'VERY CLOSE'},
+                                    {'type': 'table', 'region': 'RIGHT', 'distance': 'VERY CLOSE'}], hour=12)
+    risk = predictor.calculate_risk_score(pair)
+    assert risk == 100
+    assert predictor.get_safety_recommendations(pair, risk)[0].startswith("🚨 EMERGENCY")
+    print("  ✅ Emergency reserved for more than one imminent hazard")
+
+    for hour, night in ((23, True), (3, True), (12, False), (17, False)):
+        types = [h['type'] for h in predictor.predict_hazards([], hour=hour)]
+        assert (types == ['LOW_LIGHT']) == night
+    print("  ✅ Low light flagged in the evening and at night")
+
+
+def test_occupancy_grid_evidence_and_decay():
+    """Detections block cells ahead, free space clears, evidence fades"""
+    print("🧪 Testing OccupancyGrid...")
+
+    grid = OccupancyGrid()
+    grid.observe([{'type': 'chair', 'region': 'CENTER', 'distance': 'CLOSE'}])
+    ahead = grid.cell(1.6)
+    assert grid.occupied()[ahead] and grid.blocked()[grid.cell(1.4)]
+    assert not grid.occupied()[grid.cell(0.8)] and not grid.blocked()[grid.origin]
+    print("  ✅ Obstacle ahead blocked, space before it free")
+
+    grid.shift(1.0)
+    assert grid.occupied()[grid.cell(0.6)] and not grid.occupied()[ahead]
+    grid.decay(10.0)
+    assert not grid.occupied().any()
+    print("  ✅ Map shifts with the user and evidence decays")
+
+
+def test_incremental_replanning_matches_full_search():
+    """D* Lite repairs reach the same path cost as planning from scratch"""
+    print("🧪 Testing GridPlanner incremental replanning...")
+
+    rng = np.random.default_rng(0)
+    blocked = rng.random((30, 25)) < 0.2
+    start, goal = (29, 12), (0, 12)
+    blocked[start] = blocked[goal] = False
+    planner = GridPlanner(blocked, start, goal)
+    full = planner.expanded
+    for _ in range(20):
+        changed = rng.choice(blocked.size, 5, replace=False)
+        changed = changed[(changed != 29 * 25 + 12) & (changed != 12)]
+        blocked.ravel()[changed] ^= True
+        repaired = planner.update_cells(changed, blocked)
+        fresh = GridPlanner(blocked, start, goal)
+        assert abs(planner.g[planner.start] - fresh.g[fresh.start]) < 1e-9
+        assert repaired < full
+        path = planner.path()
+        if path is not None:
+            assert path[0] == start and path[-1] == goal
+            assert not any(blocked[cell] for cell in path[1:])
+    print("  ✅ Repaired plans are optimal and cheaper than a full search")
+
+
+def test_path_guide_turn_by_turn():
+    """plan_path steers around obstacles and feeds get_next_instruction"""
+    print("🧪 Testing PathGuide...")
+
+    guide = PathGuide()
+    assert guide.plan_path("START", "END") == ["START", "STRAIGHT_FOR_8M", "END"]
+
+    guide.update([{'type': 'table', 'region': 'CENTER', 'distance': 'CLOSE'}])
+    path = guide.plan_path("START", (5.0, 0.0))
+    assert path[1] in ("SLIGHT_LEFT", "SLIGHT_RIGHT", "TURN_LEFT", "TURN_RIGHT")
+    assert all(step.startswith(("STRAIGHT_FOR_", "SLIGHT_", "TURN_")) for step in path[1:-1])
+    assert guide.get_next_instruction() == "START"
+    assert guide.get_next_instruction() == path[1]
+
+    guide.update(dt=0.1, wall=True)
+    guide.grid.observe(hazards=[(0.4, 0.0, 180.0, 5.0)])
+    assert guide.plan_path("START", (5.0, 0.0))[1] == "NO_CLEAR_PATH"
+    print("  ✅ Detour, instructions and blocked path reported")
+
+
+def build_demo_routes(routes):
+    routes.add_edge("Main Entrance", "Corridor", 5, note="Proceed straight for 5 meters")
+    routes.add_edge("Corridor", "Elevator", 10, note="Turn right at the corridor")
+    routes.add_edge("Elevator", "Library", 4)
+    routes.add_edge("Corridor", "Stairwell", 3, hazards=["stairs"])
+    routes.add_edge("Stairwell", "Library", 6, hazards=["stairs"])
+    routes.mark_safe(["Main Entrance", "Corridor", "Elevator", "Library"])
+
+
+def test_route_graph_persists_and_learns(tmp_path):
+    """Shortest vs safest routes, persisted, reweighted by obstacle history"""
+    print("🧪 Testing RouteGraph...")
+
+    store = MemoryStore(str(tmp_path / "memory.db"))
+    build_demo_routes(RouteGraph(store))
+
+    routes = RouteGraph(store)
+    assert routes.route("main entrance", "the library", "shortest")['places'] == [
+        "Main Entrance", "Corridor", "Stairwell", "Library"]
+    safest = routes.route("Main Entrance", "Library")
+    assert safest['places'] == ["Main Entrance", "Corridor", "Elevator", "Library"]
+    assert safest['distance'] == 19 and safest['steps'][:2] == [
+        "Proceed straight for 5 meters", "Turn right at the corridor"]
+    assert routes.route("Library", "Main Entrance")['steps'][-1] == "Walk 5 meters to Main Entrance"
+    assert store.get_value("safe_paths") == [["Main Entrance", "Corridor", "Elevator", "Library"]]
+    print("  ✅ Routes survive a reload, safe paths preferred")
+
+    context = ContextManager(str(tmp_path), store=store)
+    context.update_location("Main Entrance")
+    routes.walk("Corridor", "Elevator")
+    for _ in range(5):
+        context.add_obstacle_context("trolley", "CENTER")
+    assert routes.learn() == 5 and routes.learn() == 0
+    assert "Elevator" not in routes.route("Main Entrance", "Library")['places']
+    assert RouteGraph(store).edges[routes._edge("Corridor", "Elevator")]['learned'] > 4.9
+    print("  ✅ Obstacles met on a segment reroute the safest path")
+
+    # The walk log survives a restart, so the next session learns its events
+    routes.walk("Elevator", "Library")
+    for _ in range(3):
+        context.add_obstacle_context("cart", "LEFT")
+    restarted = RouteGraph(store)
+    assert restarted.learn() == 3
+    # Events no logged walk covers wait until a later walk rules them out
+    seen = restarted.last_event_id
+    context.add_obstacle_context("cart", "LEFT")
+    assert restarted.learn(max_segment_seconds=0) == 0 and restarted.last_event_id == seen
+    restarted.walk("Library", "Elevator")
+    assert restarted.learn(max_segment_seconds=0) == 0 and restarted.last_event_id > seen
+    print("  ✅ Walks persisted, unattributed events not skipped early")
+
+    spoken = []
+    intents = build_default_intents(lambda text, priority: spoken.append(text), context=context, routes=routes)
+    assert intents.handle("take me to library")['places'][-1] == "Library"
+    assert spoken[-1].startswith("Route to Library, 14 meters")
+    routes.add_edge("Library", "Reading Room", 3)
+    assert intents.handle("take me to reading room")['places'][-1] == "Reading Room"
+    print("  ✅ Take-me-to intent resolves a route")
+    store.close()
+
+
+if __name__ == "__main__":
+    test_collision_estimator_measures_ttc()
+    test_hazards_ordered_by_time_to_collision()
+    test_hazard_batch_dedup_and_risk()
+    test_occupancy_grid_evidence_and_decay()
+    test_incremental_replanning_matches_full_search()
+    test_path_guide_turn_by_turn()
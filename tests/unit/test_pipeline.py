@@ -0,0 +1,238 @@
+"""
+Test Frame Pipeline
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+import shutil
+import tempfile
+import time
+import numpy as np
+
+from app.pipeline import FramePipeline, LatestQueue
+from app.startup import ImportTimer, StagedStartup
+from vision.frame_source import ImageDirectorySource, SyntheticSource
+
+
+def test_latest_queue_drops_oldest():
+    """Full queue keeps the newest items"""
+    print("🧪 Testing LatestQueue...")
+
+    q = LatestQueue(maxsize=2)
+    for i in range(5):
+        q.put(i)
+
+    assert q.dropped == 3
+    assert q.get(timeout=0) == 3
+    assert q.get(timeout=0) == 4
+    assert q.get(timeout=0) is None
+    print("  ✅ Oldest items dropped")
+
+
+def test_pipeline_processes_freshest_frames():
+    """Slow stage skips stale frames instead of queueing them"""
+    print("🧪 Testing FramePipeline...")
+
+    frames = iter([np.full((4, 4, 3), i, dtype=np.uint8) for i in range(200)])
+
+    def source():
+        time.sleep(0.001)
+        return next(frames, None)
+
+    def slow_stage(packet):
+        time.sleep(0.01)
+        packet['checked'] = True
+        return packet
+
+    pipeline = FramePipeline(source)
+    pipeline.add_stage("slow", slow_stage)
+    pipeline.start()
+
+    outputs = []
+    deadline = time.time() + 10
+    while not pipeline.done() and time.time() < deadline:
+        packet = pipeline.get_output()
+        if packet is not None:
+            outputs.append(packet)
+    pipeline.stop()
+
+    stats = pipeline.get_stats()
+    seqs = [p['seq'] for p in outputs]
+
+    assert outputs and all(p['checked'] for p in outputs)
+    assert seqs == sorted(seqs)
+    assert stats['capture']['processed'] == 200
+    assert stats['capture']['dropped'] > 0
+    assert stats['slow']['processed'] < 200
+    print(f"  ✅ {len(outputs)} fresh frames processed, {stats['capture']['dropped']} stale dropped")
+
+
+def test_pipeline_done_waits_for_frames_in_flight():
+    """done() stays False while a stage still holds the last frame"""
+    print("🧪 Testing FramePipeline shutdown...")
+
+    frames = iter([np.full((4, 4, 3), i, dtype=np.uint8) for i in range(5)])
+
+    def slow_stage(packet):
+        time.sleep(0.05)
+        return packet
+
+    def discard_odd(packet):
+        return None if packet['seq'] % 2 else packet
+
+    pipeline = FramePipeline(lambda: next(frames, None), queue_size=8)
+    pipeline.add_stage("slow", slow_stage)
+    pipeline.add_stage("filter", discard_odd)
+    pipeline.start()
+
+    outputs = []
+    deadline = time.time() + 10
+    while not pipeline.done() and time.time() < deadline:
+        packet = pipeline.get_output()
+        if packet is not None:
+            outputs.append(packet['seq'])
+    pipeline.stop()
+
+    assert outputs == [0, 2, 4]
+    print("  ✅ Last frame delivered before done()")
+
+
+def test_pipeline_survives_failing_stage():
+    """A stage that raises drops the frame without stalling done()"""
+    print("🧪 Testing FramePipeline stage errors...")
+
+    frames = iter([np.full((4, 4, 3), i, dtype=np.uint8) for i in range(6)])
+
+    def flaky_stage(packet):
+        if packet['seq'] % 3 == 1:
+            raise ValueError("bad frame")
+        return packet
+
+    pipeline = FramePipeline(lambda: next(frames, None), queue_size=8)
+    pipeline.add_stage("flaky", flaky_stage)
+    pipeline.start()
+
+    outputs = []
+    deadline = time.time() + 10
+    while not pipeline.done() and time.time() < deadline:
+        packet = pipeline.get_output()
+        if packet is not None:
+            outputs.append(packet['seq'])
+    pipeline.stop()
+
+    assert pipeline.done()
+    assert outputs == [0, 2, 3, 5]
+    assert pipeline.get_stats()['flaky']['errors'] == 2
+    print("  ✅ Failed frames counted and discarded")
+
+
+def test_synthetic_source_is_deterministic():
+    """Same seed replays the same frames in order"""
+    print("🧪 Testing SyntheticSource replay...")
+
+    def replay():
+        source = SyntheticSource(160, 120, num_frames=10, seed=7, threaded=False)
+        frames = [(f.seq, f.image.copy()) for f in source]
+        source.stop()
+        return frames
+
+    first, second = replay(), replay()
+    assert [seq for seq, _ in first] == list(range(10))
+    assert all(np.array_equal(a, b) for (_, a), (_, b) in zip(first, second))
+    print("  ✅ Deterministic replay")
+
+
+def test_ring_buffer_is_reused():
+    """Frames are written into the preallocated ring, consumers get copies"""
+    print("🧪 Testing ring buffer reuse...")
+
+    source = SyntheticSource(64, 48, num_frames=8, seed=1, buffer_size=2, threaded=False, copy=False)
+    ids = [id(f.image) for f in source]
+    source.stop()
+
+    assert len(set(ids)) == 2
+    print("  ✅ Two buffers reused for eight frames")
+
+    source = SyntheticSource(64, 48, num_frames=8, seed=1, buffer_size=2, threaded=False)
+    frames = list(source)
+    source.stop()
+    reference = SyntheticSource(64, 48, num_frames=8, seed=1, threaded=False)
+    assert all(np.array_equal(f.image, r.image) for f, r in zip(frames, reference))
+    print("  ✅ Frames held past the ring size stay intact")
+
+
+def test_threaded_source_returns_latest_frame(tmp_path):
+    """Threaded grabber skips frames the consumer was too slow for"""
+    print("🧪 Testing latest-frame-only capture...")
+
+    import cv2
+    for i in range(30):
+        cv2.imwrite(str(tmp_path / f"{i:03d}.png"), np.full((8, 8, 3), i, dtype=np.uint8))
+
+    source = ImageDirectorySource(str(tmp_path)).start()
+    time.sleep(0.5)
+    frame = source.read(timeout=1)
+    stale = source.read(timeout=0.2)
+    source.stop()
+
+    assert frame.seq == 29
+    assert frame.image[0, 0, 0] == 29
+    assert stale is None
+    print("  ✅ Latest frame delivered")
+
+
+def test_staged_startup_registers_engines():
+    """Engines load in the background and register when ready"""
+    print("🧪 Testing StagedStartup...")
+
+    startup = StagedStartup()
+    ready = []
+
+    def slow_loader():
+        time.sleep(0.1)
+        return "model"
+
+    def slow_registration(engine):
+        time.sleep(0.1)
+        ready.append(engine)
+
+    def broken_loader():
+        raise ImportError("missing")
+
+    # A module of our own, so the import is never already cached
+    module_dir = tempfile.mkdtemp()
+    with open(os.path.join(module_dir, "pragyan_timed_module.py"), "w") as f:
+        f.write("VALUE = 1\n")
+    sys.path.insert(0, module_dir)
+    try:
+        with ImportTimer() as timer:
+            startup.load_async("slow", slow_loader, slow_registration)
+            startup.load_async("broken", broken_loader, ready.append)
+            assert not startup.ready("slow")
+            import pragyan_timed_module  # noqa: F401
+    finally:
+        sys.path.remove(module_dir)
+        sys.modules.pop("pragyan_timed_module", None)
+        shutil.rmtree(module_dir, ignore_errors=True)
+
+    deadline = time.time() + 5
+    while not startup.all_done() and time.time() < deadline:
+        time.sleep(0.01)
+
+    assert ready == ["model"]
+    assert startup.get("slow") == "model" and not startup.ready("broken")
+    assert {p[0] for p in startup.phases} == {"slow", "broken"}
+    assert any(r[0] == "pragyan_timed_module" for r in timer.records)
+    print("  ✅ Engines registered progressively")
+
+
+if __name__ == "__main__":
+    test_latest_queue_drops_oldest()
+    test_pipeline_processes_freshest_frames()
+    test_pipeline_done_waits_for_frames_in_flight()
+    test_pipeline_survives_failing_stage()
+    test_synthetic_source_is_deterministic()
+    test_ring_buffer_is_reused()
+    test_staged_startup_registers_engines()
@@ -0,0 +1,441 @@
+"""
+Test Speech Scheduling
+"""
+
+import sys
+import os
+import json
+import subprocess
+import threading
+import time
+import wave
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+import numpy as np
+
+from voice.speech_scheduler import EngineThread, FakeTTSBackend, SpeechScheduler
+from voice.phrase_cache import PhraseBackend, PhraseCache, Pyttsx3Renderer, alert_fragments, template_fragments
+from voice.audio_output import AudioMixer, NullSink, WavFileSink, tone
+from voice.phrase_cache import read_wav
+from voice.spatial_audio import BinauralRenderer, SpatialCue, detection_cues
+from voice.wake_word import EnergyVAD, WakeWordListener
+from voice.intents import build_default_intents, recognize_wav
+from memory.object_memory import ObjectMemory
+from memory.context_understanding import ContextManager
+
+
+def fake_renderer(text):
+    """10 samples per character at 1 kHz, value = character count"""
+    return np.full(10 * len(text), len(text), dtype=np.int16), 1000
+
+
+class FakeEngine:
+    """
+    pyttsx3 engine stand-in that fails like the real one when its run loop
+    is re-entered, and records the thread of every call.
+    """
+
+    def __init__(self):
+        self.threads = set()
+        self.queued = []
+        self.spoken = []
+        self.looping = False
+
+    def say(self, text):
+        self.threads.add(threading.get_ident())
+        self.queued.append(('say', text, None))
+
+    def save_to_file(self, text, path):
+        self.threads.add(threading.get_ident())
+        self.queued.append(('save', text, path))
+
+    def runAndWait(self):
+        self.threads.add(threading.get_ident())
+        if self.looping:
+            raise RuntimeError("run loop already started")
+        self.looping = True
+        time.sleep(0.01)
+        for kind, text, path in self.queued:
+            if kind == 'save':
+                write_speech_wav(path, [(0.01 * len(text), 100)], sample_rate=8000)
+            else:
+                self.spoken.append(text)
+        self.queued = []
+        self.looping = False
+
+    def stop(self):
+        pass
+
+
+class FakeRecognizer:
+    """
+    KaldiRecognizer stand-in: 'hears' its text after enough audio at its
+    word's loudness (the test WAVs encode words as noise levels).
+    """
+
+    def __init__(self, text, level, partial_after=0.2, final_after=0.5, sample_rate=16000):
+        self.text = text
+        self.level = level
+        self.partial_bytes = int(partial_after * sample_rate) * 2
+        self.final_bytes = int(final_after * sample_rate) * 2
+        self.received = 0
+        self.total = 0
+
+    def AcceptWaveform(self, data):
+        self.total += len(data)
+        rms = np.sqrt(np.mean(np.frombuffer(data, dtype=np.int16).astype(np.float64) ** 2))
+        if abs(rms - self.level) < 0.2 * self.level:
+            self.received += len(data)
+        return self.received >= self.final_bytes
+
+    def PartialResult(self):
+        heard = self.text if self.received >= self.partial_bytes else ""
+        return json.dumps({'partial': heard})
+
+    def Result(self):
+        self.received = 0
+        return json.dumps({'text': self.text})
+
+    def FinalResult(self):
+        heard = self.text if self.received >= self.partial_bytes else ""
+        self.received = 0
+        return json.dumps({'text': heard})
+
+    def Reset(self):
+        self.received = 0
+
+
+class ScriptedRecognizer:
+    """Recognizer stand-in revealing a transcript word by word over audio time"""
+
+    def __init__(self, timed_words, final_at, sample_rate=16000):
+        self.timed_words = timed_words
+        self.final_at = final_at
+        self.sample_rate = sample_rate
+        self.seconds = 0.0
+
+    def _heard(self):
+        return " ".join(w for t, w in self.timed_words if t <= self.seconds)
+
+    def AcceptWaveform(self, data):
+        self.seconds += len(data) / 2 / self.sample_rate
+        return self.seconds >= self.final_at
+
+    def PartialResult(self):
+        return json.dumps({'partial': self._heard()})
+
+    def Result(self):
+        return json.dumps({'text': self._heard()})
+
+    def FinalResult(self):
+        return self.Result()
+
+
+def write_speech_wav(path, segments, sample_rate=16000):
+    """WAV of (seconds, amplitude) noise segments standing in for speech/silence"""
+    rng = np.random.default_rng(0)
+    pcm = np.concatenate([rng.normal(0, amp, int(sec * sample_rate)) for sec, amp in segments])
+    with wave.open(path, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(np.clip(pcm, -32768, 32767).astype(np.int16).tobytes())
+
+
+def test_priority_order_and_coalescing():
+    """Queued messages are spoken most-urgent first, duplicates once"""
+    print("🧪 Testing speech priority order...")
+
+    backend = FakeTTSBackend()
+    speech = SpeechScheduler(backend)
+    speech.say("Welcome", "info")
+    speech.say("Person ahead", "info")
+    speech.say("Person ahead", "info")
+    speech.say("Car approaching", "warning")
+    speech.say("Stairs! Stop!", "emergency")
+    speech.say("Person ahead", "warning")  # upgrades the pending duplicate
+
+    speech.start()
+    assert speech.wait_idle()
+    speech.stop()
+
+    assert backend.spoken == ["Stairs! Stop!", "Car approaching", "Person ahead", "Welcome"]
+    metrics = speech.get_metrics()
+    assert metrics['coalesced'] == 2
+    assert metrics['emergency']['count'] == 1 and metrics['warning']['count'] == 2
+    print("  ✅ Emergency first, duplicates coalesced")
+
+
+def test_emergency_preempts_and_stale_info_dropped():
+    """An emergency interrupts speech; old info messages are skipped"""
+    print("🧪 Testing speech preemption...")
+
+    backend = FakeTTSBackend(seconds_per_char=0.05)
+    speech = SpeechScheduler(backend, info_ttl=0.2).start()
+    speech.say("A long informational announcement about the room", "info")
+    time.sleep(0.1)
+    speech.say("Chair on your left", "info")
+    speech.say("Wall ahead. Stop.", "emergency")
+    assert speech.wait_idle()
+    speech.stop()
+
+    assert backend.interrupted == ["A long informational announcement about the room"]
+    assert backend.spoken == ["Wall ahead. Stop."]
+    metrics = speech.get_metrics()
+    # The interrupted announcement is queued again but is stale by then too
+    assert metrics['preempted'] == 1 and metrics['dropped'] == 2
+    assert metrics['emergency']['max'] < 0.1
+    print("  ✅ Emergency spoken immediately, stale info dropped")
+
+
+def test_preempted_warning_is_spoken_again():
+    """A warning cut off by an emergency is repeated after it"""
+    print("🧪 Testing preempted speech re-queue...")
+
+    backend = FakeTTSBackend(seconds_per_char=0.02)
+    speech = SpeechScheduler(backend).start()
+    speech.say("Car approaching from the right", "warning")
+    time.sleep(0.1)
+    speech.say("Stop!", "emergency")
+    assert speech.wait_idle()
+    speech.stop()
+
+    assert backend.interrupted == ["Car approaching from the right"]
+    assert backend.spoken == ["Stop!", "Car approaching from the right"]
+    metrics = speech.get_metrics()
+    assert metrics['preempted'] == 1 and metrics['dropped'] == 0
+    assert metrics['warning']['count'] == 1
+    print("  ✅ Warning repeated after the emergency")
+
+
+def test_phrase_cache_assembles_and_evicts():
+    """Alerts reuse cached fragments; the byte budget evicts LRU fragments"""
+    print("🧪 Testing phrase cache...")
+
+    fragments = alert_fragments("Chair", "LEFT", "VERY_CLOSE", "warning")
+    assert fragments == ["Warning!", "chair", "very close", "on your", "left"]
+
+    cache = PhraseCache(fake_renderer, max_bytes=600, gap_ms=5)
+    pcm = cache.assemble(fragments)
+    text_samples = 10 * sum(len(f) for f in fragments)
+    assert len(pcm) == text_samples + 5 * (len(fragments) - 1)
+    assert (cache.hits, cache.misses) == (0, 5)
+
+    cache.assemble(["chair", "on your", "left"])
+    assert cache.hits == 3
+    assert cache.bytes <= cache.max_bytes and cache.evictions > 0
+    assert "Warning!" not in cache  # least recently used went first
+
+    warm = template_fragments(["chair"])
+    assert "Warning!" in warm and "left" in warm and "chair" in warm
+    assert all('{' not in fragment for fragment in warm)
+    print("  ✅ Fragments cached, assembled and evicted by budget")
+
+
+def test_cached_alerts_go_through_the_scheduler():
+    """Uncached alerts are spoken live and rendered for next time; cached ones yield to emergencies"""
+    print("🧪 Testing cached alert playback...")
+
+    live = FakeTTSBackend()
+    mixer = AudioMixer(NullSink(sample_rate=1000)).start()
+    clips = PhraseBackend(live, mixer, PhraseCache(fake_renderer, gap_ms=5))
+    speech = SpeechScheduler(clips).start()
+
+    fragments = alert_fragments("Office Chair", "LEFT", "CLOSE", "warning")
+    text = " ".join(fragments)
+    clips.register(text, fragments)
+    speech.say(text, "warning")
+    assert speech.wait_idle()
+    assert live.spoken == [text]
+    clips.render_async(fragments).join()
+
+    clips.register(text, fragments)
+    speech.say(text, "warning")
+    time.sleep(0.05)
+    speech.say("Stop!", "emergency")
+    assert speech.wait_idle()
+    speech.stop()
+    mixer.stop()
+
+    # Played from the cache, cut off by the emergency, then replayed after it
+    assert live.spoken == [text, "Stop!"]
+    assert mixer.cues_played == 2 and speech.preempted == 1
+    print("  ✅ Cached alerts queued and preempted like live speech")
+
+
+def test_engine_thread_serializes_speech_and_rendering(tmp_path):
+    """Live speech and phrase rendering share one engine thread, never overlapping"""
+    print("🧪 Testing TTS engine thread...")
+
+    tts = EngineThread(FakeEngine)
+    cache = PhraseCache(Pyttsx3Renderer(tts, tmp_dir=str(tmp_path)))
+    speech = SpeechScheduler(tts).start()
+    for i in range(5):
+        speech.say(f"message {i}", "warning")
+    pcm = cache.assemble(alert_fragments("Chair", "LEFT", "CLOSE", "warning"))
+    assert speech.wait_idle()
+    speech.stop()
+    tts.close()
+
+    engine = tts.engine
+    assert len(engine.spoken) == 5 and len(pcm) > 0 and cache.sample_rate == 8000
+    assert len(engine.threads) == 1 and threading.get_ident() not in engine.threads
+    print("  ✅ One engine thread, no re-entered run loop")
+
+
+def test_mixer_overlaps_cues_without_blocking(tmp_path):
+    """Overlapping cues are summed; play() returns immediately"""
+    print("🧪 Testing audio mixer...")
+
+    assert tone(600, 250) is tone(600, 250)  # synthesized once
+
+    sink = NullSink(sample_rate=8000, keep=True)
+    mixer = AudioMixer(sink, block_size=256)
+    beep = tone(440, 100, 8000)
+    start = time.perf_counter()
+    mixer.beep(440, 100)
+    mixer.play(beep)
+    assert time.perf_counter() - start < 0.01
+    mixer.start()
+    assert mixer.wait_idle()
+    mixer.stop()
+
+    out = sink.output()[:, 0]
+    assert mixer.cues_played == 2 and mixer.max_overlap == 2
+    assert np.allclose(out[:len(beep)], np.clip(2 * beep, -1, 1))
+
+    path = str(tmp_path / "alert.wav")
+    mixer = AudioMixer(WavFileSink(path, sample_rate=8000)).start()
+    mixer.beep(600, 250)
+    assert mixer.wait_idle()
+    mixer.stop()
+    pcm, rate = read_wav(path)
+    assert rate == 8000 and len(pcm) >= 2000
+    print("  ✅ Cues mixed and written to the sink")
+
+
+def test_binaural_cues_follow_azimuth(tmp_path):
+    """A cue on the right is louder and earlier in the right ear"""
+    print("🧪 Testing binaural renderer...")
+
+    detections = [
+        {'type': 'chair', 'bbox': [500, 100, 620, 400], 'position': 'RIGHT'},
+        {'type': 'person', 'region': 'LEFT', 'distance': 'VERY CLOSE'}
+    ]
+    right, left = detection_cues(detections, (480, 640, 3))
+    assert 20 < right.azimuth < 30 and right.distance == "MODERATE"
+    assert np.isclose(right.ratio, 120 * 300 / (480 * 640))
+    assert left.azimuth < 0 and left.distance == "VERY_CLOSE"
+
+    renderer = BinauralRenderer(sample_rate=16000, block_size=256)
+    out = renderer.render([SpatialCue(60.0, "CLOSE", 0.2, 440.0)], 0.5)
+    assert out.shape[1] == 2 and len(out) % 256 == 0
+    level = np.abs(out).max(axis=0)
+    assert level[1] > 2 * level[0]
+    corr = np.correlate(out[:2000, 0], out[:2000, 1], 'full')
+    assert np.argmax(corr) - 1999 > 0  # left ear lags
+
+    path = renderer.render_to_wav(str(tmp_path / "cues.wav"), [right, left], 0.25)
+    pcm, rate = read_wav(path)
+    assert rate == 16000 and len(pcm) >= 4000
+    print("  ✅ Interaural level and time differences rendered")
+
+
+def test_region_detections_cue_with_app_sys_path(tmp_path):
+    """Camera-mode cues for bbox detections import only from src, like the app"""
+    print("🧪 Testing detection cues on the app's sys.path...")
+
+    src = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+    script = "\n".join([
+        "import sys",
+        f"sys.path = [{src!r}] + [p for p in sys.path if p not in ('', {os.path.dirname(src)!r})]",
+        "import numpy as np",
+        "from vision.synthetic_scene import RegionDetector",
+        "from voice.spatial_audio import detection_cues",
+        "frame = np.full((240, 320, 3), 200, np.uint8)",
+        "frame[120:, :106] = 30",
+        "dets = RegionDetector(seed=0).detect_objects(frame)",
+        "assert dets and all('bbox' in det for det in dets)",
+        "cues = detection_cues(dets, frame.shape)",
+        "assert cues[0].azimuth < 0 and 'utils' not in sys.modules",
+    ])
+    result = subprocess.run([sys.executable, "-c", script], cwd=str(tmp_path),
+                            capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    print("  ✅ Cues built without the repo root on sys.path")
+
+
+def test_wake_word_two_tier(tmp_path):
+    """Silence skips both decoders; the full one only runs after wake"""
+    print("🧪 Testing wake word pipeline...")
+
+    path = str(tmp_path / "netra_status.wav")
+    # silence, "netra", pause, "status", silence, "netra"
+    write_speech_wav(path, [(1.0, 30), (0.6, 3000), (0.3, 30), (0.8, 8000), (1.0, 30), (0.6, 3000)])
+
+    wake = FakeRecognizer("netra", 3000, partial_after=0.2, final_after=0.6)
+    full = FakeRecognizer("status", 8000, partial_after=0.2, final_after=0.5)
+    listener = WakeWordListener(wake, full, vad=EnergyVAD(16000))
+    events = listener.feed_wav(path, chunk_size=1600)
+
+    assert [e[0] for e in events] == ["wake", "command", "wake"]
+    assert events[1][1] == "status"
+    metrics = listener.get_metrics()
+    assert metrics['vad_skipped'] >= 15           # ~2 s of silence never decoded
+    assert wake.total < 0.5 * 16000 * 2 * metrics['audio_s']
+    assert full.total <= 16000 * 2 * 1.6          # only audio after each wake
+    assert metrics['wake_latency_max_s'] <= 0.3   # triggered on a partial, not a final
+    print("  ✅ Wake on partial result, command decoded after wake only")
+
+
+def test_intents_match_streaming_partials(tmp_path):
+    """Partial transcripts dispatch as soon as the intent is unambiguous"""
+    print("🧪 Testing voice intents...")
+
+    objects = ObjectMemory(str(tmp_path))
+    objects.add_object("keys", "kitchen table")
+    context = ContextManager(str(tmp_path))
+    context.update_location("LIVING_ROOM")
+    spoken = []
+    intents = build_default_intents(lambda text, priority: spoken.append((text, priority)),
+                                    objects, context)
+
+    assert intents.match("where is my keys").slots == {'item': 'keys'}
+    assert intents.match("netra please status").name == "status"
+    assert intents.match("start navigatoin").name == "start_navigation"  # fuzzy
+    assert intents.match("stop", partial=True) is None                  # may become "stop navigation"
+    assert intents.match("stop").name == "stop"
+    assert intents.match("open the window") is None
+    assert '"keys"' in intents.grammar() and '"[unk]"' in intents.grammar()
+
+    assert intents.handle("where am i") == "LIVING_ROOM"
+    assert intents.handle("find my keys")['location'] == "kitchen table"
+    assert intents.handle("emergency") == "emergency"
+    assert spoken[-1][1] == "emergency" and "kitchen table" in spoken[-2][0]
+
+    # Objects added after construction are recognized, and in the grammar
+    assert intents.match("where is my umbrella") is None
+    objects.add_object("umbrella", "hallway")
+    assert '"umbrella"' in intents.grammar()
+    assert intents.handle("where is my umbrella")['location'] == "hallway"
+    # Streamed partials match against the last refresh, without re-reading the store
+    objects.add_object("scarf", "bedroom")
+    assert intents.match("where is my scarf") is None
+    intents.refresh()
+    assert intents.match("where is my scarf").slots == {'item': 'scarf'}
+
+    path = str(tmp_path / "find_object.wav")
+    write_speech_wav(path, [(1.5, 30)])
+    recognizer = ScriptedRecognizer([(0.3, "where"), (0.5, "is"), (0.7, "my"), (1.0, "keys")], final_at=1.4)
+    match, latency, _ = recognize_wav(recognizer, intents, path)
+    assert match.name == "find_object" and match.partial
+    assert latency < 1.4  # before the final result
+    print("  ✅ Intents matched from partials and dispatched")
+
+
+if __name__ == "__main__":
+    test_priority_order_and_coalescing()
+    test_emergency_preempts_and_stale_info_dropped()
+    test_preempted_warning_is_spoken_again()
+    test_phrase_cache_assembles_and_evicts()
+    test_cached_alerts_go_through_the_scheduler()
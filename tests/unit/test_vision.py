@@ -88,6 +88,252 @@ def test_surface_analysis():
         print(f"  ❌ Error: {e}")
         return False
 
+
+def test_face_tracker_reuses_identity():
+    """Detection runs every N frames and identity stays on the track"""
+    print("🧪 Testing Face Tracker...")
+
+    from vision.face_tracker import FaceTracker
+
+    rng = np.random.default_rng(0)
+    texture = rng.integers(0, 255, (80, 80, 3), dtype=np.uint8)
+    calls = {'detect': 0, 'encode': 0}
+
+    def scene(x):
+        img = np.zeros((240, 320, 3), dtype=np.uint8)
+        img[60:140, x:x + 80] = texture
+        return img
+
+    def detect(small):
+        calls['detect'] += 1
+        cols = np.where(small[:, :, 0].max(axis=0) > 0)[0]
+        rows = np.where(small[:, :, 0].max(axis=1) > 0)[0]
+        return [(rows[0], cols[-1] + 1, rows[-1] + 1, cols[0])]
+
+    def encode(rgb, boxes):
+        calls['encode'] += len(boxes)
+        return [np.zeros(128) for _ in boxes]
+
+    tracker = FaceTracker(detect, encode, lambda encs: [("Rohith", 0.2)] * len(encs),
+                          detect_every=4, scale=0.5)
+    ids = set()
+    for i in range(12):
+        tracks = tracker.update(scene(40 + 3 * i))
+        ids.update(t.id for t in tracks)
+
+    (track,) = tracks
+    assert calls['detect'] == 3
+    assert calls['encode'] == 1
+    assert ids == {track.id} and track.name == "Rohith"
+    # Box followed the face between detections
+    assert abs(track.box[3] - (40 + 3 * 11)) < 4
+    print(f"  ✅ {calls['detect']} detections, {calls['encode']} encoding for 12 frames")
+
+
+def test_frame_features_shared():
+    """Features are computed once per frame and ROI counts are exact"""
+    print("🧪 Testing Frame Features...")
+
+    from vision.frame_features import FeatureCache
+
+    test_img = np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8)
+    cache = FeatureCache()
+    features = cache.get(test_img, seq=1)
+
+    assert cache.get(test_img, seq=1) is features
+    assert features.edge_count(100, 50, 300, 200) == np.count_nonzero(features.edges[50:200, 100:300])
+    assert features.edge_density() == np.count_nonzero(features.edges) / (480 * 640)
+    print("  ✅ One feature pass shared, O(1) ROI edge counts")
+
+    expected = cv2.HoughLinesP(features.edges, 1, np.pi/180, 50, minLineLength=50, maxLineGap=10)
+    lines = features.lines(min_line_length=50)
+    assert (lines is None) == (expected is None)
+    assert lines is None or np.array_equal(lines, expected)
+
+    long_lines = features.lines(min_line_length=100)
+    kept = [] if lines is None else [l for l in lines
+                                     if max(abs(l[0][2] - l[0][0]), abs(l[0][3] - l[0][1])) >= 100]
+    assert (long_lines is None) == (not kept)
+    assert long_lines is None or np.array_equal(long_lines, np.array(kept))
+    assert features.lines(min_line_length=100) is long_lines
+    print("  ✅ Long Hough segments filtered from a single pass")
+
+
+def test_obstacle_filtering_with_backend():
+    """Backend boxes are filtered by class id and confidence"""
+    print("🧪 Testing ObstacleDetector backends...")
+
+    from vision.inference_backends import InferenceBackend
+    from vision.obstacle_detection import ObstacleDetector
+
+    class FakeBackend(InferenceBackend):
+        def predict(self, frames):
+            return [np.array([
+                [10, 10, 100, 100, 0.9, 0],    # person, LEFT
+                [300, 10, 340, 50, 0.8, 56],   # chair, CENTER
+                [500, 10, 600, 50, 0.3, 56],   # chair, low confidence
+                [500, 10, 600, 50, 0.9, 2],    # car, not an obstacle class
+            ], dtype=np.float32) for _ in frames]
+
+    detector = ObstacleDetector(backend=FakeBackend(None))
+    frames = [np.zeros((480, 640, 3), dtype=np.uint8)] * 2
+    batch = detector.detect_batch(frames)
+
+    assert len(batch) == 2
+    assert [(d['type'], d['position']) for d in batch[0]] == [('person', 'LEFT'), ('chair', 'CENTER')]
+    print("  ✅ Vectorized post-filtering works")
+
+
+def test_detector_from_settings(monkeypatch):
+    """config/settings.py selects the backend, threads, input size and model"""
+    print("🧪 Testing ObstacleDetector.from_config...")
+
+    import runpy
+    import vision.obstacle_detection as obstacle_detection
+    from vision.inference_backends import InferenceBackend
+
+    calls = []
+
+    class FakeBackend(InferenceBackend):
+        names = {0: 'person'}
+
+    def create_backend(name, model_path, **kwargs):
+        calls.append((name, model_path, kwargs))
+        return FakeBackend(model_path)
+
+    monkeypatch.setattr(obstacle_detection, "create_backend", create_backend)
+    root = os.path.join(os.path.dirname(__file__), '..', '..')
+    settings = runpy.run_path(os.path.join(root, 'config', 'settings.py'))
+    settings.update(INFERENCE_BACKEND='onnx', INFERENCE_THREADS=3, INFERENCE_INPUT_SIZE=320)
+    obstacle_detection.ObstacleDetector.from_config(settings, base_dir=root)
+
+    name, model_path, kwargs = calls[0]
+    assert name == 'onnx' and model_path == os.path.join(root, settings['ONNX_MODEL'])
+    assert kwargs['threads'] == 3 and kwargs['input_size'] == 320
+    print("  ✅ Inference settings reach the backend")
+
+
+def test_letterbox_and_decode():
+    """Exported-model decoding maps boxes back to the frame and applies NMS"""
+    print("🧪 Testing ONNX pre/post-processing...")
+
+    from vision.inference_backends import Letterbox, decode_yolo_output
+
+    letterbox = Letterbox(320)
+    blob, ratio, pad = letterbox(np.full((480, 640, 3), 255, dtype=np.uint8))
+    assert blob.shape == (1, 3, 320, 320) and ratio == 0.5 and pad == (0, 40)
+    assert letterbox(np.zeros((480, 640, 3), dtype=np.uint8))[0] is blob
+
+    # Two overlapping 'chair' anchors and one 'person' anchor, (1, 4 + 80, 3)
+    raw = np.zeros((1, 84, 3), dtype=np.float32)
+    raw[0, :4, 0] = [100, 140, 40, 40]
+    raw[0, :4, 1] = [102, 140, 40, 40]
+    raw[0, :4, 2] = [200, 200, 20, 20]
+    raw[0, 4 + 56, :2] = [0.9, 0.8]
+    raw[0, 4 + 0, 2] = 0.7
+
+    data = decode_yolo_output(raw, ratio, pad)
+    assert data.shape == (2, 6)
+    assert np.allclose(data[0], [160, 160, 240, 240, 0.9, 56])
+    print("  ✅ Letterbox buffer reused, NMS keeps best box")
+
+
+def test_synthetic_scene_and_region_detector():
+    """Scenes replay exactly and the region detector finds their obstacles"""
+    print("🧪 Testing synthetic scenes...")
+
+    from vision.synthetic_scene import RegionDetector, SceneGenerator, SceneSource
+
+    scene = SceneGenerator(320, 240, seed=11)
+    image, truth = scene.render(42)
+    again, same = scene.render(42)
+    assert np.array_equal(image, again) and truth == same
+    assert truth == scene.truth(42)
+
+    frames, truths = scene.batch(0, 50)
+    detector = RegionDetector(seed=5)
+    batch = detector.detect_batch(frames)
+    for frame, truth, detections in zip(frames, truths, batch):
+        legacy = [np.mean(frame[120:, a:b]) for a, b in ((0, 106), (106, 213), (213, 320))]
+        assert np.allclose(detector.region_means(frame), legacy)
+        assert {d['region'] for d in detections} == {o['region'] for o in truth.obstacles}
+    assert sum(len(t.obstacles) for t in truths) > 0
+
+    # Same seed, same names
+    replay = RegionDetector(seed=5).detect_batch(frames)
+    assert [[d['name'] for d in dets] for dets in replay] == [[d['name'] for d in dets] for dets in batch]
+
+    source = SceneSource(scene=scene, num_frames=3, threaded=False)
+    frame = [f for f in source][2]
+    assert np.array_equal(frame.image, scene.render(2)[0]) and source.truth(frame.seq) == scene.truth(2)
+    print("  ✅ Deterministic frames, ground truth matches detections")
+
+
+def test_object_tracker_stable_ids_and_announcements():
+    """Tracks survive flicker and jitter; each obstacle is announced once"""
+    print("🧪 Testing object tracker...")
+
+    from vision.object_tracker import ObjectTracker
+
+    tracker = ObjectTracker(min_hits=3, max_age=2)
+    rng = np.random.default_rng(0)
+    announced = []
+    for frame in range(40):
+        chair = 50 + 3 * frame
+        detections = [{'bbox': (chair, 300, chair + 80, 420), 'type': 'chair',
+                       'distance': "FAR" if frame % 7 == 3 else "CLOSE"},
+                      {'bbox': (500, 100, 560, 200), 'type': 'person' if frame % 5 else 'bottle'}]
+        detections = [dict(d, bbox=tuple(v + rng.normal(0, 1.5) for v in d['bbox'])) for d in detections]
+        if frame % 6 == 5:
+            detections = detections[1:]   # the chair flickers out
+        if frame == 20:
+            detections.append({'bbox': (10, 10, 30, 30), 'type': 'phone'})   # one-frame false positive
+        tracks = tracker.update(detections, (480, 640))
+        announced += [(t.id, t.type, t.distance) for t in tracker.announcements(now=frame, repeat_after=60)]
+
+    assert sorted(t.id for t in tracks) == [1, 2]
+    chair, person = sorted(tracks, key=lambda t: t.id)
+    assert (chair.type, person.type) == ("chair", "person")
+    assert chair.distance == "CLOSE" and person.distance == "FAR"
+    assert announced == [(1, "chair", "CLOSE"), (2, "person", "FAR")]
+    assert tracker.confirmed_total == 2
+
+    # Between detector runs the chair keeps moving at its tracked velocity
+    before = chair.bbox[0]
+    tracker.predict()
+    assert 1.5 < chair.bbox[0] - before < 4.5
+    print("  ✅ Stable ids, smoothed type/distance, deduplicated announcements")
+
+
+def test_filter_boxes_without_model():
+    """Raw boxes are filtered by class id and confidence, with or without track ids"""
+    print("🧪 Testing ObstacleDetector box filtering...")
+
+    from vision.obstacle_detection import ObstacleDetector
+
+    detector = ObstacleDetector.__new__(ObstacleDetector)
+    detector.class_names = {0: 'person', 2: 'car', 56: 'chair'}
+    detector.obstacle_class_ids = np.array([0, 56])
+    detector.confidence_threshold = 0.5
+
+    boxes = np.array([
+        [10, 10, 100, 100, 0.9, 0],     # person, LEFT
+        [300, 10, 340, 50, 0.8, 56],    # chair, CENTER
+        [500, 10, 600, 50, 0.3, 56],    # chair, low confidence
+        [500, 10, 600, 50, 0.9, 2],     # car, not an obstacle class
+    ])
+    expected = [('person', 'LEFT', 0.9), ('chair', 'CENTER', 0.8)]
+
+    def summary(detections):
+        return [(d['type'], d['position'], round(d['confidence'], 2)) for d in detections]
+
+    assert summary(detector._filter_boxes(boxes, (480, 640, 3))) == expected
+    tracked = np.insert(boxes, 4, [7, 8, 9, 10], axis=1)   # x1, y1, x2, y2, id, conf, cls
+    assert summary(detector._filter_boxes(tracked, (480, 640, 3))) == expected
+    assert detector._filter_boxes(np.zeros((0, 7)), (480, 640, 3)) == []
+    print("  ✅ Obstacle classes kept, track id column ignored")
+
+
 if __name__ == "__main__":
     print("=" * 60)
     print("VISION MODULE TESTS")